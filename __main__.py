@@ -1,8 +1,10 @@
 import sys
 from logging import getLogger
 
-from app.cli import BankAppCli
+import app.account  # noqa: F401  register models before the schema is checked
+from app.config import settings
 from app.database import Database
+from app.utils.instrumentation import instrumentation
 
 _logger = getLogger(__name__)
 MAJOR = 3
@@ -18,8 +20,17 @@ def check_python_version(min_version=(MAJOR, MINOR)):
 if __name__ == "__main__":
     check_python_version()
     db = Database()
-    app = BankAppCli(db)
     try:
-        app.main_menu()
+        # import only what the chosen mode needs, short scripted runs are dominated by startup
+        if len(sys.argv) > 1:
+            from app import commands
+
+            sys.exit(commands.main(db, sys.argv[1:]))
+        from app.cli import BankAppCli
+
+        BankAppCli(db).main_menu()
     except (KeyboardInterrupt, EOFError):
         print("\nGoodbye!")
+    finally:
+        if settings.METRICS_FILE:
+            instrumentation.dump(settings.METRICS_FILE)
@@ -1,4 +1,14 @@
 from .transaction import Transaction, TransactionRepository
+from .archive import (
+    ArchivedTransaction,
+    ArchivedTransactionRepository,
+    Ledger,
+    LedgerRepository,
+    OpeningBalance,
+    OpeningBalanceRepository,
+)
+from .checkpoint import BalanceCheckpoint, BalanceCheckpointRepository
+from .report import MonthlyTotal, MonthlyTotalRepository, Period
 from .repository import AccountRepository
 from .models import Account, AccountType
 from .models import Base
@@ -0,0 +1,2 @@
+from .models import ArchivedTransaction, Ledger, OpeningBalance
+from .repository import ArchivedTransactionRepository, LedgerRepository, OpeningBalanceRepository
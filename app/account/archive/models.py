@@ -0,0 +1,54 @@
+from datetime import date
+
+from sqlalchemy import Date, ForeignKey, Index, select, union_all
+from sqlalchemy.orm import Mapped, aliased, mapped_column
+
+from app.database import Base
+
+from ..models import Account  # noqa: F401, aliased() configures the mappers, so Account has to be defined
+from ..transaction.models import Transaction
+from ..type_annotations import col_amount
+
+
+class ArchivedTransaction(Base):
+    """Transaction moved out of the ``transaction`` table by archival, it keeps its ID."""
+
+    __tablename__ = "archived_transaction"
+
+    date: Mapped[date] = mapped_column(Date)
+    description: Mapped[str]
+    amount: Mapped[col_amount]
+    account_id: Mapped[int] = mapped_column(ForeignKey("account.id"))
+    fingerprint: Mapped[str | None]
+
+    __table_args__ = (
+        Index("ix_archived_transaction_account_id_date_amount", "account_id", "date", "amount"),
+        # deduplicating imports skip archived rows too
+        Index("ix_archived_transaction_account_id_fingerprint", "account_id", "fingerprint"),
+    )
+
+
+class OpeningBalance(Base):
+    """Balance of an account before the oldest transaction kept in the ``transaction`` table."""
+
+    __tablename__ = "opening_balance"
+
+    date: Mapped[date] = mapped_column(Date, comment="archival cutoff, transactions before it are archived")
+    balance: Mapped[col_amount]
+    account_id: Mapped[int] = mapped_column(ForeignKey("account.id"))
+
+    __table_args__ = (Index("ix_opening_balance_account_id", "account_id", unique=True),)
+
+
+LEDGER_COLUMNS = [column.name for column in Transaction.__table__.columns]
+
+# every transaction, kept or archived, mapped like a Transaction;
+# filters on it are pushed down into both tables, so each of them is searched by its own index
+Ledger = aliased(
+    Transaction,
+    union_all(
+        select(*(Transaction.__table__.c[name] for name in LEDGER_COLUMNS)),
+        select(*(ArchivedTransaction.__table__.c[name] for name in LEDGER_COLUMNS)),
+    ).subquery("ledger"),
+    name="Ledger",
+)
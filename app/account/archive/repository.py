@@ -0,0 +1,44 @@
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import delete, func, insert, select
+
+from app.utils.repository import SqlAlchemyRepository
+
+from ..transaction.models import Transaction
+from .models import LEDGER_COLUMNS, ArchivedTransaction, Ledger, OpeningBalance
+
+
+class ArchivedTransactionRepository(SqlAlchemyRepository):
+    model = ArchivedTransaction
+
+    def archive(self, account_id: int, cutoff: date) -> tuple[int, Decimal]:
+        """Move transactions of the account dated before ``cutoff`` to the archive, return their count and total."""
+        filters = [Transaction.account_id == account_id, Transaction.date < cutoff]
+        count, total = self.session.execute(select(func.count(), func.sum(Transaction.amount)).where(*filters)).one()
+        if count:
+            moved_rows = select(*(Transaction.__table__.c[name] for name in LEDGER_COLUMNS)).where(*filters)
+            self.session.execute(insert(self.model.__table__).from_select(LEDGER_COLUMNS, moved_rows))
+            self.session.execute(delete(Transaction).where(*filters))
+        return count, Decimal(total or 0)
+
+
+class OpeningBalanceRepository(SqlAlchemyRepository):
+    model = OpeningBalance
+
+    def get_by_account(self, account_id: int) -> OpeningBalance | None:
+        return self.get_one(filters=[self.model.account_id == account_id])
+
+    def move(self, account_id: int, cutoff: date, archived_amount: Decimal) -> None:
+        """Move the opening balance of the account to ``cutoff``, adding the total of the newly archived rows."""
+        if opening := self.get_by_account(account_id):
+            opening.date = cutoff
+            opening.balance += archived_amount
+        else:
+            self.create_one({"account_id": account_id, "date": cutoff, "balance": archived_amount})
+
+
+class LedgerRepository(SqlAlchemyRepository):
+    """Read-only repository of all transactions, kept in the ``transaction`` table or archived."""
+
+    model = Ledger
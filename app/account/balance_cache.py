@@ -0,0 +1,73 @@
+from collections import OrderedDict, defaultdict
+from collections.abc import Callable
+from datetime import date
+from decimal import Decimal
+from threading import Lock
+
+from app.config import settings
+
+CacheKey = tuple[str, int, date]  # database url, account id, date
+
+
+class BalanceCache:
+    """In-process LRU cache of balances keyed by (database, account_id, date), disabled when ``max_size`` is 0.
+
+    Every invalidation bumps the version of the account, a balance computed while its account was invalidated
+    is returned but not stored, so a lookup that overlaps an import never caches the old balance.
+    """
+
+    def __init__(self, max_size: int = settings.BALANCE_CACHE_SIZE) -> None:
+        self.max_size = max_size
+        self._lock = Lock()
+        self._entries: OrderedDict[CacheKey, Decimal] = OrderedDict()
+        self._versions: defaultdict[tuple[str, int], int] = defaultdict(int)
+        self.hits = self.misses = 0
+
+    def get_or_compute(self, database: str, account_id: int, trx_date: date, compute: Callable[[], Decimal]) -> Decimal:
+        if not self.max_size:
+            return compute()
+        key = (database, account_id, trx_date)
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self.misses += 1
+            version = self._versions[database, account_id]
+        balance = compute()
+        with self._lock:
+            if self._versions[database, account_id] == version:
+                self._entries[key] = balance
+                self._entries.move_to_end(key)
+                if len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return balance
+
+    def invalidate(self, database: str, account_id: int, from_date: date) -> None:
+        """Drop balances of the account on or after ``from_date``, earlier balances are still valid."""
+        with self._lock:
+            self._versions[database, account_id] += 1
+            stale_keys = [
+                key for key in self._entries if key[0] == database and key[1] == account_id and key[2] >= from_date
+            ]
+            for key in stale_keys:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+            }
+
+
+balance_cache = BalanceCache()
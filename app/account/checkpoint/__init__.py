@@ -0,0 +1,2 @@
+from .models import BalanceCheckpoint
+from .repository import BalanceCheckpointRepository
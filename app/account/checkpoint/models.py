@@ -0,0 +1,20 @@
+from datetime import date
+
+from sqlalchemy import Date, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+from ..type_annotations import col_amount
+
+
+class BalanceCheckpoint(Base):
+    """Running balance of an account at the end of a month."""
+
+    __tablename__ = "balance_checkpoint"
+
+    date: Mapped[date] = mapped_column(Date, comment="last day of the month")
+    balance: Mapped[col_amount]
+    account_id: Mapped[int] = mapped_column(ForeignKey("account.id"))
+
+    __table_args__ = (Index("ix_balance_checkpoint_account_id_date", "account_id", "date", unique=True),)
@@ -0,0 +1,85 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import delete, desc, func, select
+
+from app.utils.helper_methods import month_end
+from app.utils.repository import SqlAlchemyRepository
+
+from ..archive.models import OpeningBalance
+from ..transaction.models import Transaction
+from .models import BalanceCheckpoint
+
+# date and balance a balance lookup starts from, and the archival cutoff of the account
+BalanceStart = tuple[date | None, Decimal, date | None]
+
+
+class BalanceCheckpointRepository(SqlAlchemyRepository):
+    model = BalanceCheckpoint
+
+    def get_latest(self, account_id: int, on_date: date) -> BalanceCheckpoint | None:
+        """Return the closest checkpoint taken on or before the given date."""
+        return self.get_one(
+            filters=[self.model.account_id == account_id, self.model.date <= on_date],
+            order_by=desc(self.model.date),
+        )
+
+    def get_start(self, account_id: int, on_date: date) -> BalanceStart:
+        """Return the latest checkpoint on or before the date, or the opening balance left by archival if it's later.
+
+        Both are looked up by a single query. The opening balance is returned as of the day before the cutoff.
+        """
+        checkpoint = (
+            select(self.model)
+            .where(self.model.account_id == account_id, self.model.date <= on_date)
+            .order_by(desc(self.model.date))
+            .limit(1)
+            .subquery()
+        )
+        opening = select(OpeningBalance).where(OpeningBalance.account_id == account_id).subquery()
+        stmt = select(
+            select(checkpoint.c.date).scalar_subquery(),
+            select(checkpoint.c.balance).scalar_subquery(),
+            select(opening.c.date).scalar_subquery(),
+            select(opening.c.balance).scalar_subquery(),
+        )
+        checkpoint_date, checkpoint_balance, cutoff, opening_balance = self.session.execute(stmt).one()
+        if cutoff and cutoff <= on_date and (checkpoint_date is None or checkpoint_date < cutoff):
+            return cutoff - timedelta(days=1), opening_balance, cutoff
+        return checkpoint_date, checkpoint_balance or Decimal(0), cutoff
+
+    def rebuild(self, account_id: int, from_date: date) -> None:
+        """Recompute checkpoints of the account from the month of ``from_date`` onward.
+
+        Checkpoints of earlier months are not affected by transactions dated ``from_date`` or later,
+        so the latest of them is used as the opening balance. Transactions before the month stored without
+        checkpoints, e.g. before checkpoints were added to the database, are summed on top of it.
+        """
+        month_start = from_date.replace(day=1)
+        self.session.execute(
+            delete(self.model).where(self.model.account_id == account_id, self.model.date >= month_start)
+        )
+        start_date, balance, _ = self.get_start(account_id, month_start - timedelta(days=1))
+        filters = [Transaction.account_id == account_id, Transaction.date < month_start]
+        if start_date:
+            filters.append(Transaction.date > start_date)
+        balance += self.session.execute(select(func.sum(Transaction.amount)).where(*filters)).scalar() or 0
+
+        stmt = (
+            select(Transaction.date, func.sum(Transaction.amount))
+            .where(Transaction.account_id == account_id, Transaction.date >= month_start)
+            .group_by(Transaction.date)
+            .order_by(Transaction.date)
+        )
+        checkpoints: dict[date, Decimal] = {}
+        for trx_date, amount in self.session.execute(stmt):
+            balance += amount
+            checkpoints[month_end(trx_date)] = balance
+        if checkpoints:
+            self.create_multi(
+                [
+                    {"account_id": account_id, "date": _date, "balance": _balance}
+                    for _date, _balance in checkpoints.items()
+                ],
+                returning=False,
+            )
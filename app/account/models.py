@@ -1,12 +1,12 @@
 from enum import Enum
 from typing import TYPE_CHECKING
 
-from sqlalchemy import CheckConstraint
+from sqlalchemy import CheckConstraint, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship  # type: ignore[attr-defined]
 
 from app.database import Base
 
-from .type_annotations import col_num_10_2
+from .type_annotations import col_amount
 
 if TYPE_CHECKING:
     from .transaction import Transaction
@@ -22,9 +22,9 @@ class Account(Base):
 
     name: Mapped[str]
     account_type: Mapped[int]
-    credit_limit: Mapped[col_num_10_2] = mapped_column(comment="only for credit accounts")
+    credit_limit: Mapped[col_amount] = mapped_column(comment="only for credit accounts")
     transactions: Mapped[list["Transaction"]] = relationship(back_populates="account")
-    balance: Mapped[col_num_10_2]
+    balance: Mapped[col_amount]
 
     __table_args__ = (
         CheckConstraint(
@@ -32,4 +32,7 @@ class Account(Base):
 (account_type = '{AccountType.CREDIT.value}' AND credit_limit < 0 AND balance >= credit_limit)""",
             name="Balance and credit limit constraints",
         ),
+        # accounts of a type are listed in the order of their creation
+        Index("ix_account_account_type_id", "account_type", "id"),
+        Index("ix_account_name", "name"),
     )
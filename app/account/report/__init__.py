@@ -0,0 +1,2 @@
+from .models import MonthlyTotal, Period
+from .repository import MonthlyTotalRepository
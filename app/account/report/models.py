@@ -0,0 +1,29 @@
+from datetime import date
+from enum import Enum
+
+from sqlalchemy import Date, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+from ..type_annotations import col_amount
+
+
+class Period(str, Enum):
+    DAY = "day"
+    MONTH = "month"
+    YEAR = "year"
+
+
+class MonthlyTotal(Base):
+    """Inflows and outflows of an account in a month, kept up to date by imports."""
+
+    __tablename__ = "monthly_total"
+
+    month: Mapped[date] = mapped_column(Date, comment="first day of the month")
+    inflow: Mapped[col_amount]
+    outflow: Mapped[col_amount] = mapped_column(comment="sum of the debits as a positive number")
+    count: Mapped[int] = mapped_column(default=0)
+    account_id: Mapped[int] = mapped_column(ForeignKey("account.id"))
+
+    __table_args__ = (Index("ix_monthly_total_account_id_month", "account_id", "month", unique=True),)
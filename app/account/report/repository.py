@@ -0,0 +1,73 @@
+from datetime import date
+
+from sqlalchemy import case, delete, event, extract, func, select
+
+from app.database import Base
+from app.utils.helper_methods import month_end
+from app.utils.repository import SqlAlchemyRepository
+
+from ..archive.models import Ledger
+from .models import MonthlyTotal
+
+
+def get_totals_columns(amount) -> list:
+    """Aggregates of inflows, outflows as a positive number and the count of transactions."""
+    return [
+        func.sum(case((amount > 0, amount), else_=0)).label("inflow"),
+        func.sum(case((amount < 0, -amount), else_=0)).label("outflow"),
+        func.count().label("count"),
+    ]
+
+
+def get_monthly_totals_query(*filters):
+    """Select (account_id, year, month, inflow, outflow, count) of the transactions grouped by month.
+
+    Archived transactions are included, so totals of archived months can be rebuilt.
+    """
+    year, month = extract("year", Ledger.date), extract("month", Ledger.date)
+    return (
+        select(Ledger.account_id, year, month, *get_totals_columns(Ledger.amount))
+        .where(*filters)
+        .group_by(Ledger.account_id, year, month)
+    )
+
+
+def to_monthly_total_rows(result) -> list[dict]:
+    return [
+        {
+            "account_id": account_id,
+            "month": date(int(year), int(month), 1),
+            "inflow": inflow,
+            "outflow": outflow,
+            "count": count,
+        }
+        for account_id, year, month, inflow, outflow, count in result
+    ]
+
+
+class MonthlyTotalRepository(SqlAlchemyRepository):
+    model = MonthlyTotal
+
+    def rebuild(self, account_id: int, from_date: date, to_date: date) -> None:
+        """Recompute totals of the account for the months from ``from_date`` to ``to_date``.
+
+        Only the transactions of these months are read, so an import costs a scan of the months it touched.
+        """
+        first_day, last_day = from_date.replace(day=1), month_end(to_date)
+        self.session.execute(
+            delete(self.model).where(self.model.account_id == account_id, self.model.month.between(first_day, last_day))
+        )
+        stmt = get_monthly_totals_query(Ledger.account_id == account_id, Ledger.date.between(first_day, last_day))
+        self.create_multi(to_monthly_total_rows(self.session.execute(stmt)), returning=False)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _backfill_monthly_totals(target, connection, tables, **kw) -> None:
+    """Fill the table from the transactions already stored when it's added to an existing database.
+
+    Runs once all tables are created, as the totals are read from both the transaction and the archive tables.
+    """
+    if MonthlyTotal.__table__ not in tables:
+        return
+    if rows := to_monthly_total_rows(connection.execute(get_monthly_totals_query())):
+        connection.execute(MonthlyTotal.__table__.insert(), rows)
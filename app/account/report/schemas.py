@@ -0,0 +1,12 @@
+from datetime import date
+from decimal import Decimal
+
+from app.utils.schemas import ModelSchema
+
+
+class SPeriodTotal(ModelSchema):
+    period_start: date
+    inflow: Decimal
+    outflow: Decimal
+    net: Decimal
+    count: int
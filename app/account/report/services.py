@@ -0,0 +1,136 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+from sqlalchemy import extract, func
+
+from app.account import Ledger
+from app.config import settings
+from app.utils.helper_methods import month_end
+from app.utils.instrumentation import instrumented
+
+from .models import MonthlyTotal, Period
+from .repository import get_totals_columns
+from .schemas import SPeriodTotal
+
+if TYPE_CHECKING:
+    from app.utils.uow import AbstractUoW, AsyncUoW
+
+# period start, inflow, outflow, count
+Totals = tuple[date, Decimal, Decimal, int]
+
+
+class ReportService:
+    @classmethod
+    @instrumented
+    def get_totals(
+        cls,
+        uow: "AbstractUoW",
+        account_id: int,
+        period: Period = Period.MONTH,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> list[SPeriodTotal]:
+        """Return inflows, outflows and net of the account per day, month or year, oldest first.
+
+        Totals are aggregated by the database. With ``settings.MONTHLY_TOTALS`` months and years are read
+        from the materialized monthly totals, only partial months at the edges of the range are aggregated
+        from the transactions.
+        """
+        start_date = start_date or datetime.min.date()
+        end_date = end_date or date.today()
+        with uow:
+            if period != Period.DAY and settings.MONTHLY_TOTALS:
+                totals = cls._get_materialized_months(uow, account_id, start_date, end_date)
+                if period == Period.YEAR:
+                    totals = cls._sum_by_year(totals)
+            else:
+                totals = cls._aggregate_transactions(uow, account_id, start_date, end_date, period)
+        return [
+            SPeriodTotal(period_start=start, inflow=inflow, outflow=outflow, net=inflow - outflow, count=count)
+            for start, inflow, outflow, count in totals
+        ]
+
+    @classmethod
+    @instrumented
+    def rebuild_monthly_totals(cls, uow: "AbstractUoW", account_id: int) -> None:
+        """Recompute all monthly totals of the account, e.g. after ``settings.MONTHLY_TOTALS`` was re-enabled."""
+        with uow:
+            filters = [Ledger.account_id == account_id]
+            first_date = uow.ledger.get_aggregated(func.min, "date", filters=filters)[0]
+            last_date = uow.ledger.get_aggregated(func.max, "date", filters=filters)[0]
+            if first_date:
+                uow.monthly_totals.rebuild(account_id, first_date, last_date)
+
+    @staticmethod
+    def _aggregate_transactions(
+        uow: "AbstractUoW", account_id: int, start_date: date, end_date: date, period: Period
+    ) -> list[Totals]:
+        trx_date = Ledger.date
+        group_by = {
+            Period.DAY: [trx_date],
+            Period.MONTH: [extract("year", trx_date), extract("month", trx_date)],
+            Period.YEAR: [extract("year", trx_date)],
+        }[period]
+        rows = uow.ledger.get_grouped(
+            get_totals_columns(Ledger.amount),
+            group_by,
+            filters=[Ledger.account_id == account_id, trx_date.between(start_date, end_date)],
+        )
+        if period == Period.DAY:
+            return [tuple(row) for row in rows]
+        if period == Period.MONTH:
+            return [(date(int(year), int(month), 1), *totals) for year, month, *totals in rows]
+        return [(date(int(year), 1, 1), *totals) for year, *totals in rows]
+
+    @classmethod
+    def _get_materialized_months(
+        cls, uow: "AbstractUoW", account_id: int, start_date: date, end_date: date
+    ) -> list[Totals]:
+        first_full_month = start_date if start_date.day == 1 else month_end(start_date) + timedelta(days=1)
+        last_full_month = end_date.replace(day=1)
+        if end_date != month_end(end_date):
+            last_full_month = (last_full_month - timedelta(days=1)).replace(day=1)
+        if first_full_month > last_full_month:
+            return cls._aggregate_transactions(uow, account_id, start_date, end_date, Period.MONTH)
+
+        monthly_totals = uow.monthly_totals.get_all(
+            filters=[
+                MonthlyTotal.account_id == account_id,
+                MonthlyTotal.month.between(first_full_month, last_full_month),
+            ],
+            order_by=MonthlyTotal.month,
+        )
+        totals = [(total.month, total.inflow, total.outflow, total.count) for total in monthly_totals]
+        if start_date < first_full_month:
+            edge_end = first_full_month - timedelta(days=1)
+            totals += cls._aggregate_transactions(uow, account_id, start_date, edge_end, Period.MONTH)
+        if (edge_start := month_end(last_full_month) + timedelta(days=1)) <= end_date:
+            totals += cls._aggregate_transactions(uow, account_id, edge_start, end_date, Period.MONTH)
+        return sorted(totals)
+
+    @staticmethod
+    def _sum_by_year(monthly_totals: list[Totals]) -> list[Totals]:
+        years: defaultdict[date, list] = defaultdict(lambda: [Decimal(0), Decimal(0), 0])
+        for month, inflow, outflow, count in monthly_totals:
+            year = years[month.replace(month=1)]
+            year[0] += inflow
+            year[1] += outflow
+            year[2] += count
+        return [(year, *totals) for year, totals in years.items()]
+
+
+class AsyncReportService:
+    """Async counterpart of ``ReportService``, runs the same code on an ``AsyncUoW``."""
+
+    @classmethod
+    async def get_totals(
+        cls,
+        uow: "AsyncUoW",
+        account_id: int,
+        period: Period = Period.MONTH,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> list[SPeriodTotal]:
+        return await uow.run_sync(ReportService.get_totals, account_id, period, start_date, end_date)
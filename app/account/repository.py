@@ -1,23 +1,143 @@
-from typing import TYPE_CHECKING
+from datetime import date
+from decimal import Decimal
 
-from sqlalchemy import select
+from sqlalchemy import and_, case, func, insert, or_, select, update
 
 from app.utils.repository import SqlAlchemyRepository
+from app.utils.types import Cents
 
+from .archive.models import ArchivedTransaction, OpeningBalance
+from .checkpoint.models import BalanceCheckpoint
 from .models import Account
+from .transaction.models import Transaction
 
-if TYPE_CHECKING:
-    from decimal import Decimal
+# bound parameters of the balances query per account ID
+BALANCES_QUERY_ID_PARAMS = 1
 
 
 class AccountRepository(SqlAlchemyRepository):
     model = Account
+    # (shard index, shards count) when bound to a shard of a ShardedDatabase
+    shard: tuple[int, int] | None = None
 
-    def update_balance(self, account_id: int, amount_to_add: "Decimal") -> None:
-        stmt = select(self.model).where(self.model.id == account_id).with_for_update()
-        account = self.session.execute(stmt).scalars().one_or_none()
-        account.balance += amount_to_add
-        if account.balance < account.credit_limit:
-            raise ValueError(
-                f"Impossible to import data, as your account balance would go less than {account.credit_limit}"
+    def create_one(self, data: dict) -> int:
+        """Insert an account, in a shard its ID is the next one routed to the shard, ``id % shards count == index``.
+
+        The ID is computed by the INSERT itself from the largest one of the shard, so concurrent inserts
+        into the same SQLite file can't take the same ID.
+        """
+        if not self.shard:
+            return super().create_one(data)
+        shard_index, shards_count = self.shard
+        next_id = select(func.coalesce(func.max(self.model.id) + shards_count, shard_index or shards_count))
+        stmt = insert(self.model).values(id=next_id.scalar_subquery(), **data).returning(self.model.id)
+        return self.session.execute(stmt).scalar_one()
+
+    def count(self) -> int:
+        return self.session.execute(select(func.count()).select_from(self.model)).scalar_one()
+
+    def update_balance(self, account_id: int, amount_to_add: Decimal) -> None:
+        """Add to the balance with a single ``UPDATE ... SET balance = balance + :amount``.
+
+        Concurrent imports never overwrite each other's change, and no row is locked before the update.
+        The credit limit is checked by the same statement, nothing is updated if the balance would go below it.
+        NUMERIC amounts are added as floating point numbers on SQLite, so the sum is rounded to cents,
+        otherwise e.g. 0.7 + 0.1 - 0.8 would end just below a zero limit.
+        """
+        new_balance = self.model.balance + amount_to_add
+        if not isinstance(self.model.balance.type, Cents):
+            new_balance = func.round(new_balance, 2, type_=self.model.balance.type)
+        stmt = (
+            update(self.model)
+            .where(self.model.id == account_id, new_balance >= self.model.credit_limit)
+            .values(balance=new_balance)
+            .execution_options(synchronize_session=False)
+        )
+        if not self.session.execute(stmt).rowcount:
+            credit_limit = self.session.execute(
+                select(self.model.credit_limit).where(self.model.id == account_id)
+            ).scalar_one()
+            raise ValueError(f"Impossible to import data, as your account balance would go less than {credit_limit}")
+
+    def get_balances(self, account_ids: list[int], on_date: date) -> dict[int, Decimal]:
+        """Return balances of existing accounts on the given date, one grouped query per batch of IDs.
+
+        Like a single balance, each one is the latest month-end checkpoint on or before the date, or the opening
+        balance left by archival if it's later, plus the transactions after it.
+        Batches are as large as the bind parameter limit of the dialect allows.
+        """
+        dialect = self.session.get_bind().dialect
+        batch_size = self._get_batch_size(dialect, columns_count=BALANCES_QUERY_ID_PARAMS)
+        balances: dict[int, Decimal] = {}
+        for start in range(0, len(account_ids), batch_size):
+            stmt = self._get_balances_query(account_ids[start : start + batch_size], on_date)
+            for account_id, start_balance, amount, archived_amount in self.session.execute(stmt):
+                balances[account_id] = Decimal((start_balance or 0) + (amount or 0) + (archived_amount or 0))
+        return balances
+
+    def _get_balances_query(self, account_ids: list[int], on_date: date):
+        # the latest checkpoint of each account is found by an index search per account;
+        # archival moves whole months and keeps their checkpoints, so it's a valid start on both sides of the cutoff
+        checkpoint_date = (
+            select(func.max(BalanceCheckpoint.date))
+            .where(BalanceCheckpoint.account_id == self.model.id, BalanceCheckpoint.date <= on_date)
+            .scalar_subquery()
+        )
+        opening = select(OpeningBalance).where(OpeningBalance.account_id == self.model.id)
+        accounts = (
+            select(
+                self.model.id,
+                checkpoint_date.label("checkpoint_date"),
+                opening.with_only_columns(OpeningBalance.date).scalar_subquery().label("cutoff"),
+                opening.with_only_columns(OpeningBalance.balance).scalar_subquery().label("opening_balance"),
+            )
+            .where(self.model.id.in_(account_ids))
+            .subquery()
+        )
+        # as in BalanceCheckpointRepository.get_start, the opening balance is the start when it's later than
+        # the checkpoint, the transactions after that checkpoint are then all kept ones, dated on or after the cutoff
+        start_balance = case(
+            (
+                and_(
+                    accounts.c.cutoff <= on_date,
+                    or_(accounts.c.checkpoint_date.is_(None), accounts.c.checkpoint_date < accounts.c.cutoff),
+                ),
+                accounts.c.opening_balance,
+            ),
+            else_=BalanceCheckpoint.balance,
+        )
+        checkpoint = and_(
+            BalanceCheckpoint.account_id == accounts.c.id, BalanceCheckpoint.date == accounts.c.checkpoint_date
+        )
+        # both date bounds are part of the join, so each account is an index range scan from its checkpoint
+        transactions_after_checkpoint = and_(
+            Transaction.account_id == accounts.c.id,
+            Transaction.date > func.coalesce(accounts.c.checkpoint_date, date.min),
+            Transaction.date <= on_date,
+        )
+        # the archive is summed only for accounts archived past the date
+        archived_amount = case(
+            (
+                accounts.c.cutoff > on_date,
+                select(func.sum(ArchivedTransaction.amount))
+                .where(
+                    ArchivedTransaction.account_id == accounts.c.id,
+                    ArchivedTransaction.date > func.coalesce(accounts.c.checkpoint_date, date.min),
+                    ArchivedTransaction.date <= on_date,
+                )
+                .scalar_subquery(),
+            )
+        )
+        return (
+            select(accounts.c.id, start_balance, func.sum(Transaction.amount), archived_amount)
+            .select_from(accounts)
+            .outerjoin(BalanceCheckpoint, checkpoint)
+            .outerjoin(Transaction, transactions_after_checkpoint)
+            .group_by(
+                accounts.c.id,
+                accounts.c.checkpoint_date,
+                accounts.c.cutoff,
+                accounts.c.opening_balance,
+                BalanceCheckpoint.balance,
             )
+        )
@@ -2,37 +2,82 @@ from datetime import date
 from decimal import Decimal
 from typing import TYPE_CHECKING
 
-from sqlalchemy import func
+from sqlalchemy import event, func
 
-from app.account import Account, AccountType, Transaction
+from app.account import Account, AccountType
+from app.account.balance_cache import balance_cache
 from app.account.schemas import SAccount, SAccountAdd
 from app.config import settings
+from app.utils.instrumentation import instrumented
 
 if TYPE_CHECKING:
-    from app.utils.uow import AbstractUoW
+    from app.utils.uow import AbstractUoW, AsyncUoW
 
 
 class AccountService:
     @classmethod
+    @instrumented
     def get_balance(cls, uow: "AbstractUoW", account_id: int, trx_date: date | None = None) -> "Decimal":
+        trx_date = cls._get_lookup_date(trx_date)
+        with uow:
+            database = str(uow.session.get_bind().url)
+            return balance_cache.get_or_compute(
+                database, account_id, trx_date, lambda: cls._compute_balance(uow, account_id, trx_date)
+            )
+
+    @classmethod
+    @instrumented
+    def get_balances(
+        cls, uow: "AbstractUoW", account_ids: list[int], trx_date: date | None = None
+    ) -> dict[int, "Decimal"]:
+        """Return balances of many accounts on a date by account ID, unknown IDs are left out.
+
+        All balances are computed by a single grouped query instead of a query per account.
+        """
+        trx_date = cls._get_lookup_date(trx_date)
+        with uow:
+            return uow.account.get_balances(list(dict.fromkeys(account_ids)), trx_date)
+
+    @staticmethod
+    def _get_lookup_date(trx_date: date | None) -> date:
         if trx_date:
             if trx_date > date.today():
                 raise ValueError("You cannot lookup in the future! :)")
-        else:
-            trx_date = date.today()
-        with uow:
-            result = uow.transactions.get_aggregated(
-                filters=[
-                    Transaction.date <= trx_date,
-                    Transaction.account_id == account_id,
-                ],
-                aggregate_func=func.sum,
-                column_name="amount",
-            )
-            balance = result[0] or 0
-            return Decimal(balance)
+            return trx_date
+        return date.today()
+
+    @staticmethod
+    def _compute_balance(uow: "AbstractUoW", account_id: int, trx_date: date) -> "Decimal":
+        # start from the closest month-end or opening balance and sum only the transactions after it,
+        # archived ones are read only for dates before the archival cutoff
+        start_date, balance, cutoff = uow.checkpoints.get_start(account_id, trx_date)
+        ledger = uow.archive if cutoff and trx_date < cutoff else uow.transactions
+        filters = [
+            ledger.model.date <= trx_date,
+            ledger.model.account_id == account_id,
+        ]
+        if start_date:
+            filters.append(ledger.model.date > start_date)
+        result = ledger.get_aggregated(
+            filters=filters,
+            aggregate_func=func.sum,
+            column_name="amount",
+        )
+        return Decimal(balance + (result[0] or 0))
+
+    @staticmethod
+    def invalidate_balances(uow: "AbstractUoW", account_id: int, from_date: date) -> None:
+        """Drop cached balances of the account on or after ``from_date`` once the current transaction commits."""
+        database = str(uow.session.get_bind().url)
+        event.listen(
+            uow.session,
+            "after_commit",
+            lambda session: balance_cache.invalidate(database, account_id, from_date),
+            once=True,
+        )
 
     @classmethod
+    @instrumented
     def create_one(
         cls,
         uow: "AbstractUoW",
@@ -44,15 +89,26 @@ class AccountService:
             return uow.account.create_one(data.model_dump())
 
     @classmethod
+    @instrumented
     def get_one(cls, uow: "AbstractUoW", filters=None, order_by=None) -> SAccount | None:
         with uow:
             account = uow.account.get_one(filters, order_by)
             return account and SAccount.model_validate(account) or None
 
+    @instrumented
     def get_by_type(self, uow: "AbstractUoW", account_type: "AccountType") -> SAccount | None:
-        return self.get_one(uow, filters=[Account.account_type == account_type])
+        """Return the first created account of the type."""
+        return self.get_one(uow, filters=[Account.account_type == account_type], order_by=Account.id)
 
     @classmethod
+    @instrumented
+    def get_all_by_type(cls, uow: "AbstractUoW", account_type: "AccountType") -> list[SAccount]:
+        with uow:
+            accounts = uow.account.get_all(filters=[Account.account_type == account_type], order_by=Account.id)
+            return [SAccount.model_validate(account) for account in accounts]
+
+    @classmethod
+    @instrumented
     def get_by_id(cls, uow: "AbstractUoW", rec_id: int) -> SAccount | None:
         with uow:
             account = uow.account.get_by_id(rec_id)
@@ -67,3 +123,37 @@ class AccountService:
             credit_limit=0 if account_type == AccountType.DEBIT else settings.DEFAULT_CREDIT_LIMIT,
             balance=0,
         )
+
+
+class AsyncAccountService:
+    """Async counterpart of ``AccountService``, runs the same code on an ``AsyncUoW``."""
+
+    @classmethod
+    async def get_balance(cls, uow: "AsyncUoW", account_id: int, trx_date: date | None = None) -> "Decimal":
+        return await uow.run_sync(AccountService.get_balance, account_id, trx_date)
+
+    @classmethod
+    async def get_balances(
+        cls, uow: "AsyncUoW", account_ids: list[int], trx_date: date | None = None
+    ) -> dict[int, "Decimal"]:
+        return await uow.run_sync(AccountService.get_balances, account_ids, trx_date)
+
+    @classmethod
+    async def create_one(cls, uow: "AsyncUoW", acc_type: "AccountType", data: SAccountAdd | None = None) -> int:
+        return await uow.run_sync(AccountService.create_one, acc_type, data)
+
+    @classmethod
+    async def get_one(cls, uow: "AsyncUoW", filters=None, order_by=None) -> SAccount | None:
+        return await uow.run_sync(AccountService.get_one, filters, order_by)
+
+    @classmethod
+    async def get_by_type(cls, uow: "AsyncUoW", account_type: "AccountType") -> SAccount | None:
+        return await uow.run_sync(AccountService().get_by_type, account_type)
+
+    @classmethod
+    async def get_all_by_type(cls, uow: "AsyncUoW", account_type: "AccountType") -> list[SAccount]:
+        return await uow.run_sync(AccountService.get_all_by_type, account_type)
+
+    @classmethod
+    async def get_by_id(cls, uow: "AsyncUoW", rec_id: int) -> SAccount | None:
+        return await uow.run_sync(AccountService.get_by_id, rec_id)
@@ -0,0 +1,133 @@
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import date
+from decimal import Decimal
+from itertools import accumulate
+
+from app.utils.helper_methods import from_cents, to_cents
+
+from .schemas import STransactionAdd
+
+
+class TransactionBatch(Sequence[STransactionAdd]):
+    """Compact column storage of already validated transactions of one account.
+
+    Dates are kept as day ordinals and amounts as integer cents in ``array`` buffers, descriptions are
+    concatenated into one string pool with the offsets of their ends. A row takes 20 bytes plus its
+    description instead of a model with its own ``date``, ``Decimal`` and ``str`` objects. Models are
+    built only when rows are accessed, ``to_rows`` feeds the bulk insert directly.
+    """
+
+    __slots__ = ("account_id", "ordinals", "cents", "descriptions", "offsets")
+
+    def __init__(self, account_id: int, ordinals: array, cents: array, descriptions: str, offsets: array) -> None:
+        if not len(ordinals) == len(cents) == len(offsets) - 1:
+            raise ValueError("Columns must have the same length!")
+        self.account_id = account_id
+        self.ordinals = ordinals
+        self.cents = cents
+        self.descriptions = descriptions
+        self.offsets = offsets
+
+    @classmethod
+    def from_columns(
+        cls, dates: Iterable[date], descriptions: Iterable[str], amounts: Iterable[Decimal], account_id: int
+    ) -> "TransactionBatch":
+        """Build a batch of converted columns, e.g. those of ``TransactionBatchValidator.convert_columns``."""
+        return cls.from_ordinals(map(date.toordinal, dates), descriptions, map(to_cents, amounts), account_id)
+
+    @classmethod
+    def from_ordinals(
+        cls, ordinals: Iterable[int], descriptions: Iterable[str], cents: Iterable[int], account_id: int
+    ) -> "TransactionBatch":
+        descriptions = list(descriptions)
+        offsets = array("q", accumulate(map(len, descriptions), initial=0))
+        return cls(account_id, array("i", ordinals), array("q", cents), "".join(descriptions), offsets)
+
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[STransactionAdd], account_id: int) -> "TransactionBatch":
+        transactions = list(transactions)
+        return cls.from_columns(
+            (trx.date for trx in transactions),
+            (trx.description for trx in transactions),
+            (trx.amount for trx in transactions),
+            account_id,
+        )
+
+    def __len__(self) -> int:  # noqa: D105
+        return len(self.ordinals)
+
+    def __getitem__(self, index):
+        """Return the model of a row, built on access, or a batch of a slice."""
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                indices = range(start, stop, step)
+                return self.from_ordinals(
+                    (self.ordinals[i] for i in indices),
+                    (self._get_description(i) for i in indices),
+                    (self.cents[i] for i in indices),
+                    self.account_id,
+                )
+            stop = max(start, stop)
+            first_offset = self.offsets[start]
+            return type(self)(
+                self.account_id,
+                self.ordinals[start:stop],
+                self.cents[start:stop],
+                self.descriptions[first_offset : self.offsets[stop]],
+                array("q", (offset - first_offset for offset in self.offsets[start : stop + 1])),
+            )
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("TransactionBatch index out of range")
+        return STransactionAdd.model_construct(
+            date=date.fromordinal(self.ordinals[index]),
+            amount=from_cents(self.cents[index]),
+            description=self._get_description(index),
+            account_id=self.account_id,
+        )
+
+    def _get_description(self, index: int) -> str:
+        return self.descriptions[self.offsets[index] : self.offsets[index + 1]]
+
+    def __iter__(self) -> Iterator[STransactionAdd]:  # noqa: D105
+        return (self[index] for index in range(len(self)))
+
+    def __eq__(self, other: object) -> bool:  # noqa: D105
+        if not isinstance(other, TransactionBatch):
+            return NotImplemented
+        return (self.account_id, self.ordinals, self.cents, self.descriptions, self.offsets) == (
+            other.account_id,
+            other.ordinals,
+            other.cents,
+            other.descriptions,
+            other.offsets,
+        )
+
+    @property
+    def total(self) -> Decimal:
+        return from_cents(sum(self.cents))
+
+    @property
+    def first_date(self) -> date:
+        return date.fromordinal(min(self.ordinals))
+
+    @property
+    def last_date(self) -> date:
+        return date.fromordinal(max(self.ordinals))
+
+    def to_rows(self, start: int = 0, stop: int | None = None) -> list[dict]:
+        """Return rows between ``start`` and ``stop`` as dicts to insert, like ``model_dump`` of the models."""
+        stop = len(self) if stop is None else min(stop, len(self))
+        descriptions, offsets, account_id = self.descriptions, self.offsets, self.account_id
+        return [
+            {
+                "date": date.fromordinal(self.ordinals[index]),
+                "amount": from_cents(self.cents[index]),
+                "description": descriptions[offsets[index] : offsets[index + 1]],
+                "account_id": account_id,
+            }
+            for index in range(start, stop)
+        ]
@@ -1,12 +1,12 @@
 from datetime import date
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Date, ForeignKey
+from sqlalchemy import Date, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
 
-from ..type_annotations import col_num_10_2
+from ..type_annotations import col_amount
 
 if TYPE_CHECKING:
     from ..models import Account
@@ -17,6 +17,14 @@ class Transaction(Base):
 
     date: Mapped[date] = mapped_column(Date)
     description: Mapped[str]
-    amount: Mapped[col_num_10_2]
+    amount: Mapped[col_amount]
     account_id: Mapped[int] = mapped_column(ForeignKey("account.id"))
+    fingerprint: Mapped[str | None] = mapped_column(comment="set only by deduplicating imports")
     account: Mapped["Account"] = relationship(back_populates="transactions", order_by=date)
+
+    __table_args__ = (
+        # covering index: balance SUMs are answered from the index alone,
+        # date range lookups are range scans already sorted by date
+        Index("ix_transaction_account_id_date_amount", "account_id", "date", "amount"),
+        Index("ix_transaction_account_id_fingerprint", "account_id", "fingerprint", unique=True),
+    )
@@ -1,7 +1,73 @@
+from datetime import date
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+from sqlalchemy import Column, MetaData, Table, exists, insert, select
+
 from app.utils.repository import SqlAlchemyRepository
 
+from ..archive.models import ArchivedTransaction
 from .models import Transaction
 
+if TYPE_CHECKING:
+    from .batch import TransactionBatch
+
+# rows of a TransactionBatch turned into dicts at a time
+BATCH_INSERT_SIZE = 10_000
+
 
 class TransactionRepository(SqlAlchemyRepository):
     model = Transaction
+
+    def create_batch(self, batch: "TransactionBatch", returning: bool = True) -> list[int]:
+        """Insert a ``TransactionBatch`` slice by slice, so only ``BATCH_INSERT_SIZE`` rows exist as dicts at a time."""
+        ids: list[int] = []
+        for start in range(0, len(batch), BATCH_INSERT_SIZE):
+            ids += self.create_multi(batch.to_rows(start, start + BATCH_INSERT_SIZE), returning=returning)
+        return ids
+
+    def create_new(self, data_list: list[dict]) -> tuple[list[int], Decimal, date | None]:
+        """Insert only rows whose fingerprint isn't stored for the account yet.
+
+        Rows are loaded into a temporary staging table and anti-joined against the fingerprint indexes of
+        the transaction and the archive tables, so existing rows cost index probes instead of a lookup query per row.
+        Archived rows are skipped as well, so re-importing a statement that reaches back before the archival
+        cutoff only adds its newer rows.
+        Returns IDs of the inserted rows, their total amount and their earliest date.
+        """
+        table = self.model.__table__
+        staging = Table(
+            "transaction_staging",
+            MetaData(),
+            *(Column(column.name, column.type) for column in table.columns if not column.primary_key),
+            prefixes=["TEMPORARY"],
+        )
+        connection = self.session.connection()
+        # pysqlite commits the CREATE on its own, while the DROP below is undone if the import rolls back,
+        # so a failed import leaves the table on its pooled connection
+        staging.drop(connection, checkfirst=True)
+        staging.create(connection)
+        try:
+            self.session.execute(insert(staging), data_list)
+            new_rows = select(*staging.columns).where(
+                *(
+                    ~exists().where(
+                        model.account_id == staging.c.account_id, model.fingerprint == staging.c.fingerprint
+                    )
+                    for model in (self.model, ArchivedTransaction)
+                )
+            )
+            # the INSERT is the first statement reading the main database: on SQLite a transaction that reads
+            # before writing fails right away if another one commits meanwhile, while a writer waits for the lock
+            stmt = (
+                insert(table)
+                .from_select(list(staging.columns.keys()), new_rows)
+                .returning(table.c.id, table.c.amount, table.c.date)
+            )
+            rows = self.session.execute(stmt).all()
+        finally:
+            staging.drop(connection)
+        if not rows:
+            return [], Decimal(0), None
+        ids, amounts, dates = zip(*rows)
+        return list(ids), Decimal(sum(amounts)), min(dates)
@@ -32,3 +32,8 @@ class STransactionAdd(ModelSchema):
 
 class STransaction(STransactionAdd):
     id: PositiveInt
+
+
+class STransactionPage(ModelSchema):
+    transactions: list[STransaction]
+    next_cursor: str | None = None
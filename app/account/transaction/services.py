@@ -1,21 +1,33 @@
+from collections import Counter
+from collections.abc import Iterable, Iterator
 from datetime import date, datetime
 from decimal import Decimal
+from hashlib import blake2b
 from typing import TYPE_CHECKING, Annotated
 
 from pydantic import PositiveInt, TypeAdapter
-from sqlalchemy import and_, desc
+from sqlalchemy import and_, desc, or_
 
+from app.account.services import AccountService
+from app.config import settings
+from app.utils.instrumentation import instrumented
+from app.utils.uow import retry_on_conflict
+
+from .batch import TransactionBatch
+from .schemas import STransactionPage
 from .type_annotations import TransactionsDataList, TransactionsList
 
 if TYPE_CHECKING:
-    from app.utils.uow import AbstractUoW
+    from app.utils.uow import AbstractUoW, AsyncUoW
 
 IDs = Annotated[list[PositiveInt], "IDs"]
 trx_adapter = TypeAdapter(TransactionsList)
+PAGE_SIZE = 100
 
 
 class TransactionService:
     @classmethod
+    @instrumented
     def get_by_date_range(
         cls,
         uow: "AbstractUoW",
@@ -25,9 +37,9 @@ class TransactionService:
     ) -> TransactionsList:
         start_date = start_date or datetime.min.date()
         end_date = end_date or date.today()
-        with (uow):
-            trx = uow.transactions.model
-            transactions = uow.transactions.get_all(
+        with uow:
+            trx = uow.ledger.model
+            transactions = uow.ledger.get_all(
                 filters=[
                     and_(
                         trx.date.between(start_date, end_date),
@@ -41,8 +53,231 @@ class TransactionService:
             return trx_adapter.validate_python(transactions)
 
     @classmethod
-    def create(cls, uow: "AbstractUoW", account_id: int, data: TransactionsDataList) -> IDs:
+    @instrumented
+    def search_page(
+        cls,
+        uow: "AbstractUoW",
+        account_id: int,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        cursor: str | None = None,
+        limit: int = PAGE_SIZE,
+    ) -> STransactionPage:
+        """Return up to ``limit`` transactions, newest first, and a cursor pointing to the next page.
+
+        Keyset pagination on (date, id): every page is an index range scan that starts
+        right after the last row of the previous page, however deep the page is.
+        """
+        start_date = start_date or datetime.min.date()
+        end_date = end_date or date.today()
+        with uow:
+            trx = uow.ledger.model
+            filters = [trx.account_id == account_id, trx.date.between(start_date, end_date)]
+            if cursor:
+                cursor_date, cursor_id = cls._decode_cursor(cursor)
+                # the redundant "date <=" bounds the index range, the OR skips rows of the previous pages
+                filters += [trx.date <= cursor_date, or_(trx.date < cursor_date, trx.id < cursor_id)]
+            transactions = uow.ledger.get_all(filters=filters, order_by=[desc(trx.date), desc(trx.id)], limit=limit + 1)
+            next_cursor = None
+            if len(transactions) > limit:
+                transactions = transactions[:limit]
+                next_cursor = cls._encode_cursor(transactions[-1].date, transactions[-1].id)
+            return STransactionPage(transactions=trx_adapter.validate_python(transactions), next_cursor=next_cursor)
+
+    @classmethod
+    def iter_pages(
+        cls,
+        uow: "AbstractUoW",
+        account_id: int,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        limit: int = PAGE_SIZE,
+    ) -> Iterator[STransactionPage]:
+        """Yield pages of ``search_page`` until the last one, each page is fetched on demand."""
+        cursor = None
+        while True:
+            page = cls.search_page(uow, account_id, start_date, end_date, cursor, limit)
+            yield page
+            if not (cursor := page.next_cursor):
+                return
+
+    @staticmethod
+    def _encode_cursor(trx_date: date, trx_id: int) -> str:
+        return f"{trx_date.isoformat()}:{trx_id}"
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple[date, int]:
+        try:
+            trx_date, trx_id = cursor.split(":")
+            return date.fromisoformat(trx_date), int(trx_id)
+        except ValueError:
+            raise ValueError(f"Invalid cursor: {cursor}")
+
+    @classmethod
+    @instrumented
+    @retry_on_conflict
+    def create(
+        cls,
+        uow: "AbstractUoW",
+        account_id: int,
+        data: TransactionsDataList | TransactionBatch,
+        deduplicate: bool = False,
+    ) -> IDs:
+        """Insert transactions, a list of models or a compact ``TransactionBatch``, and return their IDs.
+
+        With ``deduplicate`` every row gets a fingerprint and rows stored by a previous deduplicating
+        import are skipped, only IDs of the new rows are returned. An import that loses a write conflict
+        to a concurrent one is retried.
+        """
         with uow:  # single transaction
-            transactions = uow.transactions.create_multi(data_list=[d.model_dump() for d in data])
-            uow.account.update_balance(account_id, Decimal(sum(trx.amount for trx in data)))
+            if deduplicate:
+                transactions, total, first_date = uow.transactions.create_new(
+                    cls._get_rows(account_id, data, Counter())
+                )
+            elif isinstance(data, TransactionBatch):
+                transactions = uow.transactions.create_batch(data)
+                total, first_date = data.total, data.first_date
+            else:
+                transactions = uow.transactions.create_multi(data_list=cls._get_rows(account_id, data))
+                total, first_date = Decimal(sum(trx.amount for trx in data)), min(trx.date for trx in data)
+            if transactions:
+                cls._check_not_archived(uow, account_id, first_date)
+                uow.account.update_balance(account_id, total)
+                uow.checkpoints.rebuild(account_id, first_date)
+                if settings.MONTHLY_TOTALS:
+                    uow.monthly_totals.rebuild(account_id, first_date, cls._get_last_date(data))
+                AccountService.invalidate_balances(uow, account_id, first_date)
             return transactions
+
+    @classmethod
+    @instrumented
+    def create_from_chunks(
+        cls,
+        uow: "AbstractUoW",
+        account_id: int,
+        chunks: Iterable[TransactionsDataList | TransactionBatch],
+        deduplicate: bool = False,
+    ) -> int:
+        """Insert transactions chunk by chunk and return the number of imported rows.
+
+        All chunks are written in a single transaction and the balance is updated once at the end,
+        so either the whole import succeeds or nothing is stored. Unlike ``create`` it isn't retried
+        on write conflicts, as the chunks can't be read again.
+        """
+        occurrences: Counter | None = Counter() if deduplicate else None
+        with uow:  # single transaction
+            total, count, parsed_count, first_date, last_date = Decimal(0), 0, 0, date.max, date.min
+            for chunk in chunks:
+                parsed_count += len(chunk)
+                if deduplicate:
+                    rows = cls._get_rows(account_id, chunk, occurrences)
+                    ids, chunk_total, chunk_first_date = uow.transactions.create_new(rows)
+                    if not ids:
+                        continue
+                    chunk_count = len(ids)
+                elif isinstance(chunk, TransactionBatch):
+                    uow.transactions.create_batch(chunk, returning=False)
+                    chunk_count, chunk_total, chunk_first_date = len(chunk), chunk.total, chunk.first_date
+                else:
+                    uow.transactions.create_multi(data_list=cls._get_rows(account_id, chunk), returning=False)
+                    chunk_count, chunk_total = len(chunk), sum(trx.amount for trx in chunk)
+                    chunk_first_date = min(trx.date for trx in chunk)
+                total += chunk_total
+                count += chunk_count
+                first_date = min(first_date, chunk_first_date)
+                last_date = max(last_date, cls._get_last_date(chunk))
+            if not parsed_count:
+                raise ValueError("No data to import!")
+            if count:
+                cls._check_not_archived(uow, account_id, first_date)
+                uow.account.update_balance(account_id, total)
+                uow.checkpoints.rebuild(account_id, first_date)
+                if settings.MONTHLY_TOTALS:
+                    uow.monthly_totals.rebuild(account_id, first_date, last_date)
+                AccountService.invalidate_balances(uow, account_id, first_date)
+            return count
+
+    @classmethod
+    @instrumented
+    @retry_on_conflict
+    def archive(cls, uow: "AbstractUoW", account_id: int, before: date) -> int:
+        """Move transactions of the account older than the month of ``before`` to the archive.
+
+        Whole months are archived, so month-end checkpoints stay valid on both sides of the cutoff.
+        The opening balance of the account is moved to the cutoff, balances start from it and read the archive
+        only for dates before the cutoff. Searches read both tables, each through its own index.
+        Returns the number of archived transactions.
+        """
+        if before > date.today():
+            raise ValueError("You cannot archive the future! :)")
+        cutoff = before.replace(day=1)
+        with uow:  # single transaction
+            opening = uow.opening_balances.get_by_account(account_id)
+            if opening and opening.date >= cutoff:
+                return 0
+            count, total = uow.archive.archive(account_id, cutoff)
+            uow.opening_balances.move(account_id, cutoff, total)
+            return count
+
+    @staticmethod
+    def _check_not_archived(uow: "AbstractUoW", account_id: int, first_date: date) -> None:
+        if (opening := uow.opening_balances.get_by_account(account_id)) and first_date < opening.date:
+            raise ValueError(f"Impossible to import data, transactions before {opening.date} are archived")
+
+    @staticmethod
+    def _get_last_date(data: TransactionsDataList | TransactionBatch) -> date:
+        return data.last_date if isinstance(data, TransactionBatch) else max(trx.date for trx in data)
+
+    @staticmethod
+    def _get_rows(
+        account_id: int, data: TransactionsDataList | TransactionBatch, occurrences: Counter | None = None
+    ) -> list[dict]:
+        """Dump transactions to rows, fingerprinted if the ``occurrences`` counter is given.
+
+        The fingerprint covers the account, date, amount, description and the ordinal of the same
+        transaction within the import, so identical transactions on the same day are kept apart.
+        """
+        rows = data.to_rows() if isinstance(data, TransactionBatch) else [trx.model_dump() for trx in data]
+        if occurrences is not None:
+            for row in rows:
+                key = (row["date"], row["amount"], row["description"])
+                occurrences[key] += 1
+                fingerprint = f"{account_id}|{key[0]:%Y-%m-%d}|{key[1]:.2f}|{key[2]}|{occurrences[key]}"
+                row["fingerprint"] = blake2b(fingerprint.encode(), digest_size=16).hexdigest()
+        return rows
+
+
+class AsyncTransactionService:
+    """Async counterpart of ``TransactionService``, runs the same code on an ``AsyncUoW``."""
+
+    @classmethod
+    async def get_by_date_range(
+        cls,
+        uow: "AsyncUoW",
+        account_id: int,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> TransactionsList:
+        return await uow.run_sync(TransactionService.get_by_date_range, account_id, start_date, end_date)
+
+    @classmethod
+    async def search_page(
+        cls,
+        uow: "AsyncUoW",
+        account_id: int,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        cursor: str | None = None,
+        limit: int = PAGE_SIZE,
+    ) -> STransactionPage:
+        return await uow.run_sync(TransactionService.search_page, account_id, start_date, end_date, cursor, limit)
+
+    @classmethod
+    async def create(
+        cls, uow: "AsyncUoW", account_id: int, data: TransactionsDataList | TransactionBatch, deduplicate: bool = False
+    ) -> IDs:
+        return await uow.run_sync(TransactionService.create, account_id, data, deduplicate)
+
+    @classmethod
+    async def archive(cls, uow: "AsyncUoW", account_id: int, before: date) -> int:
+        return await uow.run_sync(TransactionService.archive, account_id, before)
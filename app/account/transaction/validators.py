@@ -0,0 +1,139 @@
+from collections.abc import Iterable, Sequence
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from app.config import settings
+
+from .schemas import STransactionAdd
+from .type_annotations import TransactionsDataList
+
+_object_setattr = object.__setattr__
+
+CENTS = Decimal("0.00")
+FIELDS_SET = set(STransactionAdd.model_fields)
+ISO_DATE_LENGTH = len("YYYY-MM-DD")
+
+
+class RowValidationError(ValueError):
+    """Invalid row of an imported file, rows are numbered from 1 after the header."""
+
+    def __init__(self, row_number: int, message: str) -> None:
+        # both arguments are kept in ``args``, so the error is rebuilt the same way when unpickled
+        super().__init__(row_number, message)
+        self.row_number = row_number
+        self.message = message
+
+    def __str__(self) -> str:
+        return f"The row number {self.row_number}: {self.message}"
+
+    def __reduce__(self):
+        return type(self), self.args
+
+
+class TransactionBatchValidator:
+    """Validate transactions column by column instead of building a pydantic model per row.
+
+    Follows ``STransactionAdd`` semantics, except that dates are only accepted in the
+    documented ``YYYY-MM-DD`` format. Errors name the first offending row.
+    """
+
+    @classmethod
+    def validate_columns(
+        cls,
+        dates: Sequence[str],
+        descriptions: Sequence[str],
+        amounts: Sequence[str],
+        account_id: int,
+        first_row_number: int = 1,
+    ) -> TransactionsDataList:
+        parsed_dates, parsed_amounts = cls.convert_columns(dates, descriptions, amounts, first_row_number)
+        return cls.build(parsed_dates, descriptions, parsed_amounts, account_id)
+
+    @classmethod
+    def convert_columns(
+        cls,
+        dates: Sequence[str],
+        descriptions: Sequence[str],
+        amounts: Sequence[str],
+        first_row_number: int = 1,
+        parse_dates: bool = True,
+    ) -> tuple[list[date], list[Decimal]]:
+        """Return converted dates and amounts, raise ``RowValidationError`` for the first invalid row.
+
+        Without ``parse_dates`` the dates are expected to be ``date`` objects already, e.g. read from a typed column.
+        """
+        if not len(dates) == len(descriptions) == len(amounts):
+            raise ValueError("Columns must have the same length!")
+        errors: list[tuple[int, str]] = []
+        date_converter = cls._to_date if parse_dates else cls._check_date
+        parsed_dates = cls._convert_column(dates, date_converter, errors, "Incorrect transaction date!")
+        parsed_amounts = cls._convert_column(amounts, cls._to_amount, errors, "Incorrect transaction amount!")
+        if not all(descriptions):
+            errors.append((cls._first_falsy(descriptions), "Missing transaction description!"))
+        if errors:
+            index, message = min(errors)
+            raise RowValidationError(first_row_number + index, message)
+        return parsed_dates, parsed_amounts
+
+    @classmethod
+    def build(
+        cls, dates: Iterable[date], descriptions: Iterable[str], amounts: Iterable[Decimal], account_id: int
+    ) -> TransactionsDataList:
+        """Build transactions from already converted columns."""
+        if account_id <= 0:
+            raise ValueError("Incorrect account id!")
+        return [
+            cls._construct({"date": trx_date, "amount": amount, "description": description, "account_id": account_id})
+            for trx_date, amount, description in zip(dates, amounts, descriptions)
+        ]
+
+    @staticmethod
+    def _construct(values: dict) -> STransactionAdd:
+        """Build an already validated model, a lean version of ``BaseModel.model_construct``."""
+        transaction = STransactionAdd.__new__(STransactionAdd)
+        _object_setattr(transaction, "__dict__", values)
+        _object_setattr(transaction, "__pydantic_fields_set__", FIELDS_SET.copy())
+        _object_setattr(transaction, "__pydantic_extra__", None)
+        _object_setattr(transaction, "__pydantic_private__", None)
+        return transaction
+
+    @classmethod
+    def _convert_column(cls, column, converter, errors: list[tuple[int, str]], message: str) -> list:
+        """Convert the whole column, locating the first bad value only if conversion fails."""
+        try:
+            converted = list(map(converter, column))
+        except (ValueError, TypeError, InvalidOperation):
+            for index, value in enumerate(column):
+                try:
+                    converter(value)
+                except (ValueError, TypeError, InvalidOperation):
+                    errors.append((index, message))
+                    break
+            return []
+        if not all(converted):
+            errors.append((cls._first_falsy(converted), message))
+        return converted
+
+    @staticmethod
+    def _to_date(value: str) -> date:
+        # fromisoformat also reads other 10 characters long ISO dates, e.g. the week date 2023-W13-1
+        if len(value) != ISO_DATE_LENGTH or value[4] != "-" or value[7] != "-":
+            raise ValueError
+        return date.fromisoformat(value)
+
+    @staticmethod
+    def _check_date(value: date) -> date:
+        if not isinstance(value, date):
+            raise TypeError
+        return value
+
+    @staticmethod
+    def _to_amount(value: str, rounding: str = settings.ROUNDING) -> Decimal:
+        amount = Decimal(value)
+        if not amount.is_finite():
+            raise ValueError
+        return amount.quantize(CENTS, rounding=rounding)
+
+    @staticmethod
+    def _first_falsy(column: Sequence) -> int:
+        return next(index for index, value in enumerate(column) if not value)
@@ -1,6 +1,11 @@
+from decimal import Decimal
 from typing import Annotated
 
 from sqlalchemy import Numeric
 from sqlalchemy.orm import mapped_column
 
-col_num_10_2 = Annotated[float, mapped_column(Numeric(10, 2), default=0)]
+from app.config import settings
+from app.utils.types import Cents
+
+amount_type = Cents() if settings.AMOUNT_STORAGE == "cents" else Numeric(10, 2)
+col_amount = Annotated[Decimal, mapped_column(amount_type, default=0)]
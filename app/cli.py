@@ -1,17 +1,22 @@
+from collections.abc import Iterator
 from datetime import date, datetime
 from logging import getLogger
 from os.path import exists
 from typing import TYPE_CHECKING
 
-from app.account import AccountType
+from app.account import AccountType, Period
+from app.account.report.services import ReportService
 from app.account.services import AccountService
 from app.account.transaction.services import TransactionService
 from app.config import settings
 from app.database import Database
 from app.parser import TransactionParser
+from app.parser.models import strategy_map
 from app.utils.uow import UoW
 
 if TYPE_CHECKING:
+    from app.account.report.schemas import SPeriodTotal
+    from app.account.transaction.schemas import STransactionPage
     from app.account.transaction.type_annotations import TransactionsList
     from app.utils.uow import AbstractUoW
 
@@ -20,9 +25,12 @@ _logger = getLogger(__name__)
 
 
 class BankAppCli:
+    PAGE_SIZE = 50
+
     def __init__(self, db: Database) -> None:
         self.acc_service: "AccountService" = AccountService()
         self.trx_service: "TransactionService" = TransactionService()
+        self.report_service: "ReportService" = ReportService()
         self.db: "Database" = db
         self.account_id: int
         self.uow: "AbstractUoW" = UoW(db)  # imported instance
@@ -30,9 +38,10 @@ class BankAppCli:
 
         self.menu_options = {
             "0": ("Exit", self.exit_app),
-            "1": ("Import transactions (supported formats are: csv)", self.import_data),
+            "1": (f"Import transactions (supported formats are: {', '.join(strategy_map)})", self.import_data),
             "2": ("Show balance", self.show_balance),
             "3": ("Search transactions for the a given period", self.search_transactions),
+            "4": ("Show totals per day, month or year", self.show_totals),
         }
         self.menu_msg = "\n".join(f"{k}: {v[0]}" for k, v in self.menu_options.items())
 
@@ -45,8 +54,9 @@ class BankAppCli:
 
     def import_data(self):
         try:
-            trx_data = self.parser.parse_data(self.get_file_path(), account_id=self.account_id)
-            _, balance = self.trx_service.create(self.uow, self.account_id, trx_data)
+            chunks = self.parser.parse_chunks(self.get_file_path(), account_id=self.account_id)
+            self.trx_service.create_from_chunks(self.uow, self.account_id, chunks)
+            balance = self.acc_service.get_by_id(self.uow, self.account_id).balance  # type: ignore[union-attr]
             print(f"Transactions have been loaded successfully! Current balance: {balance}")
         except ValueError as e:
             _logger.error(e)
@@ -67,14 +77,30 @@ class BankAppCli:
             self.acc_service.get_balance(self.uow, self.account_id, _date),
         )
 
-    def _search_transactions(self) -> "TransactionsList":
-        return self.trx_service.get_by_date_range(
-            self.uow, self.account_id, self._get_date("start_date"), self._get_date("end_date")
+    def _search_transactions(self) -> Iterator["STransactionPage"]:
+        return self.trx_service.iter_pages(
+            self.uow, self.account_id, self._get_date("start_date"), self._get_date("end_date"), self.PAGE_SIZE
         )
 
     def search_transactions(self) -> None:
-        transactions = self._search_transactions()
-        print(self._get_transaction_table(transactions) if transactions else "No transactions found!")
+        """Print found transactions page by page, the next page is fetched only when asked for."""
+        for page in self._search_transactions():
+            if not page.transactions:
+                print("No transactions found!")
+                return
+            print(self._get_transaction_table(page.transactions))
+            if page.next_cursor and input("Press enter/return to show more or type q to stop: ").strip().lower() == "q":
+                return
+
+    def show_totals(self) -> None:
+        period = self._get_period()
+        totals = self.report_service.get_totals(
+            self.uow, self.account_id, period, self._get_date("start_date"), self._get_date("end_date")
+        )
+        if not totals:
+            print("No transactions found!")
+            return
+        print(self._get_totals_table(totals))
 
     def get_valid_action(self):
         print("\nPICK AN OPTION: ")
@@ -124,10 +150,31 @@ class BankAppCli:
             )
         return acc_type
 
+    @staticmethod
+    def _get_period() -> Period:
+        period = None
+        while not period:
+            period = getattr(Period, input("Pick a period (day/month/year): ").upper().strip(), "")
+        return period
+
     def pick_account(self) -> None:
         acc_type = self._get_account_type()
-        existing_account = self.acc_service.get_by_type(self.uow, acc_type)
-        self.account_id = existing_account.id if existing_account else self.acc_service.create_one(self.uow, acc_type)
+        accounts = self.acc_service.get_all_by_type(self.uow, acc_type)
+        if not accounts:
+            self.account_id = self.acc_service.create_one(self.uow, acc_type)
+        elif len(accounts) == 1:
+            self.account_id = accounts[0].id
+        else:
+            self.account_id = self._get_account_id([account.id for account in accounts])
+
+    @staticmethod
+    def _get_account_id(account_ids: list[int]) -> int:
+        msg = f"{len(account_ids)} accounts found, IDs from {account_ids[0]} to {account_ids[-1]}. Pick an account ID: "
+        while True:
+            account_id = input(msg).strip()
+            if account_id.isdigit() and int(account_id) in account_ids:
+                return int(account_id)
+            print("Unknown account ID, please try again!")
 
     @classmethod
     def _get_transaction_table(cls, transactions: "TransactionsList") -> str:
@@ -141,6 +188,17 @@ class BankAppCli:
             tablefmt="pretty",
         )
 
+    @classmethod
+    def _get_totals_table(cls, totals: list["SPeriodTotal"]) -> str:
+        from tabulate import tabulate
+
+        return tabulate(
+            [(t.period_start, t.inflow, t.outflow, t.net, t.count) for t in totals],
+            headers=["Period start", "Inflow", "Outflow", "Net", "Transactions"],
+            colalign=("left", "right", "right", "right", "right"),
+            tablefmt="pretty",
+        )
+
     @staticmethod
     def exit_app():
         exit(print("Goodbye!"))
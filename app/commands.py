@@ -0,0 +1,196 @@
+"""Non-interactive commands, e.g. ``python3 bank_app import --account debit statements/``,
+``python3 bank_app export --account debit ledger.csv`` or ``python3 bank_app archive --account debit 2023-01-01``."""
+
+import argparse
+import os
+from collections import deque
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from itertools import islice
+from logging import getLogger
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from app.account import AccountType
+from app.account.services import AccountService
+from app.account.transaction.batch import TransactionBatch
+from app.account.transaction.services import TransactionService
+from app.exporter import TransactionExporter
+from app.parser import TransactionParser
+from app.parser.models import strategy_map
+from app.utils.helper_methods import to_cents
+from app.utils.uow import UoW
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+    from app.database import Database
+
+_logger = getLogger(__name__)
+
+Columns = tuple[list[int], list[str], list[int]]  # date ordinals, descriptions, amounts in cents
+
+
+def parse_file(file_path: str, account_id: int) -> tuple[Columns, float]:
+    """Parse a statement in a worker process, return its columns and the parsing time.
+
+    Plain ints and strings are much cheaper to send back to the main process than models.
+    """
+    start = perf_counter()
+    transactions = TransactionParser.parse_data(file_path, account_id, vectorized=True)
+    columns = (
+        [trx.date.toordinal() for trx in transactions],
+        [trx.description for trx in transactions],
+        [to_cents(trx.amount) for trx in transactions],
+    )
+    return columns, perf_counter() - start
+
+
+class BatchImporter:
+    """Import every statement of a directory into one account.
+
+    Files are parsed concurrently by a pool of worker processes and committed one by one in the order of their
+    names, each file in a single transaction, so a run always leaves the same ledger. The first failure stops
+    the import, files committed before it are kept.
+    """
+
+    def __init__(self, db: "Database", workers: int | None = None, deduplicate: bool = False) -> None:
+        self.uow = UoW(db)
+        self.workers = workers or os.cpu_count() or 1
+        self.deduplicate = deduplicate
+
+    @staticmethod
+    def get_files(directory: str) -> list[str]:
+        if not os.path.isdir(directory):
+            raise ValueError(f"Not a directory: {directory}")
+        return [
+            os.path.join(directory, name)
+            for name in sorted(os.listdir(directory))
+            if name.split(".")[-1].lower() in strategy_map and os.path.isfile(os.path.join(directory, name))
+        ]
+
+    def get_account_id(self, account_type: AccountType) -> int:
+        account = AccountService().get_by_type(self.uow, account_type)
+        return account.id if account else AccountService.create_one(self.uow, account_type)
+
+    def run(self, account_type: AccountType, directory: str) -> bool:
+        """Import the files and print a report, return whether all of them were imported."""
+        files = self.get_files(directory)
+        if not files:
+            print(f"No supported statements found in {directory}")
+            return False
+        account_id = self.get_account_id(account_type)
+        print(f"{'file':<40} | {'rows':>10} | {'parse s':>8} | {'import s':>8} | {'rows/sec':>10}")
+        total_rows, start = 0, perf_counter()
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            # parse a few files ahead, but never keep the whole directory in memory
+            files_iter = iter(files)
+            pending: deque[tuple[str, "Future"]] = deque(
+                (file_path, executor.submit(parse_file, file_path, account_id))
+                for file_path in islice(files_iter, self.workers * 2)
+            )
+            while pending:
+                file_path, future = pending.popleft()
+                if next_file := next(files_iter, None):
+                    pending.append((next_file, executor.submit(parse_file, next_file, account_id)))
+                try:
+                    rows_count, parse_seconds, import_seconds = self._import_file(account_id, future)
+                except Exception as err:
+                    for _, pending_future in pending:
+                        pending_future.cancel()
+                    print(f"{os.path.basename(file_path):<40} | failed: {err}")
+                    return False
+                total_rows += rows_count
+                print(
+                    f"{os.path.basename(file_path):<40} | {rows_count:>10} | {parse_seconds:>8.3f} | "
+                    f"{import_seconds:>8.3f} | {rows_count / (parse_seconds + import_seconds):>10,.0f}"
+                )
+        seconds = perf_counter() - start
+        balance = AccountService.get_by_id(self.uow, account_id).balance  # type: ignore[union-attr]
+        print(f"Imported {total_rows} rows from {len(files)} files in {seconds:.3f}s")
+        print(f"Throughput: {total_rows / seconds:,.0f} rows/sec")
+        print(f"Current balance: {balance}")
+        return True
+
+    def _import_file(self, account_id: int, future: "Future") -> tuple[int, float, float]:
+        (ordinals, descriptions, cents), parse_seconds = future.result()
+        start = perf_counter()
+        transactions = TransactionBatch.from_ordinals(ordinals, descriptions, cents, account_id)
+        ids = TransactionService.create(self.uow, account_id, transactions, deduplicate=self.deduplicate)
+        return len(ids), parse_seconds, perf_counter() - start
+
+
+def export_transactions(
+    db: "Database", account_type: AccountType, file_path: str, start_date: date | None, end_date: date | None
+) -> bool:
+    """Export transactions of the account and print a summary, return whether the account exists."""
+    uow = UoW(db)
+    if not (account := AccountService().get_by_type(uow, account_type)):
+        print(f"No {account_type.name.lower()} account found")
+        return False
+    start = perf_counter()
+    rows_count = TransactionExporter.export(uow, account.id, file_path, start_date, end_date)
+    seconds = perf_counter() - start
+    print(f"Exported {rows_count} rows to {file_path} in {seconds:.3f}s")
+    print(f"Throughput: {rows_count / seconds:,.0f} rows/sec")
+    return True
+
+
+def archive_transactions(db: "Database", account_type: AccountType, before: date) -> bool:
+    """Archive transactions of the account older than the month of ``before``, return whether the account exists."""
+    uow = UoW(db)
+    if not (account := AccountService().get_by_type(uow, account_type)):
+        print(f"No {account_type.name.lower()} account found")
+        return False
+    start = perf_counter()
+    rows_count = TransactionService.archive(uow, account.id, before)
+    print(f"Archived {rows_count} transactions before {before.replace(day=1)} in {perf_counter() - start:.3f}s")
+    return True
+
+
+def get_argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="bank_app", description="Without a command the interactive menu is shown.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    import_parser = commands.add_parser("import", help="import every statement of a directory")
+    import_parser.add_argument("directory")
+    import_parser.add_argument(
+        "--account", required=True, choices=[acc_type.name.lower() for acc_type in AccountType], help="account type"
+    )
+    import_parser.add_argument("--workers", type=int, help="parsing processes, the number of CPUs by default")
+    import_parser.add_argument(
+        "--deduplicate", action="store_true", help="skip transactions stored by a previous deduplicating import"
+    )
+    export_parser = commands.add_parser("export", help="export transactions of an account, oldest first")
+    export_parser.add_argument("file", help="output file, the format is chosen by its extension: csv, jsonl or parquet")
+    export_parser.add_argument(
+        "--account", required=True, choices=[acc_type.name.lower() for acc_type in AccountType], help="account type"
+    )
+    export_parser.add_argument("--start-date", type=date.fromisoformat, help="first date, YYYY-MM-DD")
+    export_parser.add_argument("--end-date", type=date.fromisoformat, help="last date, YYYY-MM-DD")
+    archive_parser = commands.add_parser("archive", help="move old transactions of an account to the archive")
+    archive_parser.add_argument(
+        "before", type=date.fromisoformat, help="YYYY-MM-DD, whole months before the month of this date are archived"
+    )
+    archive_parser.add_argument(
+        "--account", required=True, choices=[acc_type.name.lower() for acc_type in AccountType], help="account type"
+    )
+    return parser
+
+
+def main(db: "Database", argv: Sequence[str]) -> int:
+    """Run a command and return the process exit code."""
+    args = get_argument_parser().parse_args(argv)
+    account_type = AccountType[args.account.upper()]
+    try:
+        if args.command == "export":
+            success = export_transactions(db, account_type, args.file, args.start_date, args.end_date)
+        elif args.command == "archive":
+            success = archive_transactions(db, account_type, args.before)
+        else:
+            importer = BatchImporter(db, args.workers, args.deduplicate)
+            success = importer.run(account_type, args.directory)
+    except ValueError as err:
+        _logger.error(err)
+        return 1
+    return 0 if success else 1
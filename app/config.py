@@ -1,5 +1,6 @@
 import os
 from decimal import ROUND_HALF_UP
+from typing import Literal
 
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -12,12 +13,45 @@ class Settings(BaseSettings):
 
     # Banking rounding
     ROUNDING: str = ROUND_HALF_UP
+    # "numeric" stores amounts as NUMERIC(10, 2), "cents" as integer minor units, fixed when a database is created
+    AMOUNT_STORAGE: Literal["numeric", "cents"] = "numeric"
 
     DATE_FORMAT: str
     DB_URL: str
     TEST_DB_URL: str
     DEFAULT_CREDIT_LIMIT: int | float
 
+    # Sharded mode, URLs of the databases accounts are spread over, e.g. a JSON list of SQLite files;
+    # fixed once accounts exist, as an account lives in the shard of index account_id % len(SHARD_URLS)
+    SHARD_URLS: list[str] = []
+
+    # Connection pool, ignored for in-memory SQLite
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_PRE_PING: bool = False
+    # SQLite pragmas applied to every new connection
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+
+    # Units of work that lost a write conflict, e.g. "database is locked", are re-run up to this many times,
+    # waiting a random exponential backoff starting at CONFLICT_BACKOFF_MS between attempts
+    CONFLICT_RETRIES: int = 5
+    CONFLICT_BACKOFF_MS: float = 50
+
+    # Monthly totals materialized by imports for reports,
+    # after re-enabling them run ReportService.rebuild_monthly_totals for every account
+    MONTHLY_TOTALS: bool = True
+
+    # Cached (account, date) balances per process, 0 disables the cache
+    BALANCE_CACHE_SIZE: int = 0
+
+    # Instrumentation, statements slower than the threshold are logged with their parameters
+    SLOW_QUERY_THRESHOLD_MS: float = 100
+    # Prometheus text-format snapshot of the query counters written on exit, disabled if empty
+    METRICS_FILE: str | None = None
+
 
 settings = Settings(
     DATE_FORMAT=os.getenv("DATE_FORMAT"),
@@ -0,0 +1,57 @@
+from datetime import date
+from typing import TYPE_CHECKING
+
+from app.utils.instrumentation import instrumented
+
+from .strategy import CsvExportStrategy, ExportStrategy, JsonLinesExportStrategy, ParquetExportStrategy
+
+if TYPE_CHECKING:
+    from app.utils.uow import AbstractUoW
+
+strategy_map = {"csv": CsvExportStrategy, "jsonl": JsonLinesExportStrategy, "parquet": ParquetExportStrategy}
+
+
+class TransactionExporter:
+    """TransactionExporter class for streaming transactions of an account to a file.
+
+    The format is selected by the file extension, like in ``TransactionParser``. Transactions are read
+    in batches of ``BATCH_SIZE`` rows and written as they arrive, so memory use doesn't grow with the ledger.
+
+    Raises:
+        ValueError: If the provided file format is not supported.
+
+    """
+
+    BATCH_SIZE = 10_000
+
+    @staticmethod
+    def _get_strategy(file_path: str) -> type[ExportStrategy]:
+        file_ext = file_path.split(".")[-1].lower()
+        if not (strategy := strategy_map.get(file_ext)):
+            raise ValueError("Unsupported file format.")
+        return strategy
+
+    @classmethod
+    @instrumented
+    def export(
+        cls,
+        uow: "AbstractUoW",
+        account_id: int,
+        file_path: str,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        batch_size: int = BATCH_SIZE,
+    ) -> int:
+        """Write transactions of the account, archived ones included, oldest first, and return the number of rows."""
+        export_strategy = cls._get_strategy(file_path)
+        with uow:
+            trx = uow.ledger.model
+            filters = [trx.account_id == account_id]
+            if start_date:
+                filters.append(trx.date >= start_date)
+            if end_date:
+                filters.append(trx.date <= end_date)
+            batches = uow.ledger.iter_partitions(
+                [trx.date, trx.description, trx.amount], filters, order_by=[trx.date, trx.id], batch_size=batch_size
+            )
+            return export_strategy.write(file_path, batches)
@@ -0,0 +1,4 @@
+from .abstract import ExportStrategy, Rows
+from .csv import CsvExportStrategy
+from .jsonl import JsonLinesExportStrategy
+from .parquet import ParquetExportStrategy
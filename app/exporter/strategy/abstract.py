@@ -0,0 +1,14 @@
+from collections.abc import Iterable, Sequence
+from datetime import date
+from decimal import Decimal
+from typing import Protocol
+
+# date, description, amount of every exported transaction
+Rows = Sequence[tuple[date, str, Decimal]]
+
+
+class ExportStrategy(Protocol):
+    @classmethod
+    def write(cls, file_path: str, batches: Iterable[Rows]) -> int:
+        """Write the batches one by one and return the number of written rows."""
+        raise NotImplementedError
@@ -0,0 +1,22 @@
+import csv
+from collections.abc import Iterable
+
+from app.parser.strategy import CsvStrategy
+
+from .abstract import Rows
+
+
+class CsvExportStrategy:
+    """Write the importable CSV statement format, so an exported file can be imported again."""
+
+    @classmethod
+    def write(cls, file_path: str, batches: Iterable[Rows]) -> int:
+        count = 0
+        with open(file_path, "w", encoding="UTF-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(CsvStrategy.EXPECTED_HEADER)
+            for batch in batches:
+                # str() of dates and amounts is the ISO date and the plain decimal the parser expects
+                writer.writerows(batch)
+                count += len(batch)
+        return count
@@ -0,0 +1,20 @@
+import json
+from collections.abc import Iterable
+
+from .abstract import Rows
+
+
+class JsonLinesExportStrategy:
+    """Write one JSON object per line, amounts are JSON numbers with the exact decimal digits."""
+
+    @classmethod
+    def write(cls, file_path: str, batches: Iterable[Rows]) -> int:
+        count = 0
+        with open(file_path, "w", encoding="UTF-8") as f:
+            for batch in batches:
+                f.writelines(
+                    f'{{"date": "{trx_date}", "description": {json.dumps(description)}, "amount": {amount}}}\n'
+                    for trx_date, description, amount in batch
+                )
+                count += len(batch)
+        return count
@@ -0,0 +1,28 @@
+from collections.abc import Iterable
+
+from app.utils.helper_methods import import_pyarrow
+
+from .abstract import Rows
+
+# wide enough for NUMERIC(10, 2) and for 64-bit integer cents
+AMOUNT_PRECISION = 18
+
+
+class ParquetExportStrategy:
+    """Write a Parquet file with one row group per batch, needs the optional ``pyarrow`` package."""
+
+    @classmethod
+    def write(cls, file_path: str, batches: Iterable[Rows]) -> int:
+        pa = import_pyarrow()
+        import pyarrow.parquet as pq
+
+        schema = pa.schema(
+            [("date", pa.date32()), ("description", pa.string()), ("amount", pa.decimal128(AMOUNT_PRECISION, 2))]
+        )
+        count = 0
+        with pq.ParquetWriter(file_path, schema) as writer:
+            for batch in batches:
+                arrays = [pa.array(column, type=field.type) for column, field in zip(zip(*batch), schema)]
+                writer.write_batch(pa.record_batch(arrays, schema=schema), row_group_size=len(batch))
+                count += len(batch)
+        return count
@@ -1,11 +1,17 @@
+from collections.abc import Iterator
 from typing import TYPE_CHECKING
 
-from .strategy import CsvStrategy, Strategy
+from .strategy import ArrowStrategy, CsvStrategy, ParquetStrategy, Strategy
 
 if TYPE_CHECKING:
     from app.account.transaction.type_annotations import TransactionsDataList
 
-strategy_map = {"csv": CsvStrategy}
+strategy_map = {
+    "csv": CsvStrategy,
+    "parquet": ParquetStrategy,
+    "arrow": ArrowStrategy,
+    "feather": ArrowStrategy,
+}
 
 
 class TransactionParser:
@@ -26,6 +32,26 @@ class TransactionParser:
         return parser
 
     @classmethod
-    def parse_data(cls, file_path: str, account_id: int) -> "TransactionsDataList":
+    def parse_data(
+        cls, file_path: str, account_id: int, vectorized: bool = False, workers: int = 1, memory_map: bool = False
+    ) -> "TransactionsDataList":
+        """Parse the whole file, ``memory_map`` reads large CSV statements without decoding them line by line."""
         parse_strategy = cls._get_strategy(file_path)
-        return parse_strategy.parse_data(file_path, account_id)
+        return parse_strategy.parse_data(
+            file_path, account_id, vectorized=vectorized, workers=workers, memory_map=memory_map
+        )
+
+    @classmethod
+    def parse_chunks(
+        cls,
+        file_path: str,
+        account_id: int,
+        chunk_size: int = CsvStrategy.CHUNK_SIZE,
+        vectorized: bool = False,
+        memory_map: bool = False,
+    ) -> Iterator["TransactionsDataList"]:
+        """Lazily parse the file into lists of at most ``chunk_size`` transactions."""
+        parse_strategy = cls._get_strategy(file_path)
+        return parse_strategy.parse_chunks(
+            file_path, account_id, chunk_size, vectorized=vectorized, memory_map=memory_map
+        )
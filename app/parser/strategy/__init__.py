@@ -1,2 +1,3 @@
 from .abstract import Strategy
+from .arrow import ArrowStrategy, ParquetStrategy
 from .csv import CsvStrategy
@@ -1,3 +1,4 @@
+from collections.abc import Iterator
 from typing import TYPE_CHECKING, Protocol
 
 if TYPE_CHECKING:
@@ -6,5 +7,13 @@ if TYPE_CHECKING:
 
 class Strategy(Protocol):
     @classmethod
-    def parse_data(cls, file_path: str, account_id: int) -> "TransactionsDataList":
+    def parse_data(
+        cls, file_path: str, account_id: int, vectorized: bool = False, workers: int = 1, memory_map: bool = False
+    ) -> "TransactionsDataList":
+        raise NotImplementedError
+
+    @classmethod
+    def parse_chunks(
+        cls, file_path: str, account_id: int, chunk_size: int, vectorized: bool = False, memory_map: bool = False
+    ) -> Iterator["TransactionsDataList"]:
         raise NotImplementedError
@@ -0,0 +1,232 @@
+from array import array
+from collections.abc import Iterator
+from datetime import date
+from decimal import (
+    ROUND_CEILING,
+    ROUND_DOWN,
+    ROUND_FLOOR,
+    ROUND_HALF_DOWN,
+    ROUND_HALF_EVEN,
+    ROUND_HALF_UP,
+    ROUND_UP,
+    Decimal,
+)
+from typing import TYPE_CHECKING
+
+from app.account.transaction.batch import TransactionBatch
+from app.account.transaction.validators import TransactionBatchValidator
+from app.config import settings
+from app.utils.helper_methods import import_pyarrow
+
+from .csv import CsvStrategy
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+    from app.account.transaction.type_annotations import TransactionsDataList as Transactions
+
+ISO_DATE_FORMAT = "%Y-%m-%d"
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()  # date32 values are days since the Unix epoch
+# pyarrow.compute rounding modes of the decimal ones, ROUND_05UP has none
+ROUND_MODES = {
+    ROUND_HALF_UP: "half_towards_infinity",
+    ROUND_HALF_DOWN: "half_towards_zero",
+    ROUND_HALF_EVEN: "half_to_even",
+    ROUND_UP: "towards_infinity",
+    ROUND_DOWN: "towards_zero",
+    ROUND_CEILING: "up",
+    ROUND_FLOOR: "down",
+}
+
+
+class ArrowStrategy:
+    """Parse Arrow IPC files (``.arrow``, ``.feather``) column by column, needs the optional ``pyarrow`` package.
+
+    Record batches are checked and converted with ``pyarrow.compute`` into a ``TransactionBatch`` without Python
+    objects per row, only a batch with an invalid value is converted to Python to report its first invalid row.
+    Dates may be stored as dates or ``YYYY-MM-DD`` strings, amounts as decimals, integers, floats or strings,
+    the column order doesn't matter. Every chunk is validated column-wise and files are
+    always memory-mapped, so ``vectorized``, ``workers`` and ``memory_map`` are accepted for compatibility with
+    ``CsvStrategy`` only.
+    """
+
+    EXPECTED_COLUMNS = CsvStrategy.EXPECTED_HEADER
+    CHUNK_SIZE = CsvStrategy.CHUNK_SIZE
+
+    @classmethod
+    def parse_data(
+        cls, file_path: str, account_id: int, vectorized: bool = False, workers: int = 1, memory_map: bool = False
+    ) -> "Transactions":
+        return [trx for chunk in cls.parse_chunks(file_path, account_id) for trx in chunk]
+
+    @classmethod
+    def parse_chunks(
+        cls,
+        file_path: str,
+        account_id: int,
+        chunk_size: int = CHUNK_SIZE,
+        vectorized: bool = False,
+        memory_map: bool = False,
+    ) -> Iterator["Transactions"]:
+        """Yield validated transactions in lists of at most ``chunk_size`` items, one record batch at a time."""
+        chunks = cls._iter_chunks(file_path, account_id, chunk_size)
+        if not (chunk := next(chunks, None)):
+            raise ValueError("No data to import!")
+        yield chunk
+        yield from chunks
+
+    @classmethod
+    def _iter_chunks(cls, file_path: str, account_id: int, chunk_size: int) -> Iterator["Transactions"]:
+        first_row_number = 1
+        for batch in cls._iter_batches(file_path, chunk_size):
+            if batch.num_rows:
+                yield cls._process_batch(batch, account_id, first_row_number)
+                first_row_number += batch.num_rows
+
+    @classmethod
+    def _iter_batches(cls, file_path: str, chunk_size: int) -> Iterator["pa.RecordBatch"]:
+        pa = import_pyarrow()
+        with pa.memory_map(file_path) as source:
+            try:
+                reader = pa.ipc.open_file(source)
+                batches = (reader.get_batch(index) for index in range(reader.num_record_batches))
+            except pa.ArrowInvalid:
+                source.seek(0)
+                reader = batches = pa.ipc.open_stream(source)  # the streaming format has no footer
+            cls._validate_columns(reader.schema.names)
+            # batches are sliced without copying, the data stays in the memory-mapped file
+            for batch in batches:
+                for offset in range(0, batch.num_rows, chunk_size):
+                    yield batch.slice(offset, chunk_size)
+
+    @classmethod
+    def _validate_columns(cls, columns: list[str]) -> None:
+        if sorted(columns) != sorted(cls.EXPECTED_COLUMNS):
+            raise ValueError(f"Incorrect columns! Expected: {cls.EXPECTED_COLUMNS}")
+
+    @classmethod
+    def _process_batch(
+        cls, batch: "pa.RecordBatch", account_id: int, first_row_number: int
+    ) -> "Transactions | TransactionBatch":
+        pa = import_pyarrow()
+        dates, descriptions, amounts = (batch.column(name) for name in cls.EXPECTED_COLUMNS)
+        if not (pa.types.is_date(dates.type) or cls._is_string(pa, dates.type)):
+            raise ValueError(f"Incorrect type of the date column: {dates.type}")
+        if not cls._is_string(pa, descriptions.type):
+            raise ValueError(f"Incorrect type of the description column: {descriptions.type}")
+        if pa.types.is_floating(amounts.type):
+            # the shortest string of a float is what was written, e.g. "0.1" rather than its binary expansion
+            amounts = amounts.cast(pa.string())
+        elif not (
+            pa.types.is_decimal(amounts.type) or pa.types.is_integer(amounts.type) or cls._is_string(pa, amounts.type)
+        ):
+            raise ValueError(f"Incorrect type of the amount column: {amounts.type}")
+        if account_id <= 0:
+            raise ValueError("Incorrect account id!")
+        import pyarrow.compute as pc
+
+        try:
+            ordinals, valid_dates = cls._to_ordinals(pa, pc, dates)
+            cents, valid_amounts = cls._to_cents(pa, pc, amounts)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            # e.g. amounts with spaces or more digits than the casts keep, the row by row conversion decides
+            return cls._convert_rows(pa, dates, descriptions, amounts, account_id, first_row_number)
+        lengths = pc.utf8_length(descriptions)
+        valid_descriptions = pc.greater(lengths, 0)
+        valid = pc.and_(pc.and_(valid_dates, valid_amounts), valid_descriptions)
+        if not pc.all(pc.fill_null(valid, False)).as_py():
+            return cls._convert_rows(pa, dates, descriptions, amounts, account_id, first_row_number)
+        offsets = array("q", [0])
+        offsets.extend(cls._read_values(pc.cumulative_sum(lengths.cast(pa.int64())), "q"))
+        return TransactionBatch(
+            account_id,
+            cls._read_values(ordinals, "i"),
+            cls._read_values(cents, "q"),
+            cls._read_text(pa, descriptions),
+            offsets,
+        )
+
+    @classmethod
+    def _to_ordinals(cls, pa, pc, dates: "pa.Array") -> tuple["pa.Array", "pa.Array"]:
+        """Return day ordinals of the dates and whether each of them is valid."""
+        if cls._is_string(pa, dates.type):
+            parsed = pc.strptime(dates, format=ISO_DATE_FORMAT, unit="s", error_is_null=True)
+            # formatted back to reject what strptime accepts or normalizes, e.g. 2023-4-1 or 2023-02-30
+            valid = pc.equal(pc.strftime(parsed, format=ISO_DATE_FORMAT), dates)
+            dates = parsed.cast(pa.date32())
+        else:
+            dates = dates.cast(pa.date32())
+            valid = dates.is_valid()
+        ordinals = pc.add(dates.cast(pa.int32()), pa.scalar(EPOCH_ORDINAL, pa.int32()))
+        in_range = pc.and_(pc.greater_equal(ordinals, 1), pc.less_equal(ordinals, date.max.toordinal()))
+        return ordinals, pc.and_(valid, in_range)
+
+    @staticmethod
+    def _to_cents(pa, pc, amounts: "pa.Array") -> tuple["pa.Array", "pa.Array"]:
+        """Return amounts rounded to integer cents like ``to_decimal`` does and whether each of them is valid."""
+        if pa.types.is_integer(amounts.type):
+            cents = pc.multiply_checked(amounts.cast(pa.int64()), 100)
+        else:
+            if not (round_mode := ROUND_MODES.get(settings.ROUNDING)):
+                raise pa.ArrowNotImplementedError(f"Unsupported rounding: {settings.ROUNDING}")
+            if not pa.types.is_decimal(amounts.type):
+                amounts = amounts.cast(pa.decimal128(38, 10))
+            rounded = pc.round(amounts, ndigits=2, round_mode=round_mode).cast(pa.decimal128(20, 2))
+            cents = pc.multiply(rounded, pa.scalar(Decimal(100), pa.decimal128(3, 0))).cast(pa.int64())
+        return cents, pc.not_equal(cents, 0)
+
+    @staticmethod
+    def _read_values(values: "pa.Array", typecode: str) -> array:
+        """Copy the values of a fixed width array without nulls into an ``array`` of the same item size."""
+        result = array(typecode)
+        start = values.offset * result.itemsize
+        result.frombytes(memoryview(values.buffers()[1])[start : start + len(values) * result.itemsize])
+        return result
+
+    @staticmethod
+    def _read_text(pa, descriptions: "pa.Array") -> str:
+        """Return the descriptions concatenated, decoded from the data buffer of the string array at once."""
+        _, value_offsets, data = descriptions.buffers()
+        typecode = "q" if pa.types.is_large_string(descriptions.type) else "i"
+        bounds = array(typecode)
+        for index in (descriptions.offset, descriptions.offset + len(descriptions)):
+            bounds.frombytes(memoryview(value_offsets)[index * bounds.itemsize : (index + 1) * bounds.itemsize])
+        return memoryview(data)[bounds[0] : bounds[1]].tobytes().decode()
+
+    @classmethod
+    def _convert_rows(
+        cls,
+        pa,
+        dates: "pa.Array",
+        descriptions: "pa.Array",
+        amounts: "pa.Array",
+        account_id: int,
+        first_row_number: int,
+    ) -> "Transactions":
+        """Convert the columns value by value, raising ``RowValidationError`` for the first invalid row."""
+        description_list = descriptions.to_pylist()
+        parsed_dates, parsed_amounts = TransactionBatchValidator.convert_columns(
+            dates.to_pylist(),
+            description_list,
+            amounts.to_pylist(),
+            first_row_number,
+            parse_dates=not pa.types.is_date(dates.type),
+        )
+        return TransactionBatchValidator.build(parsed_dates, description_list, parsed_amounts, account_id)
+
+    @staticmethod
+    def _is_string(pa, data_type: "pa.DataType") -> bool:
+        return pa.types.is_string(data_type) or pa.types.is_large_string(data_type)
+
+
+class ParquetStrategy(ArrowStrategy):
+    """Parse Parquet files batch by batch, reading only the expected columns of one row group at a time."""
+
+    @classmethod
+    def _iter_batches(cls, file_path: str, chunk_size: int) -> Iterator["pa.RecordBatch"]:
+        import_pyarrow()
+        import pyarrow.parquet as pq
+
+        with pq.ParquetFile(file_path, memory_map=True) as parquet_file:
+            cls._validate_columns(parquet_file.schema_arrow.names)
+            yield from parquet_file.iter_batches(batch_size=chunk_size, columns=cls.EXPECTED_COLUMNS)
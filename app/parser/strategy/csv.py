@@ -1,9 +1,18 @@
 import csv
+import mmap
+import os
+from collections.abc import Iterator
+from datetime import date
+from decimal import Decimal
+from functools import partial
+from io import StringIO
+from itertools import islice
 from typing import Annotated
 
 from _collections_abc import Sequence
 
 from app.account.transaction.schemas import STransactionAdd
+from app.account.transaction.validators import RowValidationError, TransactionBatchValidator
 
 Transactions = Annotated[list[STransactionAdd], "Transactions"]
 CsvHeader = Annotated[Sequence[str] | None, "CSV Header"]
@@ -14,22 +23,218 @@ CsvRow = Annotated[dict[str, str], "CSV Row"]
 class CsvStrategy:
     EXPECTED_HEADER = ["date", "description", "amount"]
     ROW_LENGTH = len(EXPECTED_HEADER)
+    CHUNK_SIZE = 10_000
+    # file parts per worker, so a slow part doesn't leave the other workers idle
+    PARTS_PER_WORKER = 4
+    MIN_PART_SIZE = 1024 * 1024
+    # bytes decoded at once by the memory-mapped reader, extended to the end of a line;
+    # bigger blocks keep more rows alive at once, which makes garbage collection passes slower
+    BLOCK_SIZE = 16 * 1024
 
     @classmethod
-    def parse_data(cls, file_path: str, account_id: int) -> Transactions:
+    def parse_data(
+        cls, file_path: str, account_id: int, vectorized: bool = False, workers: int = 1, memory_map: bool = False
+    ) -> Transactions:
+        """Parse the whole file, in ``workers`` processes if more than one is requested.
+
+        The parallel mode always validates column-wise and expects no line breaks inside quoted fields.
+        """
+        if workers > 1:
+            return cls._parse_parallel(file_path, account_id, workers)
+        chunks = cls.parse_chunks(file_path, account_id, vectorized=vectorized, memory_map=memory_map)
+        return [trx for chunk in chunks for trx in chunk]
+
+    @classmethod
+    def parse_chunks(
+        cls,
+        file_path: str,
+        account_id: int,
+        chunk_size: int = CHUNK_SIZE,
+        vectorized: bool = False,
+        memory_map: bool = False,
+    ) -> Iterator[Transactions]:
+        """Yield validated transactions in lists of at most ``chunk_size`` items.
+
+        The file is read lazily, so only one chunk is held in memory at a time.
+        With ``vectorized`` each chunk is validated column-wise by ``TransactionBatchValidator``.
+        With ``memory_map`` the file is read through a memory map instead, validated column-wise
+        with the results of the default row by row validation.
+        """
+        if memory_map:
+            chunks = cls._iter_mapped_chunks(file_path, account_id, chunk_size)
+        elif vectorized:
+            chunks = cls._iter_vectorized_chunks(file_path, account_id, chunk_size)
+        else:
+            chunks = cls._iter_chunks(cls._iter_transactions(file_path, account_id), chunk_size)
+        if not (chunk := next(chunks, None)):
+            raise ValueError("No data to import!")
+        yield chunk
+        yield from chunks
+
+    @staticmethod
+    def _iter_chunks(transactions: Iterator[STransactionAdd], chunk_size: int) -> Iterator[Transactions]:
+        while chunk := list(islice(transactions, chunk_size)):
+            yield chunk
+
+    @classmethod
+    def _iter_transactions(cls, file_path: str, account_id: int) -> Iterator[STransactionAdd]:
         with open(file_path, encoding="UTF-8") as f:
             csv_reader = csv.DictReader(f)
             cls._validate_header(csv_reader.fieldnames)
-            parsed_data = []
             for row_number, row in enumerate(csv_reader, start=1):
                 try:
-                    parsed_data.append(cls._process_row(row, account_id))
+                    yield cls._process_row(row, account_id)
+                except ValueError as err:
+                    raise RowValidationError(row_number, str(err))
+
+    @classmethod
+    def _iter_vectorized_chunks(cls, file_path: str, account_id: int, chunk_size: int) -> Iterator[Transactions]:
+        with open(file_path, encoding="UTF-8") as f:
+            csv_reader = csv.reader(f)
+            cls._validate_header(next(csv_reader, None))
+            rows = filter(None, csv_reader)  # skip blank lines, as DictReader does
+            first_row_number = 1
+            while chunk := list(islice(rows, chunk_size)):
+                yield cls._process_rows(chunk, account_id, first_row_number)
+                first_row_number += len(chunk)
+
+    @classmethod
+    def _iter_mapped_chunks(cls, file_path: str, account_id: int, chunk_size: int) -> Iterator[Transactions]:
+        """Split rows of a memory-mapped file into chunks, with the same results and errors as the default reader."""
+        rows: list[list[str]] = []
+        first_row_number = 1
+        for block_rows in cls._iter_mapped_rows(file_path):
+            rows.extend(block_rows)
+            while len(rows) >= chunk_size:
+                yield cls._process_mapped_rows(rows[:chunk_size], account_id, first_row_number)
+                del rows[:chunk_size]
+                first_row_number += chunk_size
+        if rows:
+            yield cls._process_mapped_rows(rows, account_id, first_row_number)
+
+    @classmethod
+    def _process_mapped_rows(cls, rows: list[list[str]], account_id: int, first_row_number: int) -> Transactions:
+        """Validate rows column-wise, or one by one like the default reader if the column-wise validation fails.
+
+        The model accepts a few values the column-wise validation doesn't, e.g. ``2023-04-01T00:00:00`` dates,
+        and reports errors in its own words, so chunks with such rows are validated by the model as well.
+        """
+        try:
+            return cls._process_rows(rows, account_id, first_row_number)
+        except ValueError:
+            transactions = []
+            for row_number, row in enumerate(rows, start=first_row_number):
+                try:
+                    transactions.append(cls._process_row(cls._to_dict_row(row), account_id))
                 except ValueError as err:
-                    raise ValueError(f"The row number {row_number}: {err}")
-            if not parsed_data:
-                raise ValueError("No data to import!")
+                    raise RowValidationError(row_number, str(err))
+            return transactions
+
+    @classmethod
+    def _to_dict_row(cls, row: list[str]) -> CsvRow:
+        """Return the row as ``csv.DictReader`` does, missing values are None and extra ones are kept under None."""
+        dict_row: dict = dict(zip(cls.EXPECTED_HEADER, row))
+        if len(row) > cls.ROW_LENGTH:
+            dict_row[None] = row[cls.ROW_LENGTH :]
+        for column in cls.EXPECTED_HEADER[len(row) :]:
+            dict_row[column] = None
+        return dict_row
+
+    @classmethod
+    def _iter_mapped_rows(cls, file_path: str) -> Iterator[list[list[str]]]:
+        """Yield non-blank rows of the file block by block.
+
+        Row boundaries are searched in the mapped bytes, only one block of about ``BLOCK_SIZE`` bytes is
+        copied and decoded at a time. Blocks without quotes are split on line breaks and commas directly,
+        other blocks are parsed by the ``csv`` module. Line breaks are translated as by ``open``.
+        """
+        with open(file_path, "rb") as f:
+            if not os.fstat(f.fileno()).st_size:
+                cls._validate_header(None)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                # files with classic Mac line breaks have no "\n" at all
+                line_break = b"\r" if data.find(b"\n") == -1 else b"\n"
+                header_end = cls._find_line_end(data, 0, line_break)
+                cls._validate_header(next(cls._read_rows(data[:header_end]), None))
+                start = header_end
+                while start < len(data):
+                    end = cls._find_line_end(data, start + cls.BLOCK_SIZE, line_break)
+                    block = data[start:end]
+                    # an odd number of quotes means a quoted field continues on the next line
+                    while block.count(b'"') % 2 and end < len(data):
+                        end = cls._find_line_end(data, end + 1, line_break)
+                        block = data[start:end]
+                    yield [row for row in cls._read_rows(block) if row]
+                    start = end
+
+    @staticmethod
+    def _find_line_end(data: mmap.mmap, position: int, line_break: bytes) -> int:
+        """Return the offset right after the first line break ending at or after ``position``, or the end of data."""
+        line_break_position = data.find(line_break, max(position - 1, 0))
+        return len(data) if line_break_position == -1 else line_break_position + 1
+
+    @staticmethod
+    def _read_rows(block: bytes) -> Iterator[list[str]]:
+        text = block.decode("UTF-8")
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        if '"' in text:
+            return csv.reader(StringIO(text, newline=""))
+        return (line.split(",") for line in text.split("\n") if line)
+
+    @classmethod
+    def _parse_parallel(cls, file_path: str, account_id: int, workers: int) -> Transactions:
+        from concurrent.futures import ProcessPoolExecutor  # multiprocessing is slow to import and rarely needed
+
+        with open(file_path, "rb") as f:
+            header = f.readline()
+            cls._validate_header(next(csv.reader([header.decode("UTF-8")]), None))
+            boundaries = cls._get_part_boundaries(f, workers * cls.PARTS_PER_WORKER)
+
+        parsed_data: Transactions = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(partial(cls._parse_part, file_path), boundaries, boundaries[1:])
+            try:
+                # results come back in file order, so the first error raised is the first one in the file
+                for ordinals, descriptions, amounts in results:
+                    parsed_data.extend(
+                        TransactionBatchValidator.build(
+                            map(date.fromordinal, ordinals), descriptions, map(Decimal, amounts), account_id
+                        )
+                    )
+            except RowValidationError as err:
+                raise RowValidationError(len(parsed_data) + err.row_number, err.message)
+        if not parsed_data:
+            raise ValueError("No data to import!")
         return parsed_data
 
+    @classmethod
+    def _get_part_boundaries(cls, f, parts_count: int) -> list[int]:
+        """Split the data after the header into byte ranges ending on a line break."""
+        start, end = f.tell(), os.fstat(f.fileno()).st_size
+        part_size = max(cls.MIN_PART_SIZE, (end - start) // parts_count + 1)
+        boundaries = [start]
+        while boundaries[-1] + part_size < end:
+            f.seek(boundaries[-1] + part_size - 1)
+            f.readline()  # move to the start of the next line
+            boundaries.append(f.tell())
+        if boundaries[-1] < end:
+            boundaries.append(end)
+        return boundaries
+
+    @classmethod
+    def _parse_part(cls, file_path: str, start: int, end: int) -> tuple[list[int], list[str], list[str]]:
+        """Parse rows located between two byte offsets, rows are numbered from the start of the part."""
+        with open(file_path, "rb") as f:
+            f.seek(start)
+            data = f.read(end - start).decode("UTF-8")
+        rows = list(filter(None, csv.reader(StringIO(data, newline=""))))
+        if not rows:
+            return [], [], []
+        dates, descriptions, amounts = cls._convert_rows(rows, first_row_number=1)
+        # plain ints and strings are much cheaper to send back to the main process than models
+        return [trx_date.toordinal() for trx_date in dates], descriptions, [str(amount) for amount in amounts]
+
     @classmethod
     def _validate_header(cls, header: CsvHeader) -> None:
         if header != cls.EXPECTED_HEADER:
@@ -40,3 +245,25 @@ class CsvStrategy:
         if row_len := len(row.values()) != cls.ROW_LENGTH:
             raise ValueError(f"Incorrect number of elements. Expected: {cls.ROW_LENGTH} Found:{row_len}.")
         return STransactionAdd(**row, account_id=account_id)
+
+    @classmethod
+    def _process_rows(cls, rows: list[list[str]], account_id: int, first_row_number: int) -> Transactions:
+        dates, descriptions, amounts = cls._convert_rows(rows, first_row_number)
+        return TransactionBatchValidator.build(dates, descriptions, amounts, account_id)
+
+    @classmethod
+    def _convert_rows(
+        cls, rows: list[list[str]], first_row_number: int
+    ) -> tuple[list[date], Sequence[str], list[Decimal]]:
+        # rows before the first malformed one are validated first, so the earliest error wins
+        valid_length = next((n for n, row in enumerate(rows) if len(row) != cls.ROW_LENGTH), len(rows))
+        dates, descriptions, amounts = [], [], []
+        if valid_length:
+            dates, descriptions, amounts = zip(*rows[:valid_length])
+            dates, amounts = TransactionBatchValidator.convert_columns(dates, descriptions, amounts, first_row_number)
+        if valid_length != len(rows):
+            raise RowValidationError(
+                first_row_number + valid_length,
+                f"Incorrect number of elements. Expected: {cls.ROW_LENGTH} Found:{len(rows[valid_length])}.",
+            )
+        return dates, descriptions, amounts
@@ -38,17 +38,20 @@ class TestBankAppCommon(unittest.TestCase):
 
     def tearDown(self) -> None:
         self.db._drop_tables()
+        self.db.engine.dispose()
 
     # noinspection PyPep8Naming
     @classmethod
     def tearDownClass(cls) -> None:
         """Remove sqlite database (if applicable) after all tests run."""
-        try:
-            os.remove(settings.TEST_DB_URL.replace("sqlite:///", ""))
-        except FileNotFoundError:
-            pass
-        except OSError as e:
-            _logger.error(e)
+        db_path = settings.TEST_DB_URL.replace("sqlite:///", "")
+        for path in (db_path, f"{db_path}-wal", f"{db_path}-shm"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                _logger.error(e)
 
     # HELPER METHODS
     def parse_data(self, file_path: str, account_id: int) -> "TransactionsDataList":
@@ -0,0 +1,89 @@
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from sqlalchemy import event
+
+from app.account import AccountType
+from app.account.repository import AccountRepository
+from app.account.transaction.schemas import STransactionAdd
+from app.tests.common import TestBankAppCommon, correct_test_files_dir
+
+TRANSACTIONS_1 = f"{correct_test_files_dir}/transactions_1.csv"
+TEST_DATES = (date(2023, 3, 31), date(2023, 4, 30), date(2023, 5, 22), date(2023, 8, 23), date.today())
+
+
+class TestAccountBalances(TestBankAppCommon):
+    def setUp(self) -> None:
+        super().setUp()
+        acc_service, uow = self.bank_app.acc_service, self.bank_app.uow
+        self.account_ids = [self.debit_acc_id, self.credit_acc_id]
+        self.account_ids += [acc_service.create_one(uow, AccountType.DEBIT) for _ in range(4)]
+        for n, account_id in enumerate(self.account_ids[:-1]):
+            transactions = self.parse_data(TRANSACTIONS_1, account_id)
+            transactions.append(
+                STransactionAdd(
+                    date=date(2023, 5, 1) + timedelta(days=n), amount=n + 1, description="refund", account_id=account_id
+                )
+            )
+            self.create_transactions(account_id, transactions)
+
+    def _count_selects(self, func, *args):
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+                statements.append(statement)
+
+        event.listen(self.db.engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            return func(*args), len(statements)
+        finally:
+            event.remove(self.db.engine, "before_cursor_execute", before_cursor_execute)
+
+    def test_01_balances_match_single_lookups(self):
+        """Test balances of many accounts are computed by one query and match the single account lookups."""
+        for trx_date in TEST_DATES:
+            with self.subTest(trx_date=trx_date):
+                # WHEN
+                balances, queries = self._count_selects(
+                    self.bank_app.acc_service.get_balances, self.bank_app.uow, [*self.account_ids, 999], trx_date
+                )
+                # THEN
+                self.assertEqual(queries, 1)
+                self.assertEqual(
+                    balances, {account_id: self.get_balance(account_id, trx_date) for account_id in self.account_ids}
+                )
+
+    def test_02_balances_in_batches(self):
+        """Test IDs beyond the bind parameter limit are split into several grouped queries."""
+        # GIVEN
+        expected = self.bank_app.acc_service.get_balances(self.bank_app.uow, self.account_ids, date(2023, 6, 1))
+        # WHEN
+        with patch.object(AccountRepository, "_get_batch_size", return_value=4):
+            balances, queries = self._count_selects(
+                self.bank_app.acc_service.get_balances, self.bank_app.uow, self.account_ids, date(2023, 6, 1)
+            )
+        # THEN
+        self.assertEqual(queries, 2)
+        self.assertEqual(balances, expected)
+
+    def test_03_many_accounts_per_type(self):
+        """Test accounts of a type are listed in creation order and the CLI asks which one to use."""
+        # GIVEN
+        acc_service, uow = self.bank_app.acc_service, self.bank_app.uow
+        debit_ids = [account.id for account in acc_service.get_all_by_type(uow, AccountType.DEBIT)]
+        # WHEN
+        with patch("builtins.input", side_effect=["debit", "abc", "999", str(debit_ids[2])]), patch("builtins.print"):
+            self.bank_app.pick_account()
+        # THEN
+        self.assertEqual(debit_ids, [self.credit_acc_id, *self.account_ids[2:]])
+        self.assertEqual(acc_service.get_by_type(uow, AccountType.DEBIT).id, debit_ids[0])
+        self.assertEqual(self.bank_app.account_id, debit_ids[2])
+
+    def test_04_account_type_lookup_uses_index(self):
+        """Test accounts are looked up by type with an index range scan."""
+        with self.db.engine.connect() as conn:
+            plan = conn.exec_driver_sql(
+                "EXPLAIN QUERY PLAN SELECT * FROM account WHERE account_type = ? ORDER BY id LIMIT 1", (2,)
+            ).fetchall()
+        self.assertIn("USING INDEX ix_account_account_type_id", plan[0][-1])
@@ -0,0 +1,91 @@
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+from decimal import Decimal
+
+from sqlalchemy import Column, MetaData, Table, create_engine, func, insert, select, text
+
+from app.config import settings
+from app.database import Database
+from app.tests.common import TestBankAppCommon, correct_test_files_dir
+from app.utils.types import Cents
+
+TRANSACTIONS_1 = f"{correct_test_files_dir}/transactions_1.csv"
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class TestAmountStorage(TestBankAppCommon):
+    def test_01_cents_sum_is_exact(self):
+        """Test amounts stored as cents are read back as Decimals and summed without rounding errors."""
+        # GIVEN
+        engine = create_engine("sqlite://")
+        table = Table("ledger", MetaData(), Column("amount", Cents()))
+        table.create(engine)
+        amounts = [Decimal("0.10"), Decimal("-0.20"), Decimal("12345678.99"), Decimal("0.01")] * 2_500
+        # WHEN
+        with engine.begin() as conn:
+            conn.execute(insert(table), [{"amount": amount} for amount in amounts])
+            stored = conn.execute(select(table.c.amount).limit(4)).scalars().all()
+            total = conn.execute(select(func.sum(table.c.amount))).scalar()
+            stored_types = conn.execute(text("SELECT DISTINCT typeof(amount) FROM ledger")).scalars().all()
+        # THEN
+        self.assertEqual(stored, amounts[:4])
+        self.assertEqual(str(stored[0]), "0.10")
+        self.assertEqual(total, sum(amounts))
+        self.assertEqual(stored_types, ["integer"])
+
+    def test_02_storage_mismatch_detected(self):
+        """Test a database created with the other amount storage is refused instead of misread."""
+        # GIVEN
+        other_storage, column_type = (
+            ("numeric", "NUMERIC(10, 2)") if settings.AMOUNT_STORAGE == "cents" else ("cents", "BIGINT")
+        )
+        engine = create_engine("sqlite://")
+        with engine.begin() as conn:
+            conn.execute(text(f"CREATE TABLE account (id INTEGER PRIMARY KEY, balance {column_type})"))
+            # WHEN/THEN
+            with self.assertRaisesRegex(ValueError, f"set AMOUNT_STORAGE={other_storage}"):
+                Database._ensure_schema(conn)
+
+    def test_03_import_in_cents_mode(self):
+        """Test the import and balance lookups work end to end with amounts stored as cents."""
+        # GIVEN
+        fd, db_path = tempfile.mkstemp(suffix=".database")
+        os.close(fd)
+        self.addCleanup(os.remove, db_path)
+        script = textwrap.dedent(
+            f"""
+            from datetime import date
+
+            from app.account import AccountType
+            from app.cli import BankAppCli
+            from app.database import Database
+
+            bank_app = BankAppCli(Database("sqlite:///{db_path}"))
+            account_id = bank_app.acc_service.create_one(bank_app.uow, AccountType.DEBIT)
+            data = bank_app.parser.parse_data("{TRANSACTIONS_1}", account_id)
+            bank_app.trx_service.create(bank_app.uow, account_id, data)
+            print(bank_app.acc_service.get_balance(bank_app.uow, account_id, date(2023, 6, 23)))
+            print(bank_app.acc_service.get_by_id(bank_app.uow, account_id).balance)
+            """
+        )
+        # WHEN
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=REPO_DIR,
+            env={**os.environ, "AMOUNT_STORAGE": "cents"},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        # THEN
+        self.assertEqual(result.stdout.split(), ["99761.50", "296523.00"])
+        engine = create_engine(f"sqlite:///{db_path}")
+        with engine.connect() as conn:
+            amounts = conn.execute(text('SELECT DISTINCT typeof(amount) FROM "transaction"')).scalars().all()
+            balance = conn.execute(text("SELECT balance FROM account")).scalar()
+        engine.dispose()
+        self.assertEqual(amounts, ["integer"])
+        self.assertEqual(balance, 29_652_300)
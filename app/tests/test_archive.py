@@ -0,0 +1,168 @@
+from contextlib import redirect_stdout
+from datetime import date
+from io import StringIO
+
+from sqlalchemy import event, func, select
+
+from app import commands
+from app.account import ArchivedTransaction, OpeningBalance, Period, Transaction
+from app.account.report.services import ReportService
+from app.account.transaction.schemas import STransactionAdd
+from app.tests.common import TestBankAppCommon, correct_test_files_dir
+from app.utils.helper_methods import to_decimal
+
+TRANSACTIONS_1 = f"{correct_test_files_dir}/transactions_1.csv"
+LOOKUP_DATES = [date(2023, 4, 1), date(2023, 4, 30), date(2023, 5, 22), date(2023, 6, 15), date(2023, 8, 23)]
+
+
+class TestArchive(TestBankAppCommon):
+    def setUp(self) -> None:
+        super().setUp()
+        self.create_transactions(self.debit_acc_id, self.parse_data(TRANSACTIONS_1, self.debit_acc_id))
+
+    def _archive(self, before: date) -> int:
+        return self.bank_app.trx_service.archive(self.bank_app.uow, self.debit_acc_id, before)
+
+    def _count(self, model) -> int:
+        with self.db.create_session() as session:
+            return session.execute(select(func.count()).where(model.account_id == self.debit_acc_id)).scalar()
+
+    def _get_opening_balance(self) -> tuple[date, float]:
+        with self.db.create_session() as session:
+            stmt = select(OpeningBalance.date, OpeningBalance.balance).where(
+                OpeningBalance.account_id == self.debit_acc_id
+            )
+            return tuple(session.execute(stmt).one())
+
+    def _search(self, start_date: date | None = None, end_date: date | None = None) -> list[tuple]:
+        transactions = self.bank_app.trx_service.get_by_date_range(
+            self.bank_app.uow, self.debit_acc_id, start_date, end_date
+        )
+        return [(trx.id, trx.date, trx.amount) for trx in transactions]
+
+    def test_01_archive_keeps_balances_and_searches(self):
+        """Test archived months move to the archive table and lookups return the same results as before."""
+        # GIVEN
+        balances = [self.get_balance(self.debit_acc_id, trx_date) for trx_date in LOOKUP_DATES]
+        everything, recent = self._search(), self._search(date(2023, 6, 1))
+        # WHEN
+        archived_count = self._archive(date(2023, 6, 15))
+        # THEN
+        self.assertEqual(archived_count, 3)
+        self.assertEqual(self._count(ArchivedTransaction), 3)
+        self.assertEqual(self._count(Transaction), 4)
+        self.assertEqual(self._get_opening_balance(), (date(2023, 6, 1), to_decimal(99_967.5)))
+        self.assertEqual([self.get_balance(self.debit_acc_id, trx_date) for trx_date in LOOKUP_DATES], balances)
+        for trx_date, balance in zip(LOOKUP_DATES, balances):
+            self.assertEqual(
+                self.bank_app.acc_service.get_balances(self.bank_app.uow, [self.debit_acc_id], trx_date),
+                {self.debit_acc_id: balance},
+            )
+        self.assertEqual(self._search(), everything)
+        self.assertEqual(self._search(date(2023, 6, 1)), recent)
+        pages = self.bank_app.trx_service.iter_pages(self.bank_app.uow, self.debit_acc_id, limit=2)
+        self.assertEqual([(trx.id, trx.date, trx.amount) for page in pages for trx in page.transactions], everything)
+
+    def test_02_archive_read_only_before_cutoff(self):
+        """Test a balance after the cutoff starts from the opening balance and never reads the archive."""
+        # GIVEN
+        self._archive(date(2023, 6, 1))
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(self.db.engine, "before_cursor_execute", before_cursor_execute)
+        self.addCleanup(event.remove, self.db.engine, "before_cursor_execute", before_cursor_execute)
+        # WHEN
+        after_cutoff = self.get_balance(self.debit_acc_id, date(2023, 6, 10))
+        statements_after_cutoff, statements[:] = list(statements), []
+        before_cutoff = self.get_balance(self.debit_acc_id, date(2023, 5, 10))
+        # THEN
+        self.assertEqual(after_cutoff, to_decimal(99_967.5))
+        self.assertEqual(before_cutoff, to_decimal(99_987.75))
+        self.assertFalse(
+            [statement for statement in statements_after_cutoff if "FROM archived_transaction" in statement]
+        )
+        self.assertTrue([statement for statement in statements if "FROM archived_transaction" in statement])
+
+    def test_03_imports_into_archived_months_rejected(self):
+        """Test transactions before the cutoff can't be imported, later ones update the balance as usual."""
+        # GIVEN
+        self._archive(date(2023, 6, 1))
+        old = [STransactionAdd(date=date(2023, 5, 31), amount=1, description="late", account_id=self.debit_acc_id)]
+        new = [STransactionAdd(date=date(2023, 6, 1), amount=1, description="refund", account_id=self.debit_acc_id)]
+        # WHEN
+        with self.assertRaisesRegex(ValueError, "transactions before 2023-06-01 are archived"):
+            self.create_transactions(self.debit_acc_id, old)
+        self.create_transactions(self.debit_acc_id, new)
+        # THEN
+        self.assertEqual(self._count(Transaction), 5)
+        self.assertEqual(self.get_balance(self.debit_acc_id, date(2023, 6, 1)), to_decimal(99_968.5))
+        self.assertEqual(self.get_balance(self.debit_acc_id), to_decimal(296_524.0))
+
+    def test_04_archive_moves_cutoff_forward(self):
+        """Test a later archival adds to the opening balance, an earlier one is a no-op."""
+        # GIVEN
+        self._archive(date(2023, 5, 1))
+        # WHEN
+        moved_forward = self._archive(date(2023, 8, 1))
+        moved_backward = self._archive(date(2023, 4, 1))
+        # THEN
+        self.assertEqual((moved_forward, moved_backward), (3, 0))
+        self.assertEqual(self._get_opening_balance(), (date(2023, 8, 1), to_decimal(99_761.51)))
+        self.assertEqual(self.get_balance(self.debit_acc_id, date(2023, 7, 31)), to_decimal(99_761.51))
+        self.assertEqual(self.get_balance(self.debit_acc_id), to_decimal(296_523.0))
+        totals = ReportService.get_totals(self.bank_app.uow, self.debit_acc_id, Period.DAY, date(2023, 4, 1))
+        self.assertEqual(len(totals), 7)
+
+    def test_05_archive_command(self):
+        """Test the archive command archives transactions of the account of the given type."""
+        # WHEN
+        with redirect_stdout(StringIO()) as stdout:
+            exit_code = commands.main(self.db, ["archive", "2023-07-04", "--account", "credit"])
+        # THEN
+        self.assertEqual(exit_code, 0)
+        self.assertIn("Archived 4 transactions before 2023-07-01", stdout.getvalue())
+        self.assertEqual(self._count(ArchivedTransaction), 4)
+
+    def test_06_deduplicating_reimport_skips_archived_rows(self):
+        """Test re-importing a statement that overlaps archived months adds only the rows not stored yet."""
+        # GIVEN
+        account_id, uow, trx_service = self.credit_acc_id, self.bank_app.uow, self.bank_app.trx_service
+        statement = self.parse_data(TRANSACTIONS_1, account_id)
+        trx_service.create(uow, account_id, statement, deduplicate=True)
+        trx_service.archive(uow, account_id, date(2023, 6, 1))
+        new = STransactionAdd(date=date(2023, 8, 24), amount=-10, description="bakery", account_id=account_id)
+        late = STransactionAdd(date=date(2023, 5, 2), amount=-10, description="bakery", account_id=account_id)
+        # WHEN
+        ids = trx_service.create(uow, account_id, [*statement, new], deduplicate=True)
+        # THEN
+        self.assertEqual(len(ids), 1)
+        self.assertEqual(self.get_balance(account_id), to_decimal(296_513.0))
+        with self.assertRaisesRegex(ValueError, "transactions before 2023-06-01 are archived"):
+            trx_service.create(uow, account_id, [*statement, late], deduplicate=True)
+
+    def test_07_balances_of_archived_account_without_checkpoints(self):
+        """Test balances of many accounts start from the opening balance when no checkpoint precedes the cutoff."""
+        # GIVEN
+        account_id = self.credit_acc_id
+        with self.db.create_session() as session:
+            # stored before checkpoints were added to the database
+            session.add_all(
+                [
+                    Transaction(date=date(2023, 1, 10), amount=100, description="salary", account_id=account_id),
+                    Transaction(date=date(2023, 2, 10), amount=50, description="refund", account_id=account_id),
+                ]
+            )
+            session.commit()
+        # WHEN
+        self.bank_app.trx_service.archive(self.bank_app.uow, account_id, date(2023, 3, 1))
+        # THEN
+        for trx_date in (date(2023, 1, 31), date(2023, 2, 28), date(2023, 3, 1), date.today()):
+            with self.subTest(trx_date=trx_date):
+                self.assertEqual(
+                    self.bank_app.acc_service.get_balances(self.bank_app.uow, [account_id], trx_date),
+                    {account_id: self.get_balance(account_id, trx_date)},
+                )
+        self.assertEqual(self.get_balance(account_id), to_decimal(150))
@@ -0,0 +1,97 @@
+import asyncio
+from datetime import date
+
+from sqlalchemy import event
+
+from app.account import AccountType, Transaction
+from app.account.services import AsyncAccountService
+from app.account.transaction.services import AsyncTransactionService
+from app.config import settings
+from app.database import AsyncDatabase
+from app.tests.common import TestBankAppCommon, correct_test_files_dir
+from app.utils.uow import AsyncUoW
+
+TRANSACTIONS_1 = f"{correct_test_files_dir}/transactions_1.csv"
+CONCURRENT_REQUESTS = 20
+
+
+class TestAsyncServices(TestBankAppCommon):
+    def setUp(self) -> None:
+        super().setUp()
+        self.async_db = AsyncDatabase(settings.TEST_DB_URL)
+        self.async_uow = AsyncUoW(self.async_db)
+
+    def tearDown(self) -> None:
+        asyncio.run(self.async_db.engine.dispose())
+        super().tearDown()
+
+    def test_01_async_import_and_lookups(self):
+        """Test async services share the data and the results of the sync ones."""
+        # GIVEN
+        parsed_data = self.parse_data(TRANSACTIONS_1, self.debit_acc_id)
+
+        async def scenario():
+            await AsyncTransactionService.create(self.async_uow, self.debit_acc_id, parsed_data)
+            account = await AsyncAccountService.get_by_id(self.async_uow, self.debit_acc_id)
+            balance = await AsyncAccountService.get_balance(self.async_uow, self.debit_acc_id, date(2023, 4, 21))
+            transactions = await AsyncTransactionService.get_by_date_range(self.async_uow, self.debit_acc_id)
+            return account, balance, transactions
+
+        # WHEN
+        account, balance, transactions = asyncio.run(scenario())
+        # THEN
+        self.assertEqual(account.balance, 296_523.00)
+        self.assertEqual(balance, 99_987.75)
+        self.assertEqual(
+            transactions, self.bank_app.trx_service.get_by_date_range(self.bank_app.uow, self.debit_acc_id)
+        )
+        self.assertEqual(self.get_balance(self.debit_acc_id), 296_523.00)
+
+    def test_02_concurrent_reads_overlap(self):
+        """Test concurrent balance lookups run on separate connections at the same time."""
+        # GIVEN
+        self.create_transactions(self.debit_acc_id, self.parse_data(TRANSACTIONS_1, self.debit_acc_id))
+        checked_out = {"current": 0, "max": 0}
+
+        def on_checkout(*args):
+            checked_out["current"] += 1
+            checked_out["max"] = max(checked_out["max"], checked_out["current"])
+
+        def on_checkin(*args):
+            checked_out["current"] -= 1
+
+        event.listen(self.async_db.engine.sync_engine, "checkout", on_checkout)
+        event.listen(self.async_db.engine.sync_engine, "checkin", on_checkin)
+
+        async def scenario():
+            return await asyncio.gather(
+                *(
+                    AsyncAccountService.get_balance(self.async_uow, self.debit_acc_id)
+                    for _ in range(CONCURRENT_REQUESTS)
+                )
+            )
+
+        # WHEN
+        balances = asyncio.run(scenario())
+        # THEN
+        self.assertEqual(balances, [296_523.00] * CONCURRENT_REQUESTS)
+        self.assertGreater(checked_out["max"], 1)
+
+    def test_03_async_repositories(self):
+        """Test repositories are awaitable inside an async unit of work."""
+
+        async def scenario():
+            async with self.async_uow as uow:
+                account_id = await AsyncAccountService.create_one(self.async_uow, AccountType.DEBIT)
+                account = await uow.account.get_by_id(self.credit_acc_id)
+                transactions = await uow.transactions.get_all(filters=[Transaction.account_id == account_id])
+                return account, transactions
+
+        account, transactions = asyncio.run(scenario())
+        self.assertEqual(account.id, self.credit_acc_id)
+        self.assertEqual(transactions, [])
+
+    def test_04_uow_outside_of_block(self):
+        """Test repositories can't be used outside of an 'async with' block."""
+        with self.assertRaises(RuntimeError):
+            self.async_uow.account
@@ -0,0 +1,117 @@
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+
+from app.account.balance_cache import BalanceCache
+from app.account.transaction.schemas import STransactionAdd
+from app.tests.common import TestBankAppCommon, correct_test_files_dir
+from app.utils.instrumentation import instrumentation
+
+TRANSACTIONS_1 = f"{correct_test_files_dir}/transactions_1.csv"
+TRANSACTIONS_2 = f"{correct_test_files_dir}/transactions_2.csv"
+LOOKUP_DATES = (date(2023, 3, 31), date(2023, 4, 30), date(2023, 5, 20), date(2023, 6, 15), date(2023, 8, 31))
+
+
+class TestBalanceCache(TestBankAppCommon):
+    def setUp(self) -> None:
+        super().setUp()
+        self.cache = BalanceCache(max_size=100)
+        patcher = patch("app.account.services.balance_cache", self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.create_transactions(self.debit_acc_id, self.parse_data(TRANSACTIONS_1, self.debit_acc_id))
+
+    def _get_uncached_balance(self, account_id: int, trx_date: date) -> Decimal:
+        with patch("app.account.services.balance_cache", BalanceCache(max_size=0)):
+            return self.get_balance(account_id, trx_date)
+
+    def test_01_repeated_lookup_served_from_cache(self):
+        """Test the second lookup of the same account and date does not query the database."""
+        # GIVEN
+        balance = self.get_balance(self.debit_acc_id, date(2023, 6, 15))
+        queries_count = instrumentation.counters["queries"]
+        # WHEN
+        cached_balance = self.get_balance(self.debit_acc_id, date(2023, 6, 15))
+        # THEN
+        self.assertEqual(cached_balance, balance)
+        self.assertEqual(instrumentation.counters["queries"], queries_count)
+        self.assertEqual(self.cache.stats(), {"hits": 1, "misses": 1, "hit_ratio": 0.5, "size": 1, "max_size": 100})
+
+    def test_02_import_invalidates_from_earliest_date(self):
+        """Test an import drops only the cached balances on or after its earliest date."""
+        # GIVEN
+        for trx_date in LOOKUP_DATES:
+            self.get_balance(self.debit_acc_id, trx_date)
+            self.get_balance(self.credit_acc_id, trx_date)
+        balance = self.get_balance(self.debit_acc_id, date(2023, 5, 20))
+        backfill = [
+            STransactionAdd(date=date(2023, 5, 20), amount=-100, description="groceries", account_id=self.debit_acc_id)
+        ]
+        # WHEN
+        self.create_transactions(self.debit_acc_id, backfill)
+        # THEN
+        cached_keys = {key[1:] for key in self.cache._entries}
+        self.assertEqual(
+            cached_keys,
+            {(self.debit_acc_id, date(2023, 3, 31)), (self.debit_acc_id, date(2023, 4, 30))}
+            | {(self.credit_acc_id, trx_date) for trx_date in LOOKUP_DATES},
+        )
+        self.assertEqual(self.get_balance(self.debit_acc_id, date(2023, 5, 20)), balance - 100)
+
+    def test_03_no_stale_balance_after_imports(self):
+        """Test cached balances always match the ledger after every kind of import."""
+        imports = [
+            lambda: self.create_transactions(self.debit_acc_id, self.parse_data(TRANSACTIONS_2, self.debit_acc_id)),
+            lambda: self.bank_app.trx_service.create(
+                self.bank_app.uow,
+                self.debit_acc_id,
+                self.parse_data(TRANSACTIONS_1, self.debit_acc_id),
+                deduplicate=True,
+            ),
+            lambda: self.bank_app.trx_service.create_from_chunks(
+                self.bank_app.uow,
+                self.debit_acc_id,
+                self.bank_app.parser.parse_chunks(TRANSACTIONS_1, self.debit_acc_id, chunk_size=3),
+            ),
+        ]
+        for run_import in imports:
+            for trx_date in LOOKUP_DATES:
+                self.get_balance(self.debit_acc_id, trx_date)
+            run_import()
+            for trx_date in LOOKUP_DATES + (date.today(),):
+                with self.subTest(trx_date=trx_date):
+                    self.assertEqual(
+                        self.get_balance(self.debit_acc_id, trx_date),
+                        self._get_uncached_balance(self.debit_acc_id, trx_date),
+                    )
+        self.assertGreater(self.cache.hits, 0)
+
+    def test_04_lru_eviction(self):
+        """Test the least recently used balance is evicted once the cache is full."""
+        # GIVEN
+        self.cache.max_size = 2
+        self.get_balance(self.debit_acc_id, date(2023, 4, 30))
+        self.get_balance(self.debit_acc_id, date(2023, 5, 31))
+        self.get_balance(self.debit_acc_id, date(2023, 4, 30))
+        # WHEN
+        self.get_balance(self.debit_acc_id, date(2023, 6, 30))
+        # THEN
+        self.assertEqual(
+            [key[2] for key in self.cache._entries],
+            [date(2023, 4, 30), date(2023, 6, 30)],
+        )
+
+    def test_05_balance_computed_during_invalidation_not_cached(self):
+        """Test a balance computed while its account is invalidated is returned but not stored."""
+        # GIVEN
+        cache = BalanceCache(max_size=10)
+
+        def compute() -> Decimal:
+            cache.invalidate("db", 1, date(2023, 1, 1))
+            return Decimal(10)
+
+        # WHEN
+        balance = cache.get_or_compute("db", 1, date(2023, 6, 1), compute)
+        # THEN
+        self.assertEqual(balance, Decimal(10))
+        self.assertEqual(cache.stats()["size"], 0)
@@ -0,0 +1,97 @@
+from datetime import date
+
+from sqlalchemy import func, select
+
+from app.account import BalanceCheckpoint, Transaction
+from app.account.transaction.schemas import STransactionAdd
+from app.tests.common import TestBankAppCommon, correct_test_files_dir
+from app.utils.helper_methods import to_decimal
+
+TRANSACTIONS_1 = f"{correct_test_files_dir}/transactions_1.csv"
+
+
+class TestBalanceCheckpoints(TestBankAppCommon):
+    def _get_checkpoints(self, account_id: int) -> dict[date, float]:
+        with self.db.create_session() as session:
+            stmt = select(BalanceCheckpoint.date, BalanceCheckpoint.balance).where(
+                BalanceCheckpoint.account_id == account_id
+            )
+            return dict(session.execute(stmt).all())
+
+    def _get_ledger_sum(self, account_id: int, trx_date: date):
+        with self.db.create_session() as session:
+            stmt = select(func.sum(Transaction.amount)).where(
+                Transaction.account_id == account_id, Transaction.date <= trx_date
+            )
+            return to_decimal(session.execute(stmt).scalar() or 0)
+
+    def test_01_checkpoints_created_on_import(self):
+        """Test month-end checkpoints are stored for every month with transactions."""
+        # GIVEN
+        parsed_data = self.parse_data(TRANSACTIONS_1, self.debit_acc_id)
+        # WHEN
+        self.create_transactions(self.debit_acc_id, parsed_data)
+        # THEN
+        self.assertEqual(
+            self._get_checkpoints(self.debit_acc_id),
+            {
+                date(2023, 4, 30): to_decimal(99_987.75),
+                date(2023, 5, 31): to_decimal(99_967.5),
+                date(2023, 6, 30): to_decimal(99_761.5),
+                date(2023, 7, 31): to_decimal(99_761.51),
+                date(2023, 8, 31): to_decimal(296_523.0),
+            },
+        )
+
+    def test_02_backfill_repairs_checkpoints(self):
+        """Test importing older transactions repairs checkpoints from that date forward."""
+        # GIVEN
+        self.create_transactions(self.debit_acc_id, self.parse_data(TRANSACTIONS_1, self.debit_acc_id))
+        backfill = [
+            STransactionAdd(date=date(2023, 3, 15), amount=500, description="refund", account_id=self.debit_acc_id),
+            STransactionAdd(date=date(2023, 5, 1), amount=-100, description="groceries", account_id=self.debit_acc_id),
+        ]
+        # WHEN
+        self.create_transactions(self.debit_acc_id, backfill)
+        # THEN
+        checkpoints = self._get_checkpoints(self.debit_acc_id)
+        self.assertEqual(checkpoints[date(2023, 3, 31)], to_decimal(500))
+        self.assertEqual(checkpoints[date(2023, 8, 31)], to_decimal(296_923.0))
+        for checkpoint_date, balance in checkpoints.items():
+            self.assertEqual(balance, self._get_ledger_sum(self.debit_acc_id, checkpoint_date))
+        for trx_date in (date(2023, 3, 20), date(2023, 5, 1), date(2023, 5, 22), date(2023, 8, 23), date.today()):
+            self.assertEqual(
+                self.get_balance(self.debit_acc_id, trx_date), self._get_ledger_sum(self.debit_acc_id, trx_date)
+            )
+
+    def test_03_checkpoints_are_per_account(self):
+        """Test an import into one account leaves checkpoints of other accounts untouched."""
+        # GIVEN
+        self.create_transactions(self.debit_acc_id, self.parse_data(TRANSACTIONS_1, self.debit_acc_id))
+        # WHEN
+        self.create_transactions(self.credit_acc_id, self.parse_data(TRANSACTIONS_1, self.credit_acc_id))
+        # THEN
+        self.assertEqual(self._get_checkpoints(self.debit_acc_id), self._get_checkpoints(self.credit_acc_id))
+        self.assertEqual(self.get_balance(self.debit_acc_id), to_decimal(296_523.0))
+
+    def test_04_checkpoints_include_transactions_stored_without_them(self):
+        """Test the first import into an account with transactions but no checkpoints starts from their total."""
+        # GIVEN
+        with self.db.create_session() as session:
+            # stored before checkpoints were added to the database
+            session.add(
+                Transaction(date=date(2023, 1, 10), amount=1000, description="salary", account_id=self.debit_acc_id)
+            )
+            session.commit()
+        new = [
+            STransactionAdd(date=date(2023, 2, 1), amount=-50, description="groceries", account_id=self.debit_acc_id)
+        ]
+        # WHEN
+        self.create_transactions(self.debit_acc_id, new)
+        # THEN
+        self.assertEqual(self._get_checkpoints(self.debit_acc_id), {date(2023, 2, 28): to_decimal(950)})
+        self.assertEqual(self.get_balance(self.debit_acc_id), to_decimal(950))
+        self.assertEqual(
+            self.bank_app.acc_service.get_balances(self.bank_app.uow, [self.debit_acc_id]),
+            {self.debit_acc_id: to_decimal(950)},
+        )
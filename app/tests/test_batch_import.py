@@ -0,0 +1,67 @@
+import os
+import shutil
+import tempfile
+from contextlib import redirect_stdout
+from io import StringIO
+
+from app import commands
+from app.account import AccountType
+from app.tests.common import TestBankAppCommon, correct_test_files_dir, incorrect_test_files_dir
+from app.utils.helper_methods import to_decimal
+
+TRANSACTIONS_1 = f"{correct_test_files_dir}/transactions_1.csv"
+TRANSACTIONS_2 = f"{correct_test_files_dir}/transactions_2.csv"
+TRANSACTIONS_3 = f"{correct_test_files_dir}/transactions_3.csv"
+ZERO_AMOUNT = f"{incorrect_test_files_dir}/zero_amount.csv"
+
+
+class TestBatchImport(TestBankAppCommon):
+    def setUp(self) -> None:
+        super().setUp()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.account_id = self.bank_app.acc_service.get_by_type(self.bank_app.uow, AccountType.DEBIT).id
+
+    def _add_statement(self, name: str, file_path: str) -> None:
+        shutil.copy(file_path, os.path.join(self.directory, name))
+
+    def _run(self, *args: str) -> tuple[int, list[str]]:
+        output = StringIO()
+        with redirect_stdout(output):
+            exit_code = commands.main(self.db, ["import", "--account", "debit", "--workers", "2", *args])
+        return exit_code, output.getvalue().splitlines()
+
+    def test_01_import_directory(self):
+        """Test every statement of the directory is imported in the order of file names."""
+        # GIVEN
+        self._add_statement("2023_08.csv", TRANSACTIONS_2)
+        self._add_statement("2023_07.csv", TRANSACTIONS_1)
+        self._add_statement("notes.txt", TRANSACTIONS_3)
+        # WHEN
+        exit_code, lines = self._run(self.directory)
+        # THEN
+        self.assertEqual(exit_code, 0)
+        self.assertEqual([line.split()[0] for line in lines[1:3]], ["2023_07.csv", "2023_08.csv"])
+        self.assertEqual([line.split("|")[1].strip() for line in lines[1:3]], ["7", "1"])
+        self.assertIn("Imported 8 rows from 2 files", lines[3])
+        self.assertEqual(self.get_balance(self.account_id), to_decimal(196_523.0))
+
+    def test_02_failure_stops_import(self):
+        """Test the first failing file stops the import with a non-zero exit code, earlier files are kept."""
+        # GIVEN
+        self._add_statement("1.csv", TRANSACTIONS_1)
+        self._add_statement("2.csv", ZERO_AMOUNT)
+        self._add_statement("3.csv", TRANSACTIONS_2)
+        # WHEN
+        exit_code, lines = self._run(self.directory)
+        # THEN
+        self.assertEqual(exit_code, 1)
+        self.assertIn("2.csv", lines[-1])
+        self.assertIn("failed", lines[-1])
+        self.assertEqual(self.get_balance(self.account_id), to_decimal(296_523.0))
+
+    def test_03_missing_directory(self):
+        """Test a missing directory fails without prompting."""
+        with self.assertLogs("app.commands", level="ERROR"):
+            exit_code, _ = self._run(os.path.join(self.directory, "missing"))
+        self.assertEqual(exit_code, 1)
@@ -0,0 +1,106 @@
+import os
+import pickle
+import re
+import tempfile
+from datetime import date
+from decimal import Decimal
+
+from app.account.transaction.validators import RowValidationError, TransactionBatchValidator
+from app.tests.common import TestBankAppCommon, correct_test_files_dir, incorrect_test_files_dir
+
+HEADER = "date,description,amount"
+VALID_ROWS = [
+    "2023-04-01,salary,100000",
+    "2023-04-21,bakery,-12.25",
+    "2023-05-22, spaced description ,+20.255",
+    "2023-06-23,scientific,1e3",
+    "2023-07-23,rounded up,0.005",
+    '2023-08-23,"quoted, with comma",-3238.51',
+]
+INVALID_ROWS = [
+    "2023-13-01,bad month,10",
+    "01-04-2023,bad format,10",
+    "2023-W13-1,week date,10",
+    "20230401  ,basic format,10",
+    "2023-04-01,bad amount,abc",
+    "2023-04-01,rounds to zero,0.004",
+    "2023-04-01,not a number,NaN",
+    "2023-04-01,infinite,inf",
+    "2023-04-01,,10",
+    "2023-04-01,empty amount,",
+    "2023-04-01,missing amount",
+    "2023-04-01,extra,10,field",
+]
+
+
+class TestBatchValidation(TestBankAppCommon):
+    def _write_csv(self, rows: list[str]) -> str:
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, encoding="UTF-8") as f:
+            f.write("\n".join([HEADER, *rows]) + "\n")
+        self.addCleanup(os.remove, f.name)
+        return f.name
+
+    def _parse(self, file_path: str, vectorized: bool):
+        try:
+            return self.bank_app.parser.parse_data(file_path, self.debit_acc_id, vectorized=vectorized), None
+        except ValueError as err:
+            row_number = re.match(r"The row number (\d+):", str(err))
+            return None, row_number and int(row_number.group(1))
+
+    def assertSameResult(self, file_path: str):
+        reference, reference_error_row = self._parse(file_path, vectorized=False)
+        result, error_row = self._parse(file_path, vectorized=True)
+        self.assertEqual(result, reference, file_path)
+        self.assertEqual(error_row, reference_error_row, file_path)
+
+    def test_01_existing_files_agree(self):
+        """Test both validation paths agree on every test file."""
+        for directory in (correct_test_files_dir, incorrect_test_files_dir):
+            for file_name in sorted(os.listdir(directory)):
+                if file_name.endswith(".csv"):
+                    with self.subTest(file_name=file_name):
+                        self.assertSameResult(f"{directory}/{file_name}")
+
+    def test_02_valid_rows_agree(self):
+        """Test both validation paths produce identical transactions."""
+        file_path = self._write_csv(VALID_ROWS)
+        self.assertSameResult(file_path)
+        self.assertEqual(
+            [trx.amount for trx in self.bank_app.parser.parse_data(file_path, self.debit_acc_id, vectorized=True)],
+            [Decimal(amount) for amount in ("100000.00", "-12.25", "20.26", "1000.00", "0.01", "-3238.51")],
+        )
+
+    def test_03_invalid_row_numbers_agree(self):
+        """Test both validation paths report the same row for every kind of invalid value."""
+        for invalid_row in INVALID_ROWS:
+            for position in (0, 3, len(VALID_ROWS)):
+                rows = VALID_ROWS[:position] + [invalid_row] + VALID_ROWS[position:] + [INVALID_ROWS[0]]
+                with self.subTest(invalid_row=invalid_row, position=position):
+                    self.assertSameResult(self._write_csv(rows))
+
+    def test_04_error_row_number_with_offset(self):
+        """Test errors of a later chunk are reported with the row number in the whole file."""
+        with self.assertRaisesRegex(ValueError, "The row number 12: Missing transaction description!"):
+            TransactionBatchValidator.validate_columns(
+                ["2023-04-01", "2023-04-02"], ["ok", ""], ["1", "2"], self.debit_acc_id, first_row_number=11
+            )
+
+    def test_05_vectorized_import(self):
+        """Test transactions built by the batch validator can be imported."""
+        # GIVEN
+        parsed_data = self.bank_app.parser.parse_data(
+            f"{correct_test_files_dir}/transactions_1.csv", self.debit_acc_id, vectorized=True
+        )
+        # WHEN
+        self.create_transactions(self.debit_acc_id, parsed_data)
+        # THEN
+        self.assertEqual(self.get_balance(self.debit_acc_id), 296_523.00)
+        self.assertEqual(self.get_balance(self.debit_acc_id, date(2023, 4, 21)), Decimal("99987.75"))
+
+    def test_06_row_error_survives_pickling(self):
+        """Test a row error sent back from a parsing process keeps its row number and message."""
+        # WHEN
+        error = pickle.loads(pickle.dumps(RowValidationError(7, "Incorrect transaction amount!")))
+        # THEN
+        self.assertEqual((error.row_number, error.message), (7, "Incorrect transaction amount!"))
+        self.assertEqual(str(error), "The row number 7: Incorrect transaction amount!")
@@ -0,0 +1,93 @@
+from datetime import date
+from types import SimpleNamespace
+
+from sqlalchemy import Column, Date, Integer, MetaData, String, Table, event, func, select
+from sqlalchemy.dialects.postgresql import psycopg2
+
+from app.account import Transaction
+from app.tests.common import TestBankAppCommon
+from app.utils.repository import DEFAULT_MAX_BIND_PARAMS, SqlAlchemyRepository
+from app.utils.types import Cents
+
+ROWS_COUNT = 20_000
+
+
+class TestBulkInsert(TestBankAppCommon):
+    def _get_rows(self, count: int) -> list[dict]:
+        return [
+            {"date": date(2023, 1, 1), "description": f"trx {n}", "amount": 1, "account_id": self.debit_acc_id}
+            for n in range(count)
+        ]
+
+    def _count_statements(self) -> list[tuple[bool, int]]:
+        """Return a list that collects (executemany, number of parameters) of each executed INSERT."""
+        executed: list[tuple[bool, int]] = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("INSERT"):
+                executed.append((executemany, len(parameters)))
+
+        event.listen(self.db.engine, "before_cursor_execute", before_cursor_execute)
+        self.addCleanup(event.remove, self.db.engine, "before_cursor_execute", before_cursor_execute)
+        return executed
+
+    def _count_rows(self) -> int:
+        with self.db.create_session() as session:
+            return session.execute(select(func.count(Transaction.id))).scalar_one()
+
+    def test_01_create_multi_over_bind_params_limit(self):
+        """Test inserting more rows than fit into a single statement returns all IDs in order."""
+        # GIVEN
+        executed = self._count_statements()
+        # WHEN
+        with self.bank_app.uow:
+            ids = self.bank_app.uow.transactions.create_multi(self._get_rows(ROWS_COUNT))
+        # THEN
+        self.assertEqual(ids, list(range(1, ROWS_COUNT + 1)))
+        self.assertGreater(len(executed), 1)
+        self.assertLessEqual(max(params_count for _, params_count in executed), 32_766)
+
+    def test_02_create_multi_without_returning(self):
+        """Test inserting rows without RETURNING uses a single executemany."""
+        # GIVEN
+        executed = self._count_statements()
+        # WHEN
+        with self.bank_app.uow:
+            ids = self.bank_app.uow.transactions.create_multi(self._get_rows(ROWS_COUNT), returning=False)
+        # THEN
+        self.assertEqual(ids, [])
+        self.assertEqual(executed, [(True, ROWS_COUNT)])
+        self.assertEqual(self._count_rows(), ROWS_COUNT)
+
+    def test_03_batch_size_per_dialect(self):
+        """Test batch size follows the bind parameter limit of the dialect."""
+        sqlite_dialect = SimpleNamespace(name="sqlite", dbapi=SimpleNamespace(sqlite_version_info=(3, 45, 0)))
+        old_sqlite_dialect = SimpleNamespace(name="sqlite", dbapi=SimpleNamespace(sqlite_version_info=(3, 31, 1)))
+        self.assertEqual(SqlAlchemyRepository._get_batch_size(sqlite_dialect, columns_count=4), 8_191)
+        self.assertEqual(SqlAlchemyRepository._get_batch_size(old_sqlite_dialect, columns_count=4), 249)
+        self.assertEqual(SqlAlchemyRepository._get_batch_size(SimpleNamespace(name="postgresql"), 4), 8_191)
+        self.assertEqual(
+            SqlAlchemyRepository._get_batch_size(SimpleNamespace(name="unknown"), 4), DEFAULT_MAX_BIND_PARAMS // 4
+        )
+
+    def test_04_copy_rows_bound_like_insert(self):
+        """Test rows streamed by COPY are converted by the column types, e.g. amounts to cents."""
+        # GIVEN
+        table = Table(
+            "ledger_copy",
+            MetaData(),
+            Column("id", Integer, primary_key=True),
+            Column("date", Date),
+            Column("description", String),
+            Column("amount", Cents),
+        )
+        repository = SqlAlchemyRepository(session=None)
+        repository.model = SimpleNamespace(__table__=table)
+        rows = [
+            {"date": date(2023, 1, 1), "description": "refund", "amount": "12.34"},
+            {"date": date(2023, 1, 2), "description": "groceries", "amount": None},
+        ]
+        # WHEN
+        copy_rows = list(repository._get_copy_rows(psycopg2.dialect(), list(rows[0]), rows))
+        # THEN
+        self.assertEqual(copy_rows, [[date(2023, 1, 1), "refund", 1234], [date(2023, 1, 2), "groceries", None]])
@@ -0,0 +1,172 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date
+from decimal import Decimal
+from importlib.util import find_spec
+
+from app.account.transaction.batch import TransactionBatch
+from app.account.transaction.validators import RowValidationError
+from app.tests.common import TestBankAppCommon, correct_test_files_dir
+from app.utils.helper_methods import to_decimal
+
+TRANSACTIONS_1 = f"{correct_test_files_dir}/transactions_1.csv"
+
+
+@unittest.skipUnless(find_spec("pyarrow"), "pyarrow is not installed")
+class TestColumnarParse(TestBankAppCommon):
+    def setUp(self) -> None:
+        super().setUp()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.expected = self.parse_data(TRANSACTIONS_1, self.debit_acc_id)
+
+    def _write(self, file_name: str, columns: dict, batch_size: int | None = None) -> str:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.table(columns)
+        file_path = os.path.join(self.directory, file_name)
+        if file_name.endswith(".parquet"):
+            pq.write_table(table, file_path, row_group_size=batch_size)
+        else:
+            with pa.OSFile(file_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table, max_chunksize=batch_size)
+        return file_path
+
+    def _typed_columns(self, **values: list) -> dict:
+        """Return typed columns of the expected transactions, with the given columns replaced."""
+        import pyarrow as pa
+
+        return {
+            "date": pa.array(values.get("date", [trx.date for trx in self.expected]), pa.date32()),
+            "description": pa.array(values.get("description", [trx.description for trx in self.expected]), pa.string()),
+            "amount": pa.array(values.get("amount", [trx.amount for trx in self.expected]), pa.decimal128(18, 3)),
+        }
+
+    def test_01_typed_columns(self):
+        """Test Parquet and Arrow files with typed columns yield the same transactions as the CSV statement."""
+        for file_name in ("statement.parquet", "statement.arrow", "statement.feather"):
+            with self.subTest(file_name=file_name):
+                # GIVEN
+                file_path = self._write(file_name, self._typed_columns(), batch_size=3)
+                # WHEN
+                chunks = list(self.bank_app.parser.parse_chunks(file_path, self.debit_acc_id, chunk_size=2))
+                # THEN
+                self.assertLessEqual(max(len(chunk) for chunk in chunks), 2)
+                self.assertEqual([trx for chunk in chunks for trx in chunk], self.expected)
+
+    def test_02_string_and_float_columns(self):
+        """Test string dates and float amounts in any column order are converted like CSV fields."""
+        # GIVEN
+        file_path = self._write(
+            "statement.parquet",
+            {
+                "amount": [float(trx.amount) for trx in self.expected],
+                "date": [trx.date.isoformat() for trx in self.expected],
+                "description": [trx.description for trx in self.expected],
+            },
+        )
+        # WHEN
+        parsed_data = self.bank_app.parser.parse_data(file_path, self.debit_acc_id)
+        # THEN
+        self.assertEqual(parsed_data, self.expected)
+
+    def test_03_invalid_values(self):
+        """Test the first invalid row is reported with its number across batches."""
+        cases = [
+            ("description", None, "Missing transaction description!"),
+            ("description", "", "Missing transaction description!"),
+            ("date", None, "Incorrect transaction date!"),
+            ("amount", Decimal("0.001"), "Incorrect transaction amount!"),
+            ("amount", None, "Incorrect transaction amount!"),
+        ]
+        for column, value, message in cases:
+            with self.subTest(column=column, value=value):
+                # GIVEN
+                values = [getattr(trx, column) for trx in self.expected]
+                values[4] = value
+                file_path = self._write("statement.arrow", self._typed_columns(**{column: values}), batch_size=3)
+                # WHEN / THEN
+                with self.assertRaises(RowValidationError) as err:
+                    self.bank_app.parser.parse_data(file_path, self.debit_acc_id)
+                self.assertEqual((err.exception.row_number, err.exception.message), (5, message))
+
+    def test_04_invalid_schema(self):
+        """Test files with other columns or unsupported column types are rejected."""
+        import pyarrow as pa
+
+        # GIVEN
+        missing_column = self._write("missing.parquet", {"date": [date(2023, 1, 1)], "amount": [1]})
+        wrong_type = self._write(
+            "wrong_type.parquet", {"date": [date(2023, 1, 1)], "description": ["x"], "amount": pa.array([True])}
+        )
+        empty = self._write(
+            "empty.parquet", {name: pa.array([], pa.string()) for name in ("date", "description", "amount")}
+        )
+        # WHEN / THEN
+        with self.assertRaisesRegex(ValueError, "Incorrect columns"):
+            self.bank_app.parser.parse_data(missing_column, self.debit_acc_id)
+        with self.assertRaisesRegex(ValueError, "Incorrect type of the amount column"):
+            self.bank_app.parser.parse_data(wrong_type, self.debit_acc_id)
+        with self.assertRaisesRegex(ValueError, "No data to import"):
+            self.bank_app.parser.parse_data(empty, self.debit_acc_id)
+
+    def test_05_import_parquet_chunks(self):
+        """Test Parquet chunks are imported by the bulk insert path."""
+        # GIVEN
+        file_path = self._write("statement.parquet", self._typed_columns(), batch_size=3)
+        chunks = self.bank_app.parser.parse_chunks(file_path, self.debit_acc_id, chunk_size=2)
+        # WHEN
+        count = self.bank_app.trx_service.create_from_chunks(self.bank_app.uow, self.debit_acc_id, chunks)
+        # THEN
+        self.assertEqual(count, len(self.expected))
+        self.assertEqual(self.get_balance(self.debit_acc_id), to_decimal(296_523.0))
+
+    def test_06_compute_path_matches_rows(self):
+        """Test valid batches become compact batches and strings are judged like CSV fields, row by row if needed."""
+        import pyarrow as pa
+
+        # GIVEN
+        descriptions = [f"{trx.description} ü€" for trx in self.expected]
+        file_path = self._write(
+            "statement.arrow",
+            {
+                "date": pa.array([trx.date.isoformat() for trx in self.expected], pa.large_string()),
+                "description": pa.array(descriptions, pa.large_string()),
+                "amount": [str(trx.amount) for trx in self.expected],
+            },
+            batch_size=3,
+        )
+        # WHEN
+        chunks = list(self.bank_app.parser.parse_chunks(file_path, self.debit_acc_id, chunk_size=2))
+        # THEN
+        self.assertTrue(all(isinstance(chunk, TransactionBatch) for chunk in chunks))
+        self.assertEqual([trx.description for chunk in chunks for trx in chunk], descriptions)
+        self.assertEqual([trx.amount for chunk in chunks for trx in chunk], [trx.amount for trx in self.expected])
+        cases = [
+            ("date", "2023-4-1", "Incorrect transaction date!"),
+            ("date", "2023-02-30", "Incorrect transaction date!"),
+            ("date", "2023-W13-1", "Incorrect transaction date!"),
+            ("amount", "inf", "Incorrect transaction amount!"),
+            ("amount", " 12.5", None),  # Decimal strips the spaces, so the row by row conversion accepts it
+        ]
+        for column, value, message in cases:
+            with self.subTest(column=column, value=value):
+                # GIVEN
+                values = {
+                    "date": [trx.date.isoformat() for trx in self.expected],
+                    "description": [trx.description for trx in self.expected],
+                    "amount": [str(trx.amount) for trx in self.expected],
+                }
+                values[column][4] = value
+                file_path = self._write("statement.arrow", values)
+                # WHEN / THEN
+                if message is None:
+                    parsed_data = self.bank_app.parser.parse_data(file_path, self.debit_acc_id)
+                    self.assertEqual(parsed_data[4].amount, Decimal("12.50"))
+                    continue
+                with self.assertRaises(RowValidationError) as err:
+                    self.bank_app.parser.parse_data(file_path, self.debit_acc_id)
+                self.assertEqual((err.exception.row_number, err.exception.message), (5, message))
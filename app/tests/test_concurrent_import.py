@@ -0,0 +1,175 @@
+import random
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from decimal import Decimal
+from multiprocessing import get_context
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from app.account import AccountRepository, Transaction, TransactionRepository
+from app.account.transaction.schemas import STransactionAdd
+from app.account.transaction.services import TransactionService
+from app.config import settings
+from app.database import Database
+from app.tests.common import TestBankAppCommon
+from app.utils.helper_methods import to_decimal
+from app.utils.instrumentation import instrumentation
+from app.utils.uow import UoW
+
+WORKERS = 4
+IMPORTS_PER_WORKER = 25
+ROWS_PER_IMPORT = 20
+
+
+class UniqueViolation(Exception):
+    """Error of a PostgreSQL driver violating a unique index, as psycopg2 reports it."""
+
+    pgcode = "23505"
+
+    def __init__(self, constraint_name: str) -> None:
+        super().__init__(f'duplicate key value violates unique constraint "{constraint_name}"')
+        self.diag = SimpleNamespace(constraint_name=constraint_name)
+
+
+def import_statements(account_id: int, worker: int) -> Decimal:
+    """Import small statements one by one in a separate process, return their total."""
+    uow = UoW(Database(settings.TEST_DB_URL))
+    rng = random.Random(worker)
+    total = Decimal(0)
+    for index in range(IMPORTS_PER_WORKER):
+        transactions = [
+            STransactionAdd(
+                date=date(2023, 1, 1) + timedelta(days=rng.randrange(365)),
+                description=f"worker {worker} import {index} row {row}",
+                amount=to_decimal(rng.uniform(-100, 200)) or Decimal("0.01"),
+                account_id=account_id,
+            )
+            for row in range(ROWS_PER_IMPORT)
+        ]
+        # every other import deduplicates through a staging table
+        TransactionService.create(uow, account_id, transactions, deduplicate=index % 2 == 0)
+        total += sum(trx.amount for trx in transactions)
+    return total
+
+
+class TestConcurrentImport(TestBankAppCommon):
+    def _get_ledger_sum(self, account_id: int) -> Decimal:
+        with self.db.create_session() as session:
+            stmt = select(func.sum(Transaction.amount)).where(Transaction.account_id == account_id)
+            return to_decimal(session.execute(stmt).scalar() or 0)
+
+    def _get_stored_balance(self, account_id: int) -> Decimal:
+        return self.bank_app.acc_service.get_by_id(self.bank_app.uow, account_id).balance
+
+    def test_01_parallel_imports_into_one_account(self):
+        """Test imports from several processes into one account lose no balance update."""
+        # GIVEN
+        opening = [STransactionAdd(date=date(2023, 1, 1), amount=10_000, description="deposit", account_id=1)]
+        self.create_transactions(self.credit_acc_id, opening)
+        # WHEN
+        with ProcessPoolExecutor(max_workers=WORKERS, mp_context=get_context("spawn")) as executor:
+            futures = [executor.submit(import_statements, self.credit_acc_id, worker) for worker in range(WORKERS)]
+            total = sum((future.result() for future in futures), Decimal(10_000))
+        # THEN
+        with self.db.create_session() as session:
+            stmt = select(func.count()).where(Transaction.account_id == self.credit_acc_id)
+            self.assertEqual(session.execute(stmt).scalar(), WORKERS * IMPORTS_PER_WORKER * ROWS_PER_IMPORT + 1)
+        self.assertEqual(self._get_ledger_sum(self.credit_acc_id), total)
+        self.assertEqual(self._get_stored_balance(self.credit_acc_id), total)
+        self.assertEqual(self.get_balance(self.credit_acc_id), total)
+
+    def test_02_conflict_retried(self):
+        """Test an import that loses a write conflict is rolled back and run again."""
+        # GIVEN
+        transactions = [STransactionAdd(date=date(2023, 1, 1), amount=50, description="refund", account_id=1)]
+        update_balance = AccountRepository.update_balance
+        calls = []
+
+        def update_balance_once_locked(repository, account_id, amount_to_add):
+            calls.append(account_id)
+            if len(calls) == 1:
+                raise OperationalError("UPDATE account", {}, Exception("database is locked"))
+            return update_balance(repository, account_id, amount_to_add)
+
+        retries = instrumentation.counters["conflict_retries"]
+        # WHEN
+        with patch.object(AccountRepository, "update_balance", update_balance_once_locked):
+            with patch.object(settings, "CONFLICT_BACKOFF_MS", 1):
+                ids = self.create_transactions(self.credit_acc_id, transactions)
+        # THEN
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(instrumentation.counters["conflict_retries"], retries + 1)
+        self.assertEqual(len(ids), 1)
+        self.assertEqual(self._get_ledger_sum(self.credit_acc_id), to_decimal(50))
+        self.assertEqual(self._get_stored_balance(self.credit_acc_id), to_decimal(50))
+
+    def test_03_other_errors_not_retried(self):
+        """Test errors other than write conflicts, and conflicts past the retry limit, are raised."""
+        # GIVEN
+        transactions = [STransactionAdd(date=date(2023, 1, 1), amount=50, description="refund", account_id=1)]
+        integrity_error = IntegrityError("UPDATE account", {}, Exception("CHECK constraint failed"))
+        conflict = OperationalError("UPDATE account", {}, Exception("database is locked"))
+        for error, expected_calls in ((integrity_error, 1), (conflict, 3)):
+            with self.subTest(error=error.orig):
+                # WHEN
+                with patch.object(AccountRepository, "update_balance", side_effect=error) as update_balance:
+                    with patch.multiple(settings, CONFLICT_RETRIES=2, CONFLICT_BACKOFF_MS=1):
+                        with self.assertRaises(type(error)):
+                            self.create_transactions(self.credit_acc_id, transactions)
+                # THEN
+                self.assertEqual(update_balance.call_count, expected_calls)
+                self.assertEqual(self._get_ledger_sum(self.credit_acc_id), 0)
+
+    def test_04_balance_down_to_exact_limit(self):
+        """Test imports bringing the balance exactly down to the limit pass, whatever the amount storage."""
+        # GIVEN
+        account_id = self.credit_acc_id  # debit account, no balance below 0
+        imports = [
+            [STransactionAdd(date=date(2023, 1, day), amount=amount, description="card", account_id=account_id)]
+            for day, amount in ((1, "0.7"), (2, "0.1"), (3, "-0.8"))
+        ]
+        # WHEN
+        for transactions in imports:
+            self.create_transactions(account_id, transactions)
+        # THEN
+        self.assertEqual(self._get_stored_balance(account_id), 0)
+        self.assertEqual(self.get_balance(account_id), 0)
+        self._test_credit_limit(account_id, imports[-1], expect_error=True)
+
+    def test_05_fingerprint_violation_retried(self):
+        """Test a deduplicating import losing the fingerprint index to a concurrent one is run again."""
+        # GIVEN
+        transactions = [STransactionAdd(date=date(2023, 1, 1), amount=50, description="refund", account_id=1)]
+        create_new = TransactionRepository.create_new
+        fingerprint_violation = IntegrityError(
+            "INSERT INTO transaction", {}, UniqueViolation("ix_transaction_account_id_fingerprint")
+        )
+        other_violation = IntegrityError("INSERT INTO account", {}, UniqueViolation("account_pkey"))
+        calls = []
+
+        def create_new_once_violated(repository, data_list):
+            calls.append(data_list)
+            if len(calls) == 1:
+                raise fingerprint_violation
+            return create_new(repository, data_list)
+
+        retries = instrumentation.counters["conflict_retries"]
+        # WHEN
+        with patch.object(settings, "CONFLICT_BACKOFF_MS", 1):
+            with patch.object(TransactionRepository, "create_new", create_new_once_violated):
+                ids = self.bank_app.trx_service.create(
+                    self.bank_app.uow, self.credit_acc_id, transactions, deduplicate=True
+                )
+            with patch.object(TransactionRepository, "create_new", side_effect=other_violation):
+                with self.assertRaises(IntegrityError):
+                    self.bank_app.trx_service.create(
+                        self.bank_app.uow, self.credit_acc_id, transactions, deduplicate=True
+                    )
+        # THEN
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(instrumentation.counters["conflict_retries"], retries + 1)
+        self.assertEqual(len(ids), 1)
+        self.assertEqual(self._get_stored_balance(self.credit_acc_id), to_decimal(50))
@@ -0,0 +1,139 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, select, text, update
+
+from app.account import AccountType, MonthlyTotal
+from app.account.services import AccountService
+from app.account.transaction.schemas import STransactionAdd
+from app.account.transaction.services import TransactionService
+from app.config import settings
+from app.database import Database, schema_version
+from app.tests.common import TestBankAppCommon
+from app.utils.helper_methods import to_decimal
+from app.utils.uow import UoW
+
+# schema of the first release, before any table or column was added
+FIRST_RELEASE_SCHEMA = [
+    """CREATE TABLE account (
+        name VARCHAR NOT NULL,
+        account_type INTEGER NOT NULL,
+        credit_limit NUMERIC(10, 2) NOT NULL,
+        balance NUMERIC(10, 2) NOT NULL,
+        id INTEGER NOT NULL,
+        PRIMARY KEY (id),
+        CONSTRAINT "Balance and credit limit constraints" CHECK (
+            (account_type = '2' AND credit_limit = 0 AND balance >= 0) OR
+            (account_type = '1' AND credit_limit < 0 AND balance >= credit_limit)
+        )
+    )""",
+    """CREATE TABLE "transaction" (
+        date DATE NOT NULL,
+        description VARCHAR NOT NULL,
+        amount NUMERIC(10, 2) NOT NULL,
+        account_id INTEGER NOT NULL,
+        id INTEGER NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY(account_id) REFERENCES account (id)
+    )""",
+    "INSERT INTO account (id, name, account_type, credit_limit, balance) VALUES (1, 'Debit Account', 2, 0, 950)",
+    """INSERT INTO "transaction" (id, date, description, amount, account_id) VALUES
+        (1, '2023-01-10', 'salary', 1000, 1), (2, '2023-02-15', 'groceries', -50, 1)""",
+]
+
+
+class TestDatabase(TestBankAppCommon):
+    def test_01_session_factory_is_reused(self):
+        """Test sessions come from a single factory bound to the engine."""
+        with patch("app.database.sessionmaker") as mocked_sessionmaker:
+            first_session, second_session = self.db.create_session(), self.db.create_session()
+        mocked_sessionmaker.assert_not_called()
+        self.assertIsNot(first_session, second_session)
+        self.assertIs(first_session.get_bind(), self.db.engine)
+        first_session.close()
+        second_session.close()
+
+    def test_02_sqlite_pragmas(self):
+        """Test performance pragmas are applied to every SQLite connection."""
+        with self.db.engine.connect() as conn:
+            pragmas = {
+                pragma: conn.exec_driver_sql(f"PRAGMA {pragma}").scalar()
+                for pragma in ("journal_mode", "synchronous", "cache_size", "mmap_size")
+            }
+        self.assertEqual(
+            pragmas,
+            {
+                "journal_mode": settings.SQLITE_JOURNAL_MODE.lower(),
+                "synchronous": 1,  # NORMAL
+                "cache_size": -settings.SQLITE_CACHE_SIZE_KB,
+                "mmap_size": settings.SQLITE_MMAP_SIZE,
+            },
+        )
+
+    def test_03_pool_options(self):
+        """Test pool size comes from settings, except for in-memory SQLite."""
+        self.assertEqual(self.db.engine.pool.size(), settings.DB_POOL_SIZE)
+        self.assertEqual(self.db.engine.pool._max_overflow, settings.DB_MAX_OVERFLOW)
+        self.assertNotIn("pool_size", Database._get_engine_options("sqlite://"))
+        self.assertNotIn("pool_size", Database._get_engine_options("sqlite:///:memory:"))
+        self.assertEqual(
+            Database._get_engine_options("postgresql://localhost/db")["max_overflow"], settings.DB_MAX_OVERFLOW
+        )
+
+    def test_04_schema_creation_skipped_when_current(self):
+        """Test a database stamped with the current schema version is not created again."""
+        # GIVEN
+        with self.db.engine.connect() as conn:
+            stamped_version = Database._get_stamped_version(conn)
+        # WHEN
+        with patch.object(Database, "_create_schema") as mocked_create_schema:
+            Database(settings.TEST_DB_URL)
+        # THEN
+        self.assertEqual(stamped_version, Database._get_schema_version())
+        mocked_create_schema.assert_not_called()
+
+    def test_05_schema_upgraded_when_version_changes(self):
+        """Test a database stamped with another schema version is upgraded and stamped again."""
+        # GIVEN
+        with self.db.engine.begin() as conn:
+            conn.execute(update(schema_version).values(version="outdated"))
+            conn.execute(text("DROP INDEX ix_transaction_account_id_date_amount"))
+        # WHEN
+        db = Database(settings.TEST_DB_URL)
+        # THEN
+        with db.engine.connect() as conn:
+            self.assertEqual(Database._get_stamped_version(conn), Database._get_schema_version())
+            indexes = conn.exec_driver_sql("PRAGMA index_list('transaction')").fetchall()
+        self.assertIn("ix_transaction_account_id_date_amount", [index[1] for index in indexes])
+
+    @unittest.skipIf(settings.AMOUNT_STORAGE == "cents", "the first release stored amounts as NUMERIC")
+    def test_06_first_release_database_upgraded(self):
+        """Test a database created by the first release with transactions is upgraded and keeps working."""
+        # GIVEN
+        fd, path = tempfile.mkstemp(suffix=".database")
+        os.close(fd)
+        db_url = f"sqlite:///{path}"
+        engine = create_engine(db_url)
+        with engine.begin() as conn:
+            for statement in FIRST_RELEASE_SCHEMA:
+                conn.execute(text(statement))
+        engine.dispose()
+        # WHEN
+        db = Database(db_url)
+        self.addCleanup(os.remove, path)
+        self.addCleanup(db.engine.dispose)
+        uow = UoW(db)
+        balance_before_import = AccountService.get_balance(uow, 1, date(2023, 2, 28))
+        new = [STransactionAdd(date=date(2023, 3, 1), amount=-25, description="bakery", account_id=1)]
+        TransactionService.create(uow, 1, new, deduplicate=True)
+        # THEN
+        self.assertEqual(balance_before_import, to_decimal(950))
+        self.assertEqual(AccountService.get_balance(uow, 1), to_decimal(925))
+        self.assertEqual(AccountService.get_by_id(uow, 1).balance, to_decimal(925))
+        self.assertEqual(AccountService.get_all_by_type(uow, AccountType.DEBIT)[0].id, 1)
+        with db.create_session() as session:
+            totals = session.execute(select(MonthlyTotal.month, MonthlyTotal.count).order_by(MonthlyTotal.month))
+            self.assertEqual(totals.all(), [(date(2023, 1, 1), 1), (date(2023, 2, 1), 1), (date(2023, 3, 1), 1)])
@@ -0,0 +1,97 @@
+from datetime import date
+
+from sqlalchemy import func, select, text
+
+from app.account import Transaction
+from app.account.transaction.schemas import STransactionAdd
+from app.tests.common import TestBankAppCommon, correct_test_files_dir
+
+TRANSACTIONS_1 = f"{correct_test_files_dir}/transactions_1.csv"
+
+
+class TestDeduplicateImport(TestBankAppCommon):
+    def _trx(self, day: int, amount: float, description: str) -> STransactionAdd:
+        return STransactionAdd(
+            date=date(2023, 9, day), amount=amount, description=description, account_id=self.debit_acc_id
+        )
+
+    def _count_transactions(self) -> int:
+        with self.db.create_session() as session:
+            return session.execute(select(func.count(Transaction.id))).scalar_one()
+
+    def create_new(self, data, **kwargs) -> list[int]:
+        return self.bank_app.trx_service.create(self.bank_app.uow, self.debit_acc_id, data, deduplicate=True, **kwargs)
+
+    def test_01_reimport_same_file(self):
+        """Test re-importing the same file adds nothing and keeps the balance."""
+        # GIVEN
+        parsed_data = self.parse_data(TRANSACTIONS_1, self.debit_acc_id)
+        self.assertEqual(len(self.create_new(parsed_data)), 7)
+        # WHEN
+        new_transactions = self.create_new(parsed_data)
+        # THEN
+        self.assertEqual(new_transactions, [])
+        self.assertEqual(self._count_transactions(), 7)
+        self.assertEqual(self.get_balance(self.debit_acc_id), 296_523.00)
+
+    def test_02_overlapping_statements(self):
+        """Test only transactions missing from the previous statement are imported."""
+        # GIVEN
+        august = [self._trx(1, 100, "salary"), self._trx(2, -5, "coffee"), self._trx(2, -5, "coffee")]
+        september = [self._trx(2, -5, "coffee"), self._trx(2, -5, "coffee"), self._trx(3, -20, "lunch")]
+        self.create_new(august)
+        # WHEN
+        new_transactions = self.create_new(september)
+        # THEN
+        self.assertEqual(len(new_transactions), 1)
+        self.assertEqual(self._count_transactions(), 4)
+        self.assertEqual(self.get_balance(self.debit_acc_id), 70)
+
+    def test_03_identical_transactions_within_file_are_kept(self):
+        """Test identical transactions in a single file are all imported, a later one is new."""
+        # GIVEN
+        self.create_new([self._trx(2, -5, "coffee"), self._trx(2, -5, "coffee"), self._trx(1, 100, "salary")])
+        # WHEN
+        new_transactions = self.create_new([self._trx(2, -5, "coffee")] * 3)
+        # THEN
+        self.assertEqual(len(new_transactions), 1)
+        self.assertEqual(self.get_balance(self.debit_acc_id), 85)
+
+    def test_04_streaming_deduplicate(self):
+        """Test deduplicating streaming import across chunks."""
+        # GIVEN
+        chunks = list(self.bank_app.parser.parse_chunks(TRANSACTIONS_1, self.debit_acc_id, chunk_size=3))
+        self.create_transactions(self.debit_acc_id, self.parse_data(TRANSACTIONS_1, self.debit_acc_id))
+        self.create_new(chunks[0])
+        # WHEN
+        count = self.bank_app.trx_service.create_from_chunks(
+            self.bank_app.uow, self.debit_acc_id, chunks, deduplicate=True
+        )
+        # THEN
+        # rows imported without deduplication have no fingerprint and are never matched
+        self.assertEqual(count, 4)
+        self.assertEqual(self._count_transactions(), 14)
+        self.assertEqual(self.get_balance(self.debit_acc_id, date(2023, 4, 1)), 200_000)
+
+    def test_05_fingerprint_column_added_to_existing_database(self):
+        """Test the fingerprint column and its index are created for an existing table."""
+        # GIVEN
+        with self.db.engine.begin() as conn:
+            conn.execute(text("DROP INDEX ix_transaction_account_id_fingerprint"))
+            conn.execute(text('ALTER TABLE "transaction" DROP COLUMN fingerprint'))
+        # WHEN
+        self.db._create_tables()
+        # THEN
+        self.assertEqual(len(self.create_new([self._trx(1, 100, "salary")])), 1)
+        self.assertEqual(self.create_new([self._trx(1, 100, "salary")]), [])
+
+    def test_06_import_after_failed_import(self):
+        """Test a failed deduplicating import doesn't leave its staging table behind for the next one."""
+        # GIVEN
+        with self.assertRaisesRegex(ValueError, "Impossible to import data"):
+            self.create_new([self._trx(1, -5_000, "rent")])
+        # WHEN
+        new_transactions = self.create_new([self._trx(1, 100, "salary")])
+        # THEN
+        self.assertEqual(len(new_transactions), 1)
+        self.assertEqual(self.get_balance(self.debit_acc_id), 100)
@@ -0,0 +1,97 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import date
+from decimal import Decimal
+from importlib.util import find_spec
+from io import StringIO
+
+from app import commands
+from app.exporter import TransactionExporter
+from app.tests.common import TestBankAppCommon, correct_test_files_dir
+
+TRANSACTIONS_1 = f"{correct_test_files_dir}/transactions_1.csv"
+
+
+class TestExport(TestBankAppCommon):
+    def setUp(self) -> None:
+        super().setUp()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.transactions = self.parse_data(TRANSACTIONS_1, self.debit_acc_id)
+        self.create_transactions(self.debit_acc_id, self.transactions)
+        self.create_transactions(self.credit_acc_id, self.parse_data(TRANSACTIONS_1, self.credit_acc_id))
+
+    def _export(self, file_name: str, **kwargs) -> tuple[str, int]:
+        file_path = os.path.join(self.directory, file_name)
+        return file_path, TransactionExporter.export(self.bank_app.uow, self.debit_acc_id, file_path, **kwargs)
+
+    def _get_rows(self, start_date: date = date.min, end_date: date = date.max) -> list[tuple]:
+        return [
+            (trx.date, trx.description, trx.amount)
+            for trx in sorted(self.transactions, key=lambda trx: trx.date)
+            if start_date <= trx.date <= end_date
+        ]
+
+    def test_01_csv_round_trip(self):
+        """Test an exported CSV is importable and yields the same transactions."""
+        # WHEN
+        file_path, count = self._export("ledger.csv", batch_size=2)
+        # THEN
+        self.assertEqual(count, len(self.transactions))
+        reparsed = self.parse_data(file_path, self.debit_acc_id)
+        self.assertEqual([(trx.date, trx.description, trx.amount) for trx in reparsed], self._get_rows())
+
+    def test_02_json_lines(self):
+        """Test every transaction is exported as one JSON object with the exact amount."""
+        # WHEN
+        file_path, count = self._export("ledger.jsonl", start_date=date(2023, 5, 1), end_date=date(2023, 7, 31))
+        # THEN
+        with open(file_path, encoding="UTF-8") as f:
+            objects = [json.loads(line, parse_float=Decimal) for line in f]
+        self.assertEqual(count, len(objects))
+        self.assertEqual(
+            [(date.fromisoformat(obj["date"]), obj["description"], obj["amount"]) for obj in objects],
+            self._get_rows(date(2023, 5, 1), date(2023, 7, 31)),
+        )
+
+    @unittest.skipUnless(find_spec("pyarrow"), "pyarrow is not installed")
+    def test_03_parquet_row_groups(self):
+        """Test the Parquet export has one row group per batch and typed columns."""
+        import pyarrow.parquet as pq
+
+        # WHEN
+        file_path, count = self._export("ledger.parquet", batch_size=3)
+        # THEN
+        parquet_file = pq.ParquetFile(file_path)
+        self.assertEqual(parquet_file.metadata.num_row_groups, -(-count // 3))
+        table = parquet_file.read()
+        self.assertEqual(table.column_names, ["date", "description", "amount"])
+        self.assertEqual(list(zip(*(column.to_pylist() for column in table.columns))), self._get_rows())
+
+    def test_04_empty_and_unsupported(self):
+        """Test an export without transactions writes only the header, unknown extensions are rejected."""
+        # WHEN
+        file_path, count = self._export("empty.csv", start_date=date(2030, 1, 1))
+        # THEN
+        self.assertEqual(count, 0)
+        with open(file_path, encoding="UTF-8") as f:
+            self.assertEqual(f.read().splitlines(), ["date,description,amount"])
+        with self.assertRaisesRegex(ValueError, "Unsupported file format"):
+            self._export("ledger.xlsx")
+
+    def test_05_export_command(self):
+        """Test the export command writes the file of the chosen account and reports the row count."""
+        # GIVEN
+        file_path = os.path.join(self.directory, "ledger.csv")
+        output = StringIO()
+        # WHEN
+        with redirect_stdout(output):
+            exit_code = commands.main(self.db, ["export", "--account", "credit", "--end-date", "2023-06-30", file_path])
+        # THEN
+        self.assertEqual(exit_code, 0)
+        self.assertIn(f"Exported 4 rows to {file_path}", output.getvalue())
+        self.assertEqual(len(self.parse_data(file_path, self.debit_acc_id)), 4)
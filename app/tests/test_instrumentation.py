@@ -0,0 +1,86 @@
+import os
+import tempfile
+from datetime import date
+from unittest.mock import patch
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.config import settings
+from app.tests.common import TestBankAppCommon, correct_test_files_dir
+from app.utils.instrumentation import instrumentation
+
+TRANSACTIONS_1 = f"{correct_test_files_dir}/transactions_1.csv"
+
+
+class TestInstrumentation(TestBankAppCommon):
+    def setUp(self) -> None:
+        super().setUp()
+        self.create_transactions(self.debit_acc_id, self.parse_data(TRANSACTIONS_1, self.debit_acc_id))
+        instrumentation.reset()
+
+    def test_01_queries_counted_per_scope(self):
+        """Test queries are attributed to the service method and to the unit of work block."""
+        # WHEN
+        self.get_balance(self.debit_acc_id, date(2023, 6, 1))
+        # THEN
+        service_counters = instrumentation.scope_counters["AccountService.get_balance"]
+        self.assertEqual(service_counters["calls"], 1)
+        self.assertEqual(service_counters["queries"], 2)  # checkpoint lookup and the sum after it
+        self.assertEqual(instrumentation.scope_counters["UoW"]["queries"], 2)
+        self.assertEqual(instrumentation.counters["queries"], 2)
+        self.assertEqual(instrumentation.counters["commits"], 1)
+        self.assertGreater(service_counters["query_seconds"], 0)
+        self.assertGreaterEqual(service_counters["seconds"], service_counters["query_seconds"])
+
+    def test_02_slow_query_logged(self):
+        """Test statements slower than the threshold are logged with their parameters."""
+        # GIVEN
+        with patch.object(settings, "SLOW_QUERY_THRESHOLD_MS", 0):
+            # WHEN
+            with self.assertLogs("app.utils.instrumentation", level="WARNING") as logs:
+                self.bank_app.trx_service.get_by_date_range(
+                    self.bank_app.uow, self.debit_acc_id, date(2023, 4, 1), date(2023, 7, 1)
+                )
+        # THEN
+        (message,) = logs.output
+        self.assertIn("Slow query", message)
+        self.assertIn('FROM "transaction"', message)
+        self.assertIn("'2023-04-01'", message)
+        self.assertEqual(instrumentation.counters["slow_queries"], 1)
+
+    def test_03_prometheus_snapshot(self):
+        """Test cumulative counters are dumped in the Prometheus text format."""
+        # GIVEN
+        self.get_balance(self.debit_acc_id)
+        self.get_balance(self.debit_acc_id)
+        fd, file_path = tempfile.mkstemp(suffix=".prom")
+        os.close(fd)
+        # WHEN
+        try:
+            instrumentation.dump(file_path)
+            with open(file_path, encoding="UTF-8") as f:
+                lines = f.read().splitlines()
+        finally:
+            os.remove(file_path)
+        # THEN
+        self.assertIn("# TYPE bankapp_queries_total counter", lines)
+        self.assertIn("bankapp_queries_total 4", lines)
+        self.assertIn("bankapp_slow_queries_total 0", lines)
+        self.assertIn('bankapp_scope_calls_total{scope="AccountService.get_balance"} 2', lines)
+        self.assertIn('bankapp_scope_queries_total{scope="UoW"} 4', lines)
+
+    def test_04_failed_query_counted(self):
+        """Test a failed statement is counted and doesn't leave its start time on the connection."""
+        # GIVEN
+        with self.db.engine.connect() as conn, instrumentation.scope("failing"):
+            # WHEN
+            with self.assertRaises(OperationalError):
+                conn.execute(text("SELECT * FROM missing_table"))
+            conn.execute(text("SELECT 1"))
+            # THEN
+            self.assertEqual(conn.info["query_start_time"], [])
+        self.assertEqual(instrumentation.counters["failed_queries"], 1)
+        self.assertEqual(instrumentation.counters["queries"], 2)
+        self.assertEqual(instrumentation.scope_counters["failing"]["queries"], 2)
+        self.assertIn("bankapp_failed_queries_total 1", instrumentation.snapshot().splitlines())
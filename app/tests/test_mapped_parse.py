@@ -0,0 +1,89 @@
+import os
+import tempfile
+from datetime import date
+from unittest.mock import patch
+
+from app.parser.strategy import CsvStrategy
+from app.tests.common import TestBankAppCommon, correct_test_files_dir, incorrect_test_files_dir
+from app.tests.test_batch_validation import HEADER, INVALID_ROWS, VALID_ROWS
+
+
+class TestMappedParse(TestBankAppCommon):
+    def _write_csv(self, content: str) -> str:
+        with tempfile.NamedTemporaryFile("wb", suffix=".csv", delete=False) as f:
+            f.write(content.encode("UTF-8"))
+        self.addCleanup(os.remove, f.name)
+        return f.name
+
+    def _parse(self, file_path: str, **kwargs):
+        try:
+            return self.bank_app.parser.parse_data(file_path, self.debit_acc_id, **kwargs), None
+        except ValueError as err:
+            return None, str(err)
+
+    def assertSameResult(self, file_path: str):
+        self.assertEqual(self._parse(file_path, memory_map=True), self._parse(file_path), file_path)
+
+    def test_01_existing_files_agree(self):
+        """Test the memory-mapped reader returns the same transactions and errors as the default one on test files."""
+        for directory in (correct_test_files_dir, incorrect_test_files_dir):
+            for file_name in sorted(os.listdir(directory)):
+                if file_name.endswith(".csv"):
+                    with self.subTest(file_name=file_name):
+                        self.assertSameResult(f"{directory}/{file_name}")
+
+    def test_02_invalid_rows_agree(self):
+        """Test the memory-mapped reader reports the same error message for every kind of invalid row."""
+        for invalid_row in INVALID_ROWS:
+            for position in (0, 3, len(VALID_ROWS)):
+                rows = VALID_ROWS[:position] + [invalid_row] + VALID_ROWS[position:]
+                with self.subTest(invalid_row=invalid_row, position=position):
+                    self.assertSameResult(self._write_csv("\n".join([HEADER, *rows]) + "\n"))
+
+    def test_03_line_breaks_and_quotes(self):
+        """Test CRLF and CR line breaks, blank lines and quoted fields spanning lines are read as by ``open``."""
+        contents = [
+            "\r\n".join([HEADER, *VALID_ROWS]),
+            "\r".join([HEADER, *VALID_ROWS]) + "\r",
+            "\n\n".join([HEADER, *VALID_ROWS]) + "\n\n",
+            "\n".join([HEADER, '2023-04-01,"multi\r\nline ""quoted""\ndescription",10', *VALID_ROWS]),
+            "",
+            HEADER,
+            "\n" + HEADER + "\n" + VALID_ROWS[0],
+        ]
+        for content in contents:
+            with self.subTest(content=content):
+                self.assertSameResult(self._write_csv(content))
+
+    def test_04_block_boundaries(self):
+        """Test rows and quoted fields crossing block boundaries, with chunks smaller than blocks."""
+        # GIVEN
+        rows = [f'2023-04-{day:02},"payment\n{day}",{day}.5' for day in range(1, 29, 3)]
+        rows += [f"2023-05-{day:02},fee,-{day}" for day in range(1, 29)]
+        file_path = self._write_csv("\n".join([HEADER, *rows]))
+        invalid_file_path = self._write_csv("\n".join([HEADER, *rows, "2023-06-01,,1"]))
+        # WHEN
+        with patch.object(CsvStrategy, "BLOCK_SIZE", 40):
+            chunks = list(
+                self.bank_app.parser.parse_chunks(file_path, self.debit_acc_id, chunk_size=5, memory_map=True)
+            )
+            invalid_result = self._parse(invalid_file_path, memory_map=True)
+        # THEN
+        self.assertEqual([len(chunk) for chunk in chunks], [5] * 7 + [3])
+        self.assertEqual(
+            [trx for chunk in chunks for trx in chunk],
+            self.bank_app.parser.parse_data(file_path, self.debit_acc_id),
+        )
+        self.assertEqual(invalid_result, self._parse(invalid_file_path))
+        self.assertTrue(invalid_result[1].startswith("The row number 39: 1 validation error"))
+
+    def test_05_rows_rejected_column_wise(self):
+        """Test rows only the model accepts, e.g. datetime strings, are read as by the default reader."""
+        # GIVEN
+        file_path = self._write_csv("\n".join([HEADER, *VALID_ROWS, "2023-09-01T00:00:00,datetime,10"]))
+        # WHEN
+        transactions, error = self._parse(file_path, memory_map=True)
+        # THEN
+        self.assertIsNone(error)
+        self.assertEqual(transactions[-1].date, date(2023, 9, 1))
+        self.assertSameResult(file_path)
@@ -0,0 +1,67 @@
+import os
+import tempfile
+from unittest.mock import patch
+
+from app.parser.strategy import CsvStrategy
+from app.tests.common import TestBankAppCommon, correct_test_files_dir, incorrect_test_files_dir
+
+TRANSACTIONS_1 = f"{correct_test_files_dir}/transactions_1.csv"
+INCORRECT_DATA_HEADER_ONLY = f"{incorrect_test_files_dir}/header_only.csv"
+INCORRECT_DATA_WRONG_HEADER = f"{incorrect_test_files_dir}/header.csv"
+ROWS_COUNT = 500
+
+
+class TestParallelParse(TestBankAppCommon):
+    def setUp(self) -> None:
+        super().setUp()
+        # split even tiny files into many parts
+        patcher = patch.object(CsvStrategy, "MIN_PART_SIZE", 64)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _write_csv(self, rows: list[str]) -> str:
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, encoding="UTF-8") as f:
+            f.write("\n".join(["date,description,amount", *rows]) + "\n")
+        self.addCleanup(os.remove, f.name)
+        return f.name
+
+    def _get_rows(self) -> list[str]:
+        return [f"2023-{n % 12 + 1:02}-{n % 28 + 1:02},payment {n},{n + 1}.25" for n in range(ROWS_COUNT)]
+
+    def test_01_parallel_result_matches_sequential(self):
+        """Test parsing in several processes keeps the original row order."""
+        for file_path in (TRANSACTIONS_1, self._write_csv(self._get_rows())):
+            with self.subTest(file_path=file_path):
+                self.assertEqual(
+                    self.bank_app.parser.parse_data(file_path, self.debit_acc_id, workers=3),
+                    self.bank_app.parser.parse_data(file_path, self.debit_acc_id),
+                )
+
+    def test_02_error_row_number(self):
+        """Test the row number of an error is counted from the start of the file."""
+        for invalid_row_number in (1, 250, ROWS_COUNT):
+            rows = self._get_rows()
+            rows[invalid_row_number - 1] = "2023-01-01,,10"
+            rows[-1] = "2023-01-01,zero,0"
+            file_path = self._write_csv(rows)
+            with self.subTest(invalid_row_number=invalid_row_number):
+                with self.assertRaisesRegex(ValueError, f"The row number {invalid_row_number}: "):
+                    self.bank_app.parser.parse_data(file_path, self.debit_acc_id, workers=2)
+
+    def test_03_part_boundaries_on_line_breaks(self):
+        """Test every part starts at the beginning of a line."""
+        file_path = self._write_csv(self._get_rows())
+        with open(file_path, "rb") as f:
+            content = f.read()
+            f.seek(len("date,description,amount\n"))
+            boundaries = CsvStrategy._get_part_boundaries(f, parts_count=8)
+        self.assertGreater(len(boundaries), 2)
+        self.assertEqual(boundaries[-1], len(content))
+        self.assertTrue(all(content[boundary - 1 : boundary] == b"\n" for boundary in boundaries))
+
+    def test_04_parallel_parse_without_data(self):
+        """Test parsing in several processes a file with a wrong header or without rows."""
+        with self.assertRaisesRegex(ValueError, "No data to import!"):
+            self.bank_app.parser.parse_data(INCORRECT_DATA_HEADER_ONLY, self.debit_acc_id, workers=2)
+        with self.assertRaisesRegex(ValueError, "Incorrect header!"):
+            self.bank_app.parser.parse_data(INCORRECT_DATA_WRONG_HEADER, self.debit_acc_id, workers=2)
@@ -0,0 +1,140 @@
+from datetime import date
+from io import StringIO
+from unittest.mock import patch
+
+from sqlalchemy import event, select, text
+
+from app.account import MonthlyTotal, Period
+from app.account.report.services import ReportService
+from app.config import settings
+from app.tests.common import TestBankAppCommon, correct_test_files_dir
+from app.utils.helper_methods import to_decimal
+
+TRANSACTIONS_1 = f"{correct_test_files_dir}/transactions_1.csv"
+TRANSACTIONS_2 = f"{correct_test_files_dir}/transactions_2.csv"
+MONTHLY_TOTALS = [
+    # period start, inflow, outflow, net, count
+    (date(2023, 4, 1), 100_000, 12.25, 99_987.75, 2),
+    (date(2023, 5, 1), 0, 20.25, -20.25, 1),
+    (date(2023, 6, 1), 0, 206, -206, 1),
+    (date(2023, 7, 1), 0.01, 0, 0.01, 1),
+    (date(2023, 8, 1), 200_000, 3_238.51, 196_761.49, 2),
+]
+DATE_RANGES = [
+    (None, None),
+    (date(2023, 4, 1), date(2023, 8, 31)),
+    (date(2023, 4, 21), date(2023, 8, 23)),
+    (date(2023, 4, 22), date(2023, 5, 22)),
+    (date(2023, 5, 1), date(2023, 7, 31)),
+    (date(2023, 6, 2), date(2023, 6, 30)),
+    (date(2022, 12, 15), date(2024, 1, 15)),
+]
+
+
+class TestReports(TestBankAppCommon):
+    def setUp(self) -> None:
+        super().setUp()
+        patcher = patch.object(settings, "MONTHLY_TOTALS", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.create_transactions(self.debit_acc_id, self.parse_data(TRANSACTIONS_1, self.debit_acc_id))
+
+    def _get_totals(self, period: Period, start_date: date | None = None, end_date: date | None = None) -> list:
+        totals = ReportService.get_totals(self.bank_app.uow, self.debit_acc_id, period, start_date, end_date)
+        return [(t.period_start, t.inflow, t.outflow, t.net, t.count) for t in totals]
+
+    @staticmethod
+    def _expected(rows: list[tuple]) -> list[tuple]:
+        return [(start, *map(to_decimal, amounts), count) for start, *amounts, count in rows]
+
+    def _get_monthly_total_rows(self) -> list[tuple]:
+        with self.db.create_session() as session:
+            stmt = select(MonthlyTotal.month, MonthlyTotal.inflow, MonthlyTotal.outflow, MonthlyTotal.count).where(
+                MonthlyTotal.account_id == self.debit_acc_id
+            )
+            return [tuple(row) for row in session.execute(stmt.order_by(MonthlyTotal.month))]
+
+    def test_01_totals_per_period(self):
+        """Test inflows, outflows and net per day, month and year."""
+        self.assertEqual(self._get_totals(Period.MONTH), self._expected(MONTHLY_TOTALS))
+        self.assertEqual(
+            self._get_totals(Period.YEAR), self._expected([(date(2023, 1, 1), 300_000.01, 3_477.01, 296_523, 7)])
+        )
+        self.assertEqual(
+            self._get_totals(Period.DAY, date(2023, 8, 1), date(2023, 8, 31)),
+            self._expected(
+                [(date(2023, 8, 23), 0, 3_238.51, -3_238.51, 1), (date(2023, 8, 24), 200_000, 0, 200_000, 1)]
+            ),
+        )
+
+    def test_02_materialized_totals_match_transactions(self):
+        """Test reports from the monthly totals equal reports aggregated from the transactions."""
+        # GIVEN
+        self.create_transactions(self.debit_acc_id, self.parse_data(TRANSACTIONS_2, self.debit_acc_id))
+        for start_date, end_date in DATE_RANGES:
+            for period in (Period.MONTH, Period.YEAR):
+                with self.subTest(period=period, start_date=start_date, end_date=end_date):
+                    # WHEN
+                    materialized = self._get_totals(period, start_date, end_date)
+                    with patch.object(settings, "MONTHLY_TOTALS", False):
+                        aggregated = self._get_totals(period, start_date, end_date)
+                    # THEN
+                    self.assertEqual(materialized, aggregated)
+
+    def test_03_import_updates_touched_months(self):
+        """Test an import recomputes only the monthly totals of the months it touched."""
+        # GIVEN
+        expected = self._expected(
+            [(start, inflow, outflow, count) for start, inflow, outflow, _, count in MONTHLY_TOTALS]
+        )
+        self.assertEqual(self._get_monthly_total_rows(), expected)
+        # WHEN
+        self.create_transactions(self.debit_acc_id, self.parse_data(TRANSACTIONS_2, self.debit_acc_id))
+        # THEN
+        expected[-1] = (date(2023, 8, 1), to_decimal(200_000), to_decimal(103_238.51), 3)
+        self.assertEqual(self._get_monthly_total_rows(), expected)
+
+    def test_04_yearly_report_reads_monthly_totals_only(self):
+        """Test a report over whole months doesn't touch the transactions table."""
+        # GIVEN
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        # WHEN
+        event.listen(self.db.engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            self._get_totals(Period.YEAR, date(2023, 1, 1), date(2023, 12, 31))
+        finally:
+            event.remove(self.db.engine, "before_cursor_execute", before_cursor_execute)
+        # THEN
+        self.assertEqual(len(statements), 1)
+        self.assertIn("FROM monthly_total", statements[0])
+
+    def test_05_backfill_on_table_creation(self):
+        """Test the monthly totals are filled from stored transactions when the table is added to a database."""
+        # GIVEN
+        expected = self._get_monthly_total_rows()
+        with self.db.engine.begin() as conn:
+            conn.execute(text("DROP TABLE monthly_total"))
+        # WHEN
+        self.db._create_tables()
+        # THEN
+        self.assertEqual(self._get_monthly_total_rows(), expected)
+
+    def test_06_cli_show_totals(self):
+        """Test the CLI prints monthly totals for the picked period and dates."""
+        # GIVEN
+        self.bank_app.account_id = self.debit_acc_id
+        # WHEN
+        with (
+            patch("builtins.input", side_effect=["week", "month", "2023-05-01", "2023-06-30"]),
+            patch("sys.stdout", new=StringIO()) as stdout,
+        ):
+            self.bank_app.show_totals()
+        # THEN
+        output = stdout.getvalue()
+        self.assertIn("2023-05-01", output)
+        self.assertIn("-206.00", output)
+        self.assertNotIn("2023-04-01", output)
@@ -0,0 +1,111 @@
+import os
+from datetime import date
+
+from sqlalchemy import func, select
+
+from app.account import Account, AccountType, Transaction
+from app.account.services import AccountService
+from app.account.transaction.services import TransactionService
+from app.database import Base, ShardedDatabase
+from app.tests.common import TestBankAppCommon, correct_test_files_dir
+from app.utils.helper_methods import to_decimal
+from app.utils.uow import ShardedUoW, UoW, fan_out
+
+TRANSACTIONS_1 = f"{correct_test_files_dir}/transactions_1.csv"
+SHARDS_COUNT = 3
+SHARD_PATHS = [f"test_bank_app_shard_{index}.database" for index in range(SHARDS_COUNT)]
+
+
+class TestSharding(TestBankAppCommon):
+    def setUp(self) -> None:
+        super().setUp()
+        self.sharded_db = ShardedDatabase([f"sqlite:///{path}" for path in SHARD_PATHS])
+        self.addCleanup(self._drop_shards)
+
+    def _drop_shards(self) -> None:
+        for shard, path in zip(self.sharded_db.shards, SHARD_PATHS):
+            Base.metadata.drop_all(shard.engine)
+            shard.engine.dispose()
+            for file_path in (path, f"{path}-wal", f"{path}-shm"):
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+
+    def _create_account(self, account_type: AccountType = AccountType.DEBIT) -> int:
+        return AccountService.create_one(ShardedUoW(self.sharded_db), account_type)
+
+    def _count(self, shard_index: int, model) -> int:
+        with self.sharded_db.shards[shard_index].create_session() as session:
+            return session.execute(select(func.count()).select_from(model)).scalar()
+
+    def _import(self, account_id: int) -> None:
+        uow = ShardedUoW(self.sharded_db, account_id)
+        TransactionService.create(uow, account_id, self.parse_data(TRANSACTIONS_1, account_id))
+
+    def test_01_accounts_spread_over_shards(self):
+        """Test new accounts go to the emptiest shard with IDs routed to it."""
+        # WHEN
+        account_ids = [self._create_account() for _ in range(SHARDS_COUNT * 2)]
+        # THEN
+        self.assertEqual(len(set(account_ids)), len(account_ids))
+        self.assertEqual([self._count(index, Account) for index in range(SHARDS_COUNT)], [2] * SHARDS_COUNT)
+        for account_id in account_ids:
+            shard_index = self.sharded_db.get_shard_index(account_id)
+            account = AccountService.get_by_id(UoW(self.sharded_db.shards[shard_index]), account_id)
+            self.assertEqual(account.id, account_id)
+
+    def test_02_import_writes_to_account_shard(self):
+        """Test transactions, balances and searches of an account use its shard only."""
+        # GIVEN
+        account_id = self._create_account()
+        shard_index = self.sharded_db.get_shard_index(account_id)
+        # WHEN
+        self._import(account_id)
+        # THEN
+        self.assertEqual(
+            [self._count(index, Transaction) for index in range(SHARDS_COUNT)],
+            [7 if index == shard_index else 0 for index in range(SHARDS_COUNT)],
+        )
+        uow = ShardedUoW(self.sharded_db, account_id)
+        self.assertEqual(AccountService.get_balance(uow, account_id), to_decimal(296_523.0))
+        self.assertEqual(len(TransactionService.get_by_date_range(uow, account_id, date(2023, 8, 1))), 2)
+
+    def test_03_fan_out_reports(self):
+        """Test cross-account lookups fan out to every shard and combine the results."""
+        # GIVEN
+        debit_ids = [self._create_account() for _ in range(4)]
+        credit_id = self._create_account(AccountType.CREDIT)
+        for account_id in debit_ids[:2]:
+            self._import(account_id)
+        # WHEN
+        balances = {}
+        for shard_balances in fan_out(self.sharded_db, AccountService.get_balances, [*debit_ids, credit_id]):
+            balances.update(shard_balances)
+        debit_accounts = fan_out(self.sharded_db, AccountService.get_all_by_type, AccountType.DEBIT)
+        # THEN
+        self.assertEqual(
+            balances,
+            {
+                debit_ids[0]: to_decimal(296_523.0),
+                debit_ids[1]: to_decimal(296_523.0),
+                debit_ids[2]: 0,
+                debit_ids[3]: 0,
+                credit_id: 0,
+            },
+        )
+        self.assertEqual(sorted(account.id for accounts in debit_accounts for account in accounts), sorted(debit_ids))
+
+    def test_04_shards_have_separate_writer_locks(self):
+        """Test an import into one shard proceeds while another shard is locked by a writer."""
+        # GIVEN
+        locked_account_id, account_id = self._create_account(), self._create_account()
+        locked_shard = self.sharded_db.get_shard(locked_account_id)
+        self.assertIsNot(locked_shard, self.sharded_db.get_shard(account_id))
+        with locked_shard.engine.connect() as conn:
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+            # WHEN
+            self._import(account_id)
+            conn.exec_driver_sql("ROLLBACK")
+        # THEN
+        self.assertEqual(
+            AccountService.get_balance(ShardedUoW(self.sharded_db, account_id), account_id), to_decimal(296_523.0)
+        )
@@ -0,0 +1,56 @@
+import os
+import tempfile
+
+from app.tests.common import TestBankAppCommon, correct_test_files_dir, incorrect_test_files_dir
+
+TRANSACTIONS_1 = f"{correct_test_files_dir}/transactions_1.csv"
+INCORRECT_DATA_HEADER_ONLY = f"{incorrect_test_files_dir}/header_only.csv"
+
+
+class TestStreamingImport(TestBankAppCommon):
+    def parse_chunks(self, file_path: str, account_id: int, chunk_size: int):
+        return self.bank_app.parser.parse_chunks(file_path, account_id, chunk_size)
+
+    def create_from_chunks(self, account_id: int, chunks) -> int:
+        return self.bank_app.trx_service.create_from_chunks(self.bank_app.uow, account_id, chunks)
+
+    def test_01_parse_chunks_sizes(self):
+        """Test the parser yields chunks of the requested size with the same rows as parse_data."""
+        # WHEN
+        chunks = list(self.parse_chunks(TRANSACTIONS_1, self.debit_acc_id, chunk_size=2))
+        # THEN
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 2, 1])
+        self.assertEqual([trx for chunk in chunks for trx in chunk], self.parse_data(TRANSACTIONS_1, self.debit_acc_id))
+
+    def test_02_streaming_import_balance(self):
+        """Test streaming import stores all rows and updates the balance once."""
+        # WHEN
+        count = self.create_from_chunks(
+            self.debit_acc_id, self.parse_chunks(TRANSACTIONS_1, self.debit_acc_id, chunk_size=3)
+        )
+        # THEN
+        self.assertEqual(count, 7)
+        self.assertEqual(self.get_balance(self.debit_acc_id), 296_523.00)
+        account = self.bank_app.acc_service.get_by_id(self.bank_app.uow, self.debit_acc_id)
+        self.assertEqual(account.balance, 296_523.00)
+
+    def test_03_error_in_later_chunk_rolls_back_everything(self):
+        """Test an invalid row after several inserted chunks leaves the account untouched."""
+        # GIVEN
+        with open(TRANSACTIONS_1, encoding="UTF-8") as f:
+            content = f.read()
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, encoding="UTF-8") as f:
+            f.write(content + "2023-08-25,,10\n")
+        self.addCleanup(os.remove, f.name)
+        # WHEN/THEN
+        with self.assertRaisesRegex(ValueError, "The row number 8"):
+            self.create_from_chunks(self.debit_acc_id, self.parse_chunks(f.name, self.debit_acc_id, chunk_size=2))
+        self.assertEqual(self.get_balance(self.debit_acc_id), 0)
+        self.assertEqual(self.bank_app.trx_service.get_by_date_range(self.bank_app.uow, self.debit_acc_id), [])
+
+    def test_04_streaming_import_header_only(self):
+        """Test streaming import of a file without transactions"""
+        with self.assertRaisesRegex(ValueError, "No data to import!"):
+            self.create_from_chunks(
+                self.debit_acc_id, self.parse_chunks(INCORRECT_DATA_HEADER_ONLY, self.debit_acc_id, chunk_size=2)
+            )
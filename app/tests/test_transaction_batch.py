@@ -0,0 +1,62 @@
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+
+from app.account.transaction.batch import TransactionBatch
+from app.tests.common import TestBankAppCommon, correct_test_files_dir
+from app.utils.helper_methods import to_decimal
+
+TRANSACTIONS_1 = f"{correct_test_files_dir}/transactions_1.csv"
+
+
+class TestTransactionBatch(TestBankAppCommon):
+    def setUp(self) -> None:
+        super().setUp()
+        self.transactions = self.parse_data(TRANSACTIONS_1, self.debit_acc_id)
+        self.batch = TransactionBatch.from_transactions(self.transactions, self.debit_acc_id)
+
+    def test_01_lazy_rows(self):
+        """Test rows of a batch are the same models as the parsed ones, slices are batches."""
+        # THEN
+        self.assertEqual(len(self.batch), len(self.transactions))
+        self.assertEqual(list(self.batch), self.transactions)
+        self.assertEqual(self.batch[-1], self.transactions[-1])
+        self.assertEqual(list(self.batch[2:5]), self.transactions[2:5])
+        self.assertEqual(list(self.batch[::2]), self.transactions[::2])
+        self.assertEqual(self.batch[2:5], TransactionBatch.from_transactions(self.transactions[2:5], self.debit_acc_id))
+        self.assertEqual(len(self.batch[5:2]), 0)
+        with self.assertRaises(IndexError):
+            self.batch[len(self.transactions)]
+        self.assertEqual(self.batch.total, to_decimal(296_523.0))
+        self.assertEqual((self.batch.first_date, self.batch.last_date), (date(2023, 4, 1), date(2023, 8, 24)))
+        self.assertEqual(self.batch.to_rows(0, 1), [self.transactions[0].model_dump()])
+
+    def test_02_create_batch(self):
+        """Test a batch is imported like the list of its models, in slices of the insert size."""
+        # WHEN
+        with patch("app.account.transaction.repository.BATCH_INSERT_SIZE", 3):
+            ids = self.create_transactions(self.debit_acc_id, self.batch)
+        # THEN
+        self.assertEqual(len(ids), len(self.transactions))
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(self.get_balance(self.debit_acc_id), to_decimal(296_523.0))
+        self.assertEqual(self.get_balance(self.debit_acc_id, date(2023, 4, 21)), Decimal("99987.75"))
+        trx_service, uow = self.bank_app.trx_service, self.bank_app.uow
+        stored = trx_service.get_by_date_range(uow, self.debit_acc_id, date(2023, 1, 1), date(2023, 12, 31))
+        self.assertEqual(
+            sorted((trx.date, trx.description, trx.amount) for trx in stored),
+            sorted((trx.date, trx.description, trx.amount) for trx in self.transactions),
+        )
+
+    def test_03_create_batch_chunks_deduplicated(self):
+        """Test batches are accepted by the chunked and the deduplicating imports."""
+        # GIVEN
+        trx_service, uow = self.bank_app.trx_service, self.bank_app.uow
+        chunks = [self.batch[:3], self.batch[3:]]
+        # WHEN
+        count = trx_service.create_from_chunks(uow, self.debit_acc_id, chunks, deduplicate=True)
+        repeated_ids = trx_service.create(uow, self.debit_acc_id, self.batch, deduplicate=True)
+        # THEN
+        self.assertEqual(count, len(self.transactions))
+        self.assertEqual(repeated_ids, [])
+        self.assertEqual(self.get_balance(self.debit_acc_id), to_decimal(296_523.0))
@@ -0,0 +1,72 @@
+from datetime import date
+
+from sqlalchemy import event, text
+
+from app.tests.common import TestBankAppCommon, correct_test_files_dir
+
+TRANSACTIONS_1 = f"{correct_test_files_dir}/transactions_1.csv"
+INDEX_NAME = "ix_transaction_account_id_date_amount"
+
+
+class TestTransactionIndexes(TestBankAppCommon):
+    def setUp(self) -> None:
+        super().setUp()
+        self.create_transactions(self.debit_acc_id, self.parse_data(TRANSACTIONS_1, self.debit_acc_id))
+
+    def _capture_queries(self, func, *args):
+        """Run func and return (statement, parameters) of every SELECT it emitted."""
+        queries = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                queries.append((statement, parameters))
+
+        event.listen(self.db.engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            func(*args)
+        finally:
+            event.remove(self.db.engine, "before_cursor_execute", before_cursor_execute)
+        return queries
+
+    def _query_plan(self, statement: str, parameters) -> str:
+        with self.db.engine.connect() as conn:
+            rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+        return "\n".join(row[-1] for row in rows)
+
+    def test_01_balance_uses_covering_index(self):
+        """Test balance SUM is answered by an index range scan."""
+        # WHEN
+        queries = self._capture_queries(self.get_balance, self.debit_acc_id, date(2023, 6, 1))
+        # THEN
+        (balance_query,) = [query for query in queries if "sum(" in query[0]]
+        plan = self._query_plan(*balance_query)
+        self.assertIn(f"SEARCH transaction USING COVERING INDEX {INDEX_NAME}", plan)
+        self.assertNotIn("SCAN", plan)
+
+    def test_02_date_range_search_uses_index_order(self):
+        """Test date range search is an index range scan without an extra sort step."""
+        # WHEN
+        queries = self._capture_queries(
+            self.bank_app.trx_service.get_by_date_range,
+            self.bank_app.uow,
+            self.debit_acc_id,
+            date(2023, 4, 1),
+            date(2023, 7, 1),
+        )
+        # THEN
+        self.assertEqual(len(queries), 1)
+        plan = self._query_plan(*queries[0])
+        self.assertIn(f"SEARCH transaction USING INDEX {INDEX_NAME}", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_03_index_built_on_existing_database(self):
+        """Test indexes missing from an already existing table are created on startup."""
+        # GIVEN
+        with self.db.engine.begin() as conn:
+            conn.execute(text(f"DROP INDEX {INDEX_NAME}"))
+        # WHEN
+        self.db._create_tables()
+        # THEN
+        with self.db.engine.connect() as conn:
+            indexes = conn.exec_driver_sql("PRAGMA index_list('transaction')").fetchall()
+        self.assertIn(INDEX_NAME, [index[1] for index in indexes])
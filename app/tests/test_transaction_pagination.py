@@ -0,0 +1,69 @@
+from datetime import date
+from io import StringIO
+from unittest.mock import patch
+
+from app.account.transaction.schemas import STransactionAdd
+from app.tests.common import TestBankAppCommon
+
+DAYS_COUNT = 5
+TRANSACTIONS_PER_DAY = 5
+
+
+class TestTransactionPagination(TestBankAppCommon):
+    def setUp(self) -> None:
+        super().setUp()
+        self.create_transactions(
+            self.debit_acc_id,
+            [
+                STransactionAdd(
+                    date=date(2023, 4, day), amount=day * 10 + n, description=f"trx {n}", account_id=self.debit_acc_id
+                )
+                for n in range(TRANSACTIONS_PER_DAY)
+                for day in range(1, DAYS_COUNT + 1)
+            ],
+        )
+
+    def search_page(self, **kwargs):
+        return self.bank_app.trx_service.search_page(self.bank_app.uow, self.debit_acc_id, **kwargs)
+
+    def test_01_pages_cover_range_in_order(self):
+        """Test following cursors returns every transaction once, newest first."""
+        # GIVEN
+        expected = sorted(
+            self.bank_app.trx_service.get_by_date_range(self.bank_app.uow, self.debit_acc_id),
+            key=lambda trx: (trx.date, trx.id),
+            reverse=True,
+        )
+        # WHEN
+        pages = list(self.bank_app.trx_service.iter_pages(self.bank_app.uow, self.debit_acc_id, limit=4))
+        # THEN
+        self.assertEqual([len(page.transactions) for page in pages], [4, 4, 4, 4, 4, 4, 1])
+        self.assertEqual([trx for page in pages for trx in page.transactions], expected)
+        self.assertIsNone(pages[-1].next_cursor)
+
+    def test_02_page_respects_date_range(self):
+        """Test pages stay within the requested date range."""
+        # WHEN
+        first_page = self.search_page(start_date=date(2023, 4, 2), end_date=date(2023, 4, 3), limit=6)
+        second_page = self.search_page(
+            start_date=date(2023, 4, 2), end_date=date(2023, 4, 3), limit=6, cursor=first_page.next_cursor
+        )
+        # THEN
+        self.assertEqual({trx.date for trx in first_page.transactions}, {date(2023, 4, 3), date(2023, 4, 2)})
+        self.assertEqual([trx.date for trx in second_page.transactions], [date(2023, 4, 2)] * 4)
+        self.assertIsNone(second_page.next_cursor)
+
+    def test_03_invalid_cursor(self):
+        """Test a malformed cursor is rejected."""
+        with self.assertRaisesRegex(ValueError, "Invalid cursor"):
+            self.search_page(cursor="not a cursor")
+
+    def test_04_cli_prints_page_by_page(self):
+        """Test the CLI prints the next page only when asked for."""
+        with patch.object(self.bank_app, "PAGE_SIZE", 10), patch("sys.stdout", new=StringIO()) as stdout:
+            self.bank_app.account_id = self.debit_acc_id
+            with patch("builtins.input", side_effect=["", "", "", "q"]) as mocked_input:
+                self.bank_app.search_transactions()
+        # start date, end date, "show more" after the first and the second page
+        self.assertEqual(mocked_input.call_count, 4)
+        self.assertEqual(stdout.getvalue().count("trx "), 20)
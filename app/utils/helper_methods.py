@@ -1,3 +1,5 @@
+from calendar import monthrange
+from datetime import date
 from decimal import Decimal
 from typing import TypeVar
 
@@ -9,3 +11,24 @@ number = TypeVar("number", int, float, Decimal)
 # TODO: find a way to remove?
 def to_decimal(amount_as_str: number | str, rounding: str = settings.ROUNDING) -> Decimal:
     return Decimal(amount_as_str).quantize(Decimal("0.00"), rounding=rounding)
+
+
+def month_end(_date: date) -> date:
+    return _date.replace(day=monthrange(_date.year, _date.month)[1])
+
+
+def from_cents(cents: int | Decimal) -> Decimal:
+    return Decimal(cents).scaleb(-2)
+
+
+def to_cents(amount: Decimal, rounding: str = settings.ROUNDING) -> int:
+    return int(amount.scaleb(2).to_integral_value(rounding=rounding))
+
+
+def import_pyarrow():
+    """Return the ``pyarrow`` module, an optional dependency needed only by the Parquet and Arrow formats."""
+    try:
+        import pyarrow
+    except ImportError:
+        raise ValueError("The Parquet and Arrow formats require pyarrow, install it with: pip install pyarrow")
+    return pyarrow
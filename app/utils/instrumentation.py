@@ -0,0 +1,184 @@
+"""Query instrumentation based on SQLAlchemy engine and session events.
+
+Every executed statement is counted and timed, failed statements are counted separately too, statements slower than
+``settings.SLOW_QUERY_THRESHOLD_MS`` are logged with their parameters. Queries are also attributed to every active
+scope: each ``UoW`` block and each service method decorated with ``instrumented``. Cumulative counters are exported in
+the Prometheus text format.
+"""
+
+import functools
+from collections import defaultdict
+from collections.abc import Callable
+from contextvars import ContextVar
+from logging import getLogger
+from threading import Lock
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import event
+
+from app.config import settings
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+    from sqlalchemy.orm import sessionmaker
+
+_logger = getLogger(__name__)
+METRIC_PREFIX = "bankapp"
+MAX_LOGGED_PARAMETERS_LENGTH = 1_000
+
+
+class Scope:
+    """Queries executed while the scope is active, e.g. during one ``UoW`` block."""
+
+    def __init__(self, instrumentation: "Instrumentation", name: str) -> None:
+        self.instrumentation = instrumentation
+        self.name = name
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.seconds = 0.0
+
+    def __enter__(self) -> "Scope":  # noqa: D105
+        self._start = perf_counter()
+        self._token = self.instrumentation._scopes.set(self.instrumentation._scopes.get() + (self,))
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:  # noqa: D105
+        self.seconds = perf_counter() - self._start
+        self.instrumentation._scopes.reset(self._token)
+        self.instrumentation._record_scope(self)
+
+
+class Instrumentation:
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._scopes: ContextVar[tuple[Scope, ...]] = ContextVar("instrumentation_scopes", default=())
+        self.reset()
+
+    def reset(self) -> None:
+        """Zero all the counters."""
+        with self._lock:
+            self.counters: dict[str, float] = defaultdict(float)
+            # scope name -> calls, seconds, queries, query seconds
+            self.scope_counters: dict[str, dict[str, float]] = defaultdict(lambda: defaultdict(float))
+
+    def instrument_engine(self, engine: "Engine") -> None:
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(engine, "handle_error", self._handle_error)
+
+    def instrument_sessions(self, session_factory: "sessionmaker") -> None:
+        event.listen(session_factory, "after_commit", self._after_commit)
+        event.listen(session_factory, "after_rollback", self._after_rollback)
+
+    def scope(self, name: str) -> Scope:
+        """Return a context manager attributing the queries executed inside it to ``name``."""
+        return Scope(self, name)
+
+    def snapshot(self) -> str:
+        """Return the cumulative counters in the Prometheus text format."""
+        with self._lock:
+            counters = dict(self.counters)
+            scope_counters = {name: dict(values) for name, values in self.scope_counters.items()}
+        metrics = [
+            ("queries_total", "Executed SQL statements.", "queries"),
+            ("query_seconds_total", "Time spent executing SQL statements.", "query_seconds"),
+            ("slow_queries_total", "SQL statements slower than the slow query threshold.", "slow_queries"),
+            ("failed_queries_total", "SQL statements that raised an error.", "failed_queries"),
+            ("commits_total", "Committed sessions.", "commits"),
+            ("rollbacks_total", "Rolled back sessions.", "rollbacks"),
+            ("conflict_retries_total", "Units of work re-run after a write conflict.", "conflict_retries"),
+        ]
+        lines = []
+        for name, help_text, key in metrics:
+            lines += [
+                f"# HELP {METRIC_PREFIX}_{name} {help_text}",
+                f"# TYPE {METRIC_PREFIX}_{name} counter",
+                f"{METRIC_PREFIX}_{name} {counters.get(key, 0):g}",
+            ]
+        scope_metrics = [
+            ("scope_calls_total", "Completed unit of work blocks and service calls.", "calls"),
+            ("scope_seconds_total", "Time spent in unit of work blocks and service calls.", "seconds"),
+            ("scope_queries_total", "SQL statements executed by unit of work blocks and service calls.", "queries"),
+            ("scope_query_seconds_total", "Time spent executing SQL statements by scope.", "query_seconds"),
+        ]
+        for name, help_text, key in scope_metrics:
+            lines += [f"# HELP {METRIC_PREFIX}_{name} {help_text}", f"# TYPE {METRIC_PREFIX}_{name} counter"]
+            lines += [
+                f'{METRIC_PREFIX}_{name}{{scope="{scope}"}} {values.get(key, 0):g}'
+                for scope, values in sorted(scope_counters.items())
+            ]
+        return "\n".join(lines) + "\n"
+
+    def dump(self, file_path: str) -> None:
+        """Write the Prometheus snapshot to a file, e.g. one read by the node exporter textfile collector."""
+        with open(file_path, "w", encoding="UTF-8") as f:
+            f.write(self.snapshot())
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("query_start_time", []).append(perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        seconds = perf_counter() - conn.info["query_start_time"].pop()
+        slow = seconds * 1_000 >= settings.SLOW_QUERY_THRESHOLD_MS
+        if slow:
+            logged_parameters = repr(parameters)
+            if len(logged_parameters) > MAX_LOGGED_PARAMETERS_LENGTH:
+                logged_parameters = f"{logged_parameters[:MAX_LOGGED_PARAMETERS_LENGTH]}..."
+            _logger.warning("Slow query (%.1f ms): %s; parameters: %s", seconds * 1_000, statement, logged_parameters)
+        self._record_query(seconds, slow=slow)
+
+    def _handle_error(self, exception_context) -> None:
+        # after_cursor_execute doesn't fire for a failed statement, so its start time is popped here instead
+        conn = exception_context.connection
+        start_times = conn.info.get("query_start_time") if conn is not None else None
+        if exception_context.statement is None or not start_times:
+            return  # the error was raised before the statement reached the cursor, e.g. on connect
+        seconds = perf_counter() - start_times.pop()
+        _logger.debug("Failed query (%.1f ms): %s", seconds * 1_000, exception_context.statement)
+        self._record_query(seconds, failed=True)
+
+    def _record_query(self, seconds: float, slow: bool = False, failed: bool = False) -> None:
+        for scope in self._scopes.get():
+            scope.queries += 1
+            scope.query_seconds += seconds
+        with self._lock:
+            self.counters["queries"] += 1
+            self.counters["query_seconds"] += seconds
+            self.counters["slow_queries"] += slow
+            self.counters["failed_queries"] += failed
+
+    def _after_commit(self, session) -> None:
+        with self._lock:
+            self.counters["commits"] += 1
+
+    def _after_rollback(self, session) -> None:
+        with self._lock:
+            self.counters["rollbacks"] += 1
+
+    def record_conflict_retry(self) -> None:
+        with self._lock:
+            self.counters["conflict_retries"] += 1
+
+    def _record_scope(self, scope: Scope) -> None:
+        _logger.debug("%s: %s queries, %.1f ms", scope.name, scope.queries, scope.query_seconds * 1_000)
+        with self._lock:
+            counters = self.scope_counters[scope.name]
+            counters["calls"] += 1
+            counters["seconds"] += scope.seconds
+            counters["queries"] += scope.queries
+            counters["query_seconds"] += scope.query_seconds
+
+
+instrumentation = Instrumentation()
+
+
+def instrumented(func: Callable) -> Callable:
+    """Attribute the queries of a service method to a scope named after it, e.g. ``AccountService.get_balance``."""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs) -> Any:
+        with instrumentation.scope(func.__qualname__):
+            return func(*args, **kwargs)
+
+    return wrapper
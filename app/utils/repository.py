@@ -1,12 +1,28 @@
+import csv
 from abc import ABC, abstractmethod
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
+from inspect import isfunction
+from io import StringIO
 from typing import TYPE_CHECKING, Any
 
 from sqlalchemy import insert, select
 
 if TYPE_CHECKING:
+    from sqlalchemy.engine import Dialect
+    from sqlalchemy.ext.asyncio import AsyncSession
     from sqlalchemy.orm import Session
 
+# Max number of bound parameters in a single statement
+MAX_BIND_PARAMS = {
+    "sqlite": 32_766,  # SQLite >= 3.32, older versions allow 999
+    "postgresql": 32_767,
+    "mysql": 65_535,
+    "mssql": 2_099,
+}
+DEFAULT_MAX_BIND_PARAMS = 999
+# Max number of rows buffered in memory for a single COPY
+COPY_BATCH_SIZE = 100_000
+
 
 class AbstractRepository(ABC):
     @abstractmethod
@@ -14,7 +30,7 @@ class AbstractRepository(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def create_multi(self, data_list):
+    def create_multi(self, data_list, returning=True):
         raise NotImplementedError
 
     @abstractmethod
@@ -26,6 +42,7 @@ class AbstractRepository(ABC):
         self,
         filters=None,
         order_by=None,
+        limit=None,
     ):
         raise NotImplementedError
 
@@ -44,23 +61,115 @@ class SqlAlchemyRepository(AbstractRepository):
         stmt = insert(self.model).values(**data).returning(self.model.id)
         return self.session.execute(stmt).scalar_one()
 
-    def create_multi(self, data_list: list[dict]) -> list[int]:
-        stmt = insert(self.model).values(data_list).returning(self.model.id)
-        return self.session.execute(stmt).scalars().all()
+    def create_multi(self, data_list: list[dict], returning: bool = True) -> list[int]:
+        """Insert rows in batches that fit into the bind parameter limit of the dialect.
+
+        All dicts are expected to have the same keys as the first one.
+        Returns IDs of the new records, or an empty list if ``returning`` is False,
+        which allows a plain executemany or, on PostgreSQL with psycopg2, a COPY.
+        """
+        if not data_list:
+            return []
+        dialect = self.session.get_bind().dialect
+        table = self.model.__table__
+        batch_size = self._get_batch_size(dialect, columns_count=len(data_list[0]))
+        stmt = insert(table).execution_options(insertmanyvalues_page_size=batch_size)
+        if returning:
+            return self.session.execute(stmt.returning(table.c.id), data_list).scalars().all()
+        if dialect.name == "postgresql" and dialect.driver == "psycopg2":
+            self._copy_multi(data_list)
+        else:
+            self.session.execute(stmt, data_list)
+        return []
+
+    @staticmethod
+    def _get_batch_size(dialect: "Dialect", columns_count: int) -> int:
+        max_params = MAX_BIND_PARAMS.get(dialect.name, DEFAULT_MAX_BIND_PARAMS)
+        if dialect.name == "sqlite" and dialect.dbapi.sqlite_version_info < (3, 32):
+            max_params = DEFAULT_MAX_BIND_PARAMS
+        return max(1, max_params // max(1, columns_count))
+
+    def _copy_multi(self, data_list: list[dict]) -> None:
+        """Stream rows to PostgreSQL with ``COPY ... FROM STDIN`` (psycopg2 only)."""
+        columns = list(data_list[0])
+        sql = f'COPY "{self.model.__tablename__}" ({", ".join(columns)}) FROM STDIN WITH (FORMAT csv)'
+        dialect = self.session.get_bind().dialect
+        cursor = self.session.connection().connection.dbapi_connection.cursor()
+        try:
+            for start in range(0, len(data_list), COPY_BATCH_SIZE):
+                buffer = StringIO()
+                csv.writer(buffer).writerows(
+                    self._get_copy_rows(dialect, columns, data_list[start : start + COPY_BATCH_SIZE])
+                )
+                buffer.seek(0)
+                cursor.copy_expert(sql, buffer)
+        finally:
+            cursor.close()
+
+    def _get_copy_rows(self, dialect: "Dialect", columns: list[str], data_list: list[dict]) -> Iterator[list]:
+        """Yield values of the rows as they are bound by an INSERT, e.g. amounts as cents with ``Cents`` columns.
+
+        COPY bypasses the bind parameter processing of the column types, so it's applied here.
+        """
+        table = self.model.__table__
+        processors = [table.c[column].type.bind_processor(dialect) for column in columns]
+        for row in data_list:
+            yield [process(row[column]) if process else row[column] for column, process in zip(columns, processors)]
 
     def get_one(self, filters=None, order_by=None):
         stmt = select(self.model).filter(*filters).order_by(order_by).limit(1)
         return self.session.execute(stmt).scalars().one_or_none()
 
-    def get_all(self, filters=None, order_by=None):
-        stmt = select(self.model).filter(*filters).order_by(order_by)
+    def get_all(self, filters=None, order_by=None, limit: int | None = None):
+        order_by = order_by if isinstance(order_by, list | tuple) else [order_by]
+        stmt = select(self.model).filter(*filters).order_by(*order_by).limit(limit)
         return self.session.execute(stmt).scalars().fetchall()
 
+    def iter_partitions(self, columns: list, filters=None, order_by=None, batch_size: int = 10_000) -> Iterator:
+        """Yield rows of the ``columns`` in lists of at most ``batch_size`` rows.
+
+        Rows are fetched through a server-side cursor where the driver supports one, so only a single
+        batch is held in memory however many rows match. The statement runs on the connection of the session,
+        skipping the ORM loading of every row.
+        """
+        stmt = select(*columns).filter(*(filters or [])).order_by(*(order_by or []))
+        yield from self.session.connection().execute(stmt.execution_options(yield_per=batch_size)).partitions()
+
     def get_aggregated(self, aggregate_func: Callable, column_name: str, filters=None, order_by=None):
         selectee = aggregate_func(getattr(self.model, column_name))
         stmt = select(selectee).filter(*filters).order_by(order_by)
         return self.session.execute(stmt).scalars().all()
 
+    def get_grouped(self, aggregates: list, group_by: list, filters=None, order_by=None) -> list:
+        """Return rows of the ``group_by`` expressions followed by the ``aggregates``, ordered by groups by default."""
+        stmt = select(*group_by, *aggregates).filter(*(filters or [])).group_by(*group_by)
+        stmt = stmt.order_by(*(order_by if order_by is not None else group_by))
+        return self.session.execute(stmt).all()
+
     def get_by_id(self, rec_id: int, for_update: bool = False):
-        stmt = select(self.model, for_update=for_update).where(self.model.id == rec_id)
+        stmt = select(self.model).where(self.model.id == rec_id)
+        if for_update:
+            stmt = stmt.with_for_update()
         return self.session.execute(stmt).scalars().one_or_none()
+
+
+class AsyncRepository:
+    """Awaitable facade of a sync repository bound to an ``AsyncSession``.
+
+    Every method of the wrapped repository becomes a coroutine that runs the sync code
+    through ``AsyncSession.run_sync``, so both APIs share the same queries.
+    """
+
+    def __init__(self, session: "AsyncSession", repository: type[SqlAlchemyRepository]) -> None:
+        self.session = session
+        self.repository = repository
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self.repository, name)
+        if not isfunction(attribute):
+            return attribute
+
+        async def method(*args, **kwargs):
+            return await self.session.run_sync(lambda session: attribute(self.repository(session), *args, **kwargs))
+
+        return method
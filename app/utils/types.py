@@ -0,0 +1,26 @@
+from decimal import Decimal
+
+from sqlalchemy import BigInteger, TypeDecorator
+
+from app.utils.helper_methods import from_cents, to_cents
+
+
+class Cents(TypeDecorator):
+    """Amount stored as a 64-bit integer number of minor units, exposed as a Decimal with two decimal places.
+
+    Integer SUMs are exact and cheaper than NUMERIC ones, which SQLite computes as floating point REAL.
+    """
+
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect) -> int | None:
+        if value is None:
+            return None
+        if not isinstance(value, Decimal):
+            value = Decimal(str(value))
+        return to_cents(value)
+
+    def process_result_value(self, value, dialect) -> Decimal | None:
+        # SUM of a BIGINT column is NUMERIC on PostgreSQL, hence the conversion of any number
+        return None if value is None else from_cents(value)
@@ -1,10 +1,43 @@
+import functools
+import random
+import time
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from logging import getLogger
+from typing import TYPE_CHECKING, Any, TypeVar
 
-from app.account import AccountRepository, TransactionRepository
+from sqlalchemy.exc import DBAPIError
+
+from app.account import (
+    AccountRepository,
+    ArchivedTransactionRepository,
+    BalanceCheckpointRepository,
+    LedgerRepository,
+    MonthlyTotalRepository,
+    OpeningBalanceRepository,
+    TransactionRepository,
+)
+from app.config import settings
+from app.utils.instrumentation import Scope, instrumentation
+from app.utils.repository import AsyncRepository
 
 if TYPE_CHECKING:
-    from app.database import Database
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.orm import Session
+
+    from app.database import AsyncDatabase, Database, ShardedDatabase
+
+_logger = getLogger(__name__)
+T = TypeVar("T")
+# SQLSTATEs of serialization failures and deadlocks, e.g. on PostgreSQL
+CONFLICT_SQLSTATES = {"40001", "40P01"}
+UNIQUE_VIOLATION_SQLSTATE = "23505"
+# unique indexes a concurrent transaction can fill first with rows the block skips when run again:
+# two deduplicating imports of the same statement both pass the fingerprint anti-join,
+# then the second one waits for the first and fails on the index on PostgreSQL
+CONFLICT_UNIQUE_INDEXES = {"ix_transaction_account_id_fingerprint"}
 
 
 class AbstractUoW(ABC):
@@ -12,6 +45,13 @@ class AbstractUoW(ABC):
     trx_rep: type[TransactionRepository]  # Type as class is accepted, not instance
     account: AccountRepository
     transactions: TransactionRepository
+    checkpoints: BalanceCheckpointRepository
+    monthly_totals: MonthlyTotalRepository
+    archive: ArchivedTransactionRepository
+    opening_balances: OpeningBalanceRepository
+    ledger: LedgerRepository
+    # a failed block is rolled back by the UoW itself, so it can be run again
+    retryable: bool = True
 
     @abstractmethod
     def __enter__(self):  # noqa: D105
@@ -27,12 +67,183 @@ class UoW(AbstractUoW):
         self.database = database
 
     def __enter__(self) -> None:  # noqa: D105
+        self._scope = instrumentation.scope("UoW").__enter__()
         self.session = self.database.create_session()
+        self._bind_repositories()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:  # noqa: D105
+        try:
+            if exc_type:
+                self.session.rollback()
+            self.session.commit()
+            self.session.close()
+        finally:
+            self._scope.__exit__(exc_type, exc_val, exc_tb)
+
+    def _bind_repositories(self) -> None:
         self.account = AccountRepository(self.session)
         self.transactions = TransactionRepository(self.session)
+        self.checkpoints = BalanceCheckpointRepository(self.session)
+        self.monthly_totals = MonthlyTotalRepository(self.session)
+        self.archive = ArchivedTransactionRepository(self.session)
+        self.opening_balances = OpeningBalanceRepository(self.session)
+        self.ledger = LedgerRepository(self.session)
+
+
+class ShardedUoW(UoW):
+    """UoW of the shard of an account of a ``ShardedDatabase``, or of the shard with fewest accounts without one.
+
+    Accounts created through it get IDs routed to its shard.
+    """
+
+    def __init__(self, database: "ShardedDatabase", account_id: int | None = None) -> None:
+        if account_id is None:
+            self.shard_index = min(range(len(database.shards)), key=lambda index: _count_accounts(database, index))
+        else:
+            self.shard_index = database.get_shard_index(account_id)
+        self.shards_count = len(database.shards)
+        super().__init__(database.shards[self.shard_index])
+
+    def _bind_repositories(self) -> None:
+        super()._bind_repositories()
+        self.account.shard = (self.shard_index, self.shards_count)
+
+
+def _count_accounts(database: "ShardedDatabase", shard_index: int) -> int:
+    uow = UoW(database.shards[shard_index])
+    with uow:
+        return uow.account.count()
+
+
+def fan_out(database: "ShardedDatabase", func: Callable[..., T], *args, **kwargs) -> list[T]:
+    """Call a service method, e.g. ``AccountService.get_balances``, on every shard concurrently.
+
+    Every call gets a ``UoW`` of its shard followed by the given arguments, e.g. ``fan_out(db,
+    AccountService.get_all_by_type, AccountType.DEBIT)``. Results are returned in the order of the shards,
+    the first failure is raised.
+    """
+    with ThreadPoolExecutor(max_workers=len(database.shards)) as executor:
+        futures = [executor.submit(func, UoW(shard), *args, **kwargs) for shard in database.shards]
+        return [future.result() for future in futures]
+
+
+class SessionUoW(UoW):
+    """UoW over a session owned by the caller, which also commits it."""
+
+    # the caller's transaction is not rolled back by the UoW, so a failed block can't be re-run
+    retryable = False
+
+    def __init__(self, session: "Session") -> None:
+        self.session = session
+        self._bind_repositories()
+
+    def __enter__(self) -> None:  # noqa: D105
+        pass
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:  # noqa: D105
-        if exc_type:
-            self.session.rollback()
-        self.session.commit()
-        self.session.close()
+        pass
+
+
+class AsyncUoW:
+    """Async unit of work, each ``async with`` block is a single transaction.
+
+    Sessions are kept in a context variable, so one instance can be shared by concurrent tasks,
+    and blocks can be nested, the innermost one is the current session.
+    """
+
+    def __init__(self, database: "AsyncDatabase") -> None:
+        self.database = database
+        # (session, instrumentation scope) of every open block
+        self._sessions: ContextVar[tuple[tuple["AsyncSession", Scope], ...]] = ContextVar(
+            f"async_uow_{id(self)}", default=()
+        )
+
+    @property
+    def session(self) -> "AsyncSession":
+        if not (sessions := self._sessions.get()):
+            raise RuntimeError("The unit of work is used outside of an 'async with' block.")
+        return sessions[-1][0]
+
+    @property
+    def account(self) -> AsyncRepository:
+        return AsyncRepository(self.session, AccountRepository)
+
+    @property
+    def transactions(self) -> AsyncRepository:
+        return AsyncRepository(self.session, TransactionRepository)
+
+    @property
+    def checkpoints(self) -> AsyncRepository:
+        return AsyncRepository(self.session, BalanceCheckpointRepository)
+
+    @property
+    def monthly_totals(self) -> AsyncRepository:
+        return AsyncRepository(self.session, MonthlyTotalRepository)
+
+    @property
+    def archive(self) -> AsyncRepository:
+        return AsyncRepository(self.session, ArchivedTransactionRepository)
+
+    @property
+    def opening_balances(self) -> AsyncRepository:
+        return AsyncRepository(self.session, OpeningBalanceRepository)
+
+    @property
+    def ledger(self) -> AsyncRepository:
+        return AsyncRepository(self.session, LedgerRepository)
+
+    async def __aenter__(self) -> "AsyncUoW":  # noqa: D105
+        scope = instrumentation.scope("AsyncUoW").__enter__()
+        self._sessions.set(self._sessions.get() + ((self.database.create_session(), scope),))
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:  # noqa: D105
+        session, scope = self._sessions.get()[-1]
+        try:
+            if exc_type:
+                await session.rollback()
+            else:
+                await session.commit()
+        finally:
+            await session.close()
+            self._sessions.set(self._sessions.get()[:-1])
+            scope.__exit__(exc_type, exc_val, exc_tb)
+
+    async def run_sync(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run sync service code, e.g. ``AccountService.get_balance``, in a single transaction."""
+        async with self:
+            return await self.session.run_sync(lambda session: func(SessionUoW(session), *args, **kwargs))
+
+
+def is_conflict(err: DBAPIError) -> bool:
+    """Whether the statement failed on a concurrent transaction and would likely succeed if the block ran again."""
+    sqlstate = getattr(err.orig, "pgcode", None) or getattr(err.orig, "sqlstate", None)
+    if sqlstate == UNIQUE_VIOLATION_SQLSTATE:
+        return getattr(getattr(err.orig, "diag", None), "constraint_name", None) in CONFLICT_UNIQUE_INDEXES
+    return sqlstate in CONFLICT_SQLSTATES or "database is locked" in str(err.orig)
+
+
+def retry_on_conflict(func: Callable) -> Callable:
+    """Re-run a service method, e.g. ``TransactionService.create``, when its unit of work loses a write conflict.
+
+    Every attempt is a new transaction, the failed one is rolled back by the UoW. Attempts are spaced by a random
+    exponential backoff, so concurrent writers don't collide again. Only the first ``settings.CONFLICT_RETRIES``
+    conflicts are retried, other errors and blocks of a ``SessionUoW`` are raised right away.
+    """
+
+    @functools.wraps(func)
+    def wrapper(cls, uow: AbstractUoW, *args, **kwargs) -> Any:
+        attempt = 0
+        while True:
+            try:
+                return func(cls, uow, *args, **kwargs)
+            except DBAPIError as err:
+                if not uow.retryable or attempt >= settings.CONFLICT_RETRIES or not is_conflict(err):
+                    raise
+                attempt += 1
+                delay = settings.CONFLICT_BACKOFF_MS * 2 ** (attempt - 1) * random.uniform(0.5, 1.5) / 1_000
+                _logger.warning("%s: write conflict, retry %s in %.0f ms", func.__qualname__, attempt, delay * 1_000)
+                instrumentation.record_conflict_retry()
+                time.sleep(delay)
+
+    return wrapper
@@ -0,0 +1,79 @@
+"""Compare recent balance and search lookups before and after ``TransactionService.archive``.
+
+A ledger of one account spread over ``--days`` days is archived up to the last ``--keep-days`` days, then balances
+and date range searches of the kept period and of the archived period are timed against the same lookups before
+archival.
+
+Usage: ``python -m benchmarks.archive [--transactions 1000000] [--days 2000] [--keep-days 365] [--queries 200]``
+"""
+
+import argparse
+import random
+from datetime import timedelta
+
+from app.account import AccountType
+from app.account.services import AccountService
+from app.account.transaction.services import TransactionService
+from app.utils.uow import UoW
+
+from .common import temporary_database, timer
+from .generator import START_DATE, generate_rows
+from .run import latencies
+
+
+def run(transactions: int, days: int, keep_days: int, queries: int, seed: int) -> None:
+    rng = random.Random(seed)
+    end_date = START_DATE + timedelta(days=days - 1)
+    cutoff = (end_date - timedelta(days=keep_days)).replace(day=1)
+    with temporary_database() as db:
+        uow = UoW(db)
+        account_id = AccountService.create_one(uow, AccountType.DEBIT)
+        rows = generate_rows(transactions, account_id, days=days)
+        with uow:
+            uow.transactions.create_multi(rows, returning=False)
+            uow.checkpoints.rebuild(account_id, START_DATE)
+        del rows
+
+        def sample_dates(first, last) -> list:
+            return [first + timedelta(days=rng.randrange((last - first).days + 1)) for _ in range(queries)]
+
+        periods = {"kept": sample_dates(cutoff, end_date), "archived": sample_dates(START_DATE, cutoff)}
+        print(f"{'period':<9} | {'lookup':<18} | {'before p50 ms':>13} | {'after p50 ms':>12}")
+        before = {period: measure(uow, account_id, lookup_dates) for period, lookup_dates in periods.items()}
+        with timer() as result:
+            archived = TransactionService.archive(uow, account_id, cutoff)
+        after = {period: measure(uow, account_id, lookup_dates) for period, lookup_dates in periods.items()}
+        for period in periods:
+            for lookup in before[period]:
+                print(
+                    f"{period:<9} | {lookup:<18} | {before[period][lookup]['p50_ms']:>13.3f} | "
+                    f"{after[period][lookup]['p50_ms']:>12.3f}"
+                )
+        print(f"Archived {archived} of {transactions} rows before {cutoff} in {result['seconds']:.3f}s")
+
+
+def measure(uow: UoW, account_id: int, lookup_dates: list) -> dict:
+    return {
+        "get_balance": latencies(compute_balance, [(uow, account_id, lookup_date) for lookup_date in lookup_dates]),
+        "get_by_date_range": latencies(
+            TransactionService.get_by_date_range,
+            [(uow, account_id, lookup_date - timedelta(days=7), lookup_date) for lookup_date in lookup_dates],
+        ),
+    }
+
+
+def compute_balance(uow: UoW, account_id: int, trx_date) -> None:
+    # bypasses the balance cache, every lookup is a query
+    with uow:
+        AccountService._compute_balance(uow, account_id, trx_date)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--transactions", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=2_000)
+    parser.add_argument("--keep-days", type=int, default=365)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.transactions, args.days, args.keep_days, args.queries, args.seed)
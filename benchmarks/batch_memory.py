@@ -0,0 +1,55 @@
+"""Compare the memory and import time of a list of transaction models and of a ``TransactionBatch``.
+
+Memory is the size of the Python allocations held by the container, traced with ``tracemalloc``. The list shares
+the ``date`` and ``Decimal`` objects of the input columns, so its real cost is even higher.
+
+Usage: ``python -m benchmarks.batch_memory [--sizes 100000 1000000]``
+"""
+
+import argparse
+import tracemalloc
+from decimal import Decimal
+
+from app.account import AccountType
+from app.account.services import AccountService
+from app.account.transaction.batch import TransactionBatch
+from app.account.transaction.services import TransactionService
+from app.account.transaction.validators import TransactionBatchValidator
+from app.utils.uow import UoW
+
+from .common import synthetic_rows, temporary_database, timer
+
+CONTAINERS = {"list": TransactionBatchValidator.build, "batch": TransactionBatch.from_columns}
+
+
+def run(sizes: list[int]) -> None:
+    print(f"{'rows':>10} | {'container':<9} | {'MiB':>8} | {'bytes/row':>9} | {'import s':>8} | {'rows/sec':>10}")
+    for size in sizes:
+        rows = synthetic_rows(size)
+        columns = (
+            [row["date"] for row in rows],
+            [row["description"] for row in rows],
+            [Decimal(str(row["amount"])).quantize(Decimal("0.00")) for row in rows],
+        )
+        del rows
+        for container, build in CONTAINERS.items():
+            tracemalloc.start()
+            transactions = build(*columns, account_id=1)
+            allocated = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            with temporary_database() as db:
+                uow = UoW(db)
+                account_id = AccountService.create_one(uow, AccountType.DEBIT)
+                with timer() as result:
+                    TransactionService.create(uow, account_id, transactions)
+            del transactions
+            print(
+                f"{size:>10} | {container:<9} | {allocated / 2**20:>8.1f} | {allocated / size:>9.0f} | "
+                f"{result['seconds']:>8.3f} | {size / result['seconds']:>10,.0f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", nargs="+", type=int, default=[100_000, 1_000_000])
+    run(parser.parse_args().sizes)
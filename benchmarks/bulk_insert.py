@@ -0,0 +1,63 @@
+"""Compare rows/sec of the bulk insert modes of ``SqlAlchemyRepository.create_multi``.
+
+Usage: ``python -m benchmarks.bulk_insert [--db-url URL] [--sizes 10000 100000 1000000]``
+"""
+
+import argparse
+
+from sqlalchemy import insert
+from sqlalchemy.exc import OperationalError
+
+import app.account  # noqa: F401  register models
+from app.utils.uow import UoW
+
+from .common import synthetic_rows, temporary_database, timer
+
+
+def single_statement(uow: UoW, rows: list[dict]) -> None:
+    """Previous implementation: one INSERT ... VALUES for the whole list."""
+    model = uow.transactions.model
+    uow.session.execute(insert(model).values(rows).returning(model.id)).scalars().all()
+
+
+def batched_returning(uow: UoW, rows: list[dict]) -> None:
+    uow.transactions.create_multi(rows)
+
+
+def without_returning(uow: UoW, rows: list[dict]) -> None:
+    """Plain executemany, or COPY on PostgreSQL with psycopg2."""
+    uow.transactions.create_multi(rows, returning=False)
+
+
+MODES = {
+    "single statement": single_statement,
+    "batched returning": batched_returning,
+    "no returning": without_returning,
+}
+
+
+def run(db_url: str | None, sizes: list[int]) -> None:
+    print(f"{'rows':>10} | {'mode':<18} | {'seconds':>8} | {'rows/sec':>10}")
+    for size in sizes:
+        rows = synthetic_rows(size)
+        for mode, insert_rows in MODES.items():
+            with temporary_database(db_url) as db:
+                uow = UoW(db)
+                try:
+                    with timer() as result, uow:
+                        insert_rows(uow, rows)
+                except OperationalError as err:
+                    print(f"{size:>10} | {mode:<18} | failed: {err.orig}")
+                    continue
+            print(f"{size:>10} | {mode:<18} | {result['seconds']:>8.3f} | {size / result['seconds']:>10,.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--db-url",
+        help="scratch database to benchmark against (its tables are dropped), a temporary SQLite file by default",
+    )
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+    run(args.db_url, args.sizes)
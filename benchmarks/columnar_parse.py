@@ -0,0 +1,57 @@
+"""Compare parsing the same statement from CSV, Parquet and Arrow IPC files.
+
+Parquet and Arrow files are written with typed columns: dates, decimal amounts and strings. Statements are parsed
+chunk by chunk, as imports do, without building a model per row.
+
+Usage: ``python -m benchmarks.columnar_parse [--sizes 100000 1000000]``
+"""
+
+import argparse
+import os
+import tempfile
+from decimal import Decimal
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.parser import TransactionParser
+
+from .common import synthetic_rows, temporary_csv, timer
+
+
+def write_columnar(directory: str, rows: list[dict]) -> dict[str, str]:
+    """Write the rows as Parquet and Arrow IPC files, return their paths by format."""
+    table = pa.table(
+        {
+            "date": pa.array([row["date"] for row in rows], pa.date32()),
+            "description": [row["description"] for row in rows],
+            "amount": pa.array([Decimal(str(row["amount"])) for row in rows], pa.decimal128(18, 2)),
+        }
+    )
+    paths = {
+        "parquet": os.path.join(directory, "statement.parquet"),
+        "arrow": os.path.join(directory, "statement.arrow"),
+    }
+    pq.write_table(table, paths["parquet"])
+    with pa.OSFile(paths["arrow"], "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return paths
+
+
+def run(sizes: list[int]) -> None:
+    print(f"{'rows':>10} | {'format':<8} | {'seconds':>8} | {'rows/sec':>10}")
+    for size in sizes:
+        rows = synthetic_rows(size)
+        with temporary_csv(rows) as csv_path, tempfile.TemporaryDirectory() as directory:
+            paths = {"csv": csv_path, **write_columnar(directory, rows)}
+            for file_format, file_path in paths.items():
+                with timer() as result:
+                    for _ in TransactionParser.parse_chunks(file_path, account_id=1, vectorized=True):
+                        pass
+                print(f"{size:>10} | {file_format:<8} | {result['seconds']:>8.3f} | {size / result['seconds']:>10,.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", nargs="+", type=int, default=[100_000, 1_000_000])
+    run(parser.parse_args().sizes)
@@ -0,0 +1,54 @@
+import os
+import tempfile
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from app.database import Base, Database
+
+from .generator import generate_rows, write_statement
+
+
+def synthetic_rows(count: int, account_id: int = 1) -> list[dict]:
+    """Return ``count`` deterministic transaction rows ready to be inserted."""
+    return generate_rows(count, account_id)
+
+
+@contextmanager
+def temporary_csv(rows: list[dict]) -> Iterator[str]:
+    """Yield the path of a temporary CSV statement with the given rows."""
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    os.close(fd)
+    try:
+        write_statement(path, rows)
+        yield path
+    finally:
+        os.remove(path)
+
+
+@contextmanager
+def temporary_database(db_url: str | None = None) -> Iterator[Database]:
+    """Yield a database with empty tables, a throwaway SQLite file by default."""
+    path = None
+    if not db_url:
+        fd, path = tempfile.mkstemp(suffix=".database")
+        os.close(fd)
+        db_url = f"sqlite:///{path}"
+    db = Database(db_url)
+    try:
+        yield db
+    finally:
+        Base.metadata.drop_all(db.engine)
+        db.engine.dispose()
+        if path:
+            os.remove(path)
+
+
+@contextmanager
+def timer() -> Iterator[dict]:
+    result: dict = {}
+    start = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result["seconds"] = time.perf_counter() - start
@@ -0,0 +1,53 @@
+"""Measure rows/sec and peak Python memory of ``TransactionExporter.export`` for every format.
+
+The peak is traced in a separate run with ``tracemalloc``, which slows the export down. It should stay about
+the same for every ledger size, as only one batch is held in memory at a time.
+
+Usage: ``python -m benchmarks.export [--sizes 100000 1000000] [--batch-size 10000]``
+"""
+
+import argparse
+import os
+import tempfile
+import tracemalloc
+from importlib.util import find_spec
+
+from app.account import AccountType
+from app.account.services import AccountService
+from app.exporter import TransactionExporter
+from app.utils.uow import UoW
+
+from .common import synthetic_rows, temporary_database, timer
+
+FORMATS = ["csv", "jsonl", "parquet"]
+
+
+def run(sizes: list[int], batch_size: int) -> None:
+    formats = [file_ext for file_ext in FORMATS if file_ext != "parquet" or find_spec("pyarrow")]
+    print(f"{'rows':>10} | {'format':<8} | {'seconds':>8} | {'rows/sec':>10} | {'peak MiB':>8} | {'file MiB':>8}")
+    for size in sizes:
+        with temporary_database() as db, tempfile.TemporaryDirectory() as directory:
+            uow = UoW(db)
+            account_id = AccountService.create_one(uow, AccountType.DEBIT)
+            with uow:
+                uow.transactions.create_multi(synthetic_rows(size, account_id), returning=False)
+            for file_ext in formats:
+                file_path = os.path.join(directory, f"ledger.{file_ext}")
+                with timer() as result:
+                    TransactionExporter.export(uow, account_id, file_path, batch_size=batch_size)
+                tracemalloc.start()
+                TransactionExporter.export(uow, account_id, file_path, batch_size=batch_size)
+                peak = tracemalloc.get_traced_memory()[1] / 2**20
+                tracemalloc.stop()
+                print(
+                    f"{size:>10} | {file_ext:<8} | {result['seconds']:>8.3f} | {size / result['seconds']:>10,.0f} | "
+                    f"{peak:>8.1f} | {os.path.getsize(file_path) / 2**20:>8.1f}"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", nargs="+", type=int, default=[100_000, 1_000_000])
+    parser.add_argument("--batch-size", type=int, default=TransactionExporter.BATCH_SIZE)
+    args = parser.parse_args()
+    run(args.sizes, args.batch_size)
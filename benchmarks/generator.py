@@ -0,0 +1,46 @@
+"""Deterministic generator of synthetic bank statements.
+
+The same arguments always produce the same rows, so benchmark runs are comparable.
+"""
+
+import csv
+import random
+from datetime import date, timedelta
+
+START_DATE = date(2020, 1, 1)
+
+
+def generate_rows(
+    count: int,
+    account_id: int = 1,
+    days: int = 1_000,
+    descriptions: int = 500,
+    start_date: date = START_DATE,
+    seed: int = 0,
+) -> list[dict]:
+    """Return ``count`` transaction rows of one account, sorted by date.
+
+    Dates are spread over ``days`` days, descriptions are picked out of ``descriptions`` distinct values.
+    The first row is an opening deposit, large enough to keep a debit account balance positive.
+    """
+    rng = random.Random(f"{seed}:{account_id}")
+    rows = [
+        {
+            "date": start_date + timedelta(days=rng.randrange(days)),
+            "description": f"payment {rng.randrange(descriptions)}",
+            "amount": round(rng.uniform(-500, 500), 2) or 0.01,
+            "account_id": account_id,
+        }
+        for _ in range(count - 1)
+    ]
+    rows.sort(key=lambda row: row["date"])
+    opening = {"date": start_date, "description": "opening deposit", "amount": 500 * count, "account_id": account_id}
+    return [opening, *rows] if count else []
+
+
+def write_statement(path: str, rows: list[dict]) -> None:
+    """Write rows as a CSV statement in the importable format."""
+    with open(path, "w", encoding="UTF-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["date", "description", "amount"])
+        writer.writerows((row["date"], row["description"], row["amount"]) for row in rows)
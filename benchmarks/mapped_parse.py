@@ -0,0 +1,45 @@
+"""Compare reading a large CSV statement in text mode and through a memory map.
+
+Chunks are consumed and dropped, as by a streaming import, so the traced peak is what a reader holds at a time.
+The peak is traced in a separate run with ``tracemalloc``, pages of the mapped file are not Python allocations.
+
+Usage: ``python -m benchmarks.mapped_parse [--rows 2000000]``
+"""
+
+import argparse
+import os
+import tracemalloc
+
+from app.parser import TransactionParser
+
+from .common import synthetic_rows, temporary_csv, timer
+
+MODES = {
+    "per row": {},
+    "vectorized": {"vectorized": True},
+    "memory map": {"memory_map": True},
+}
+
+
+def consume(file_path: str, options: dict) -> int:
+    return sum(len(chunk) for chunk in TransactionParser.parse_chunks(file_path, account_id=1, **options))
+
+
+def run(rows: int) -> None:
+    with temporary_csv(synthetic_rows(rows)) as file_path:
+        print(f"{rows} rows, {os.path.getsize(file_path) / 2**20:.1f} MiB")
+        print(f"{'mode':<10} | {'seconds':>8} | {'rows/sec':>10} | {'peak MiB':>8}")
+        for mode, options in MODES.items():
+            with timer() as result:
+                consume(file_path, options)
+            tracemalloc.start()
+            consume(file_path, options)
+            peak = tracemalloc.get_traced_memory()[1] / 2**20
+            tracemalloc.stop()
+            print(f"{mode:<10} | {result['seconds']:>8.3f} | {rows / result['seconds']:>10,.0f} | {peak:>8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    run(parser.parse_args().rows)
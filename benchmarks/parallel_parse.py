@@ -0,0 +1,36 @@
+"""Measure how CSV parsing throughput scales with the number of worker processes.
+
+Usage: ``python -m benchmarks.parallel_parse [--rows 1000000] [--workers 1 2 4 8]``
+"""
+
+import argparse
+import os
+
+from app.parser import TransactionParser
+
+from .common import synthetic_rows, temporary_csv, timer
+
+
+def run(rows_count: int, workers_counts: list[int]) -> None:
+    print(f"{'workers':>7} | {'seconds':>8} | {'rows/sec':>10} | {'speedup':>7}")
+    with temporary_csv(synthetic_rows(rows_count)) as file_path:
+        baseline = None
+        for workers in workers_counts:
+            with timer() as result:
+                TransactionParser.parse_data(file_path, account_id=1, vectorized=True, workers=workers)
+            baseline = baseline or result["seconds"]
+            print(
+                f"{workers:>7} | {result['seconds']:>8.3f} | {rows_count / result['seconds']:>10,.0f} | "
+                f"{baseline / result['seconds']:>6.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    cpu_count = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument(
+        "--workers", nargs="+", type=int, default=sorted({1, 2, 4, cpu_count} - {n for n in (2, 4) if n > cpu_count})
+    )
+    args = parser.parse_args()
+    run(args.rows, args.workers)
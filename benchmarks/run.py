@@ -0,0 +1,148 @@
+"""Time the main entry points on a synthetic ledger and write the results as JSON.
+
+Every account gets its own generated statement which is parsed with ``TransactionParser.parse_data`` and imported
+with ``TransactionService.create``, then ``AccountService.get_balance`` and ``TransactionService.get_by_date_range``
+are called for random dates of the generated period, ``ReportService.get_totals`` for yearly totals and
+``AccountService.get_balances`` for the balances of all accounts.
+
+Usage: ``python -m benchmarks.run [--accounts 2] [--transactions 100000] [--output results.json]
+[--compare baseline.json [--threshold 0.2]]``
+
+With ``--compare`` the exit code is 1 if any metric is more than ``threshold`` worse than in the baseline.
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+from datetime import datetime, timedelta, timezone
+
+import sqlalchemy
+
+from app.account import AccountType, Period
+from app.account.report.services import ReportService
+from app.account.services import AccountService
+from app.account.transaction.services import TransactionService
+from app.config import settings
+from app.parser import TransactionParser
+from app.utils.uow import UoW
+
+from .common import temporary_csv, temporary_database, timer
+from .generator import START_DATE, generate_rows
+
+# metrics where a bigger value is better, the others are latencies
+THROUGHPUT_METRICS = ("rows_per_sec",)
+
+
+def latencies(func, calls: list[tuple]) -> dict:
+    """Call func with each argument tuple and return the latency percentiles in milliseconds."""
+    samples = []
+    for args in calls:
+        with timer() as result:
+            func(*args)
+        samples.append(result["seconds"] * 1_000)
+    quantiles = statistics.quantiles(samples, n=100) if len(samples) > 1 else samples * 99
+    return {"calls": len(samples), "p50_ms": quantiles[49], "p95_ms": quantiles[94]}
+
+
+def run(accounts: int, transactions: int, days: int, descriptions: int, queries: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    results: dict = {}
+    parse_seconds = create_seconds = 0.0
+    balance_calls, range_calls, report_calls, balances_calls = [], [], [], []
+    account_ids = []
+    with temporary_database() as db:
+        uow = UoW(db)
+        parser = TransactionParser()
+        for account_index in range(accounts):
+            account_id = AccountService.create_one(uow, AccountType.DEBIT)
+            account_ids.append(account_id)
+            rows = generate_rows(transactions, account_index + 1, days, descriptions, seed=seed)
+            with temporary_csv(rows) as file_path:
+                with timer() as result:
+                    data = parser.parse_data(file_path, account_id)
+                parse_seconds += result["seconds"]
+            with timer() as result:
+                TransactionService.create(uow, account_id, data)
+            create_seconds += result["seconds"]
+            for _ in range(queries):
+                start_date = START_DATE + timedelta(days=rng.randrange(days))
+                balance_calls.append((uow, account_id, start_date))
+                range_calls.append((uow, account_id, start_date, start_date + timedelta(days=30)))
+                report_calls.append((uow, account_id, Period.YEAR, start_date))
+        for _ in range(queries):
+            balances_calls.append((uow, account_ids, START_DATE + timedelta(days=rng.randrange(days))))
+        rows_count = accounts * transactions
+        results["TransactionParser.parse_data"] = {"rows": rows_count, "rows_per_sec": rows_count / parse_seconds}
+        results["TransactionService.create"] = {"rows": rows_count, "rows_per_sec": rows_count / create_seconds}
+        results["AccountService.get_balance"] = latencies(AccountService.get_balance, balance_calls)
+        results["TransactionService.get_by_date_range"] = latencies(TransactionService.get_by_date_range, range_calls)
+        results["ReportService.get_totals"] = latencies(ReportService.get_totals, report_calls)
+        results["AccountService.get_balances"] = latencies(AccountService.get_balances, balances_calls)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Return a description of every metric that regressed by more than threshold."""
+    regressions = []
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            old = baseline.get(name, {}).get(metric)
+            if not old or metric in ("rows", "calls"):
+                continue
+            change = old / value - 1 if metric in THROUGHPUT_METRICS else value / old - 1
+            if change > threshold:
+                regressions.append(f"{name} {metric}: {old:,.3f} -> {value:,.3f} ({change:.0%} worse)")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--accounts", type=int, default=2)
+    parser.add_argument("--transactions", type=int, default=100_000, help="transactions per account")
+    parser.add_argument("--days", type=int, default=1_000, help="date spread of the transactions")
+    parser.add_argument("--descriptions", type=int, default=500, help="number of distinct descriptions")
+    parser.add_argument("--queries", type=int, default=200, help="balance and date range lookups per account")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON results to this file instead of stdout")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON results of a previous run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative regression, 0.2 = 20%%")
+    args = parser.parse_args()
+
+    parameters = {
+        key: getattr(args, key) for key in ("accounts", "transactions", "days", "descriptions", "queries", "seed")
+    }
+    report = {
+        "metadata": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "amount_storage": settings.AMOUNT_STORAGE,
+            "platform": platform.platform(),
+            "parameters": parameters,
+        },
+        "results": run(**parameters),
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="UTF-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare, encoding="UTF-8") as f:
+            baseline = json.load(f)
+        if baseline["metadata"]["parameters"] != parameters:
+            print("Warning: the baseline was run with different parameters", file=sys.stderr)
+        regressions = compare(report["results"], baseline["results"], args.threshold)
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
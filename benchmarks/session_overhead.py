@@ -0,0 +1,64 @@
+"""Measure per unit-of-work overhead and import throughput with and without the engine tuning.
+
+"before" builds a new ``sessionmaker`` per session and uses a plain engine without SQLite pragmas,
+"after" is the current ``Database``.
+
+Usage: ``python -m benchmarks.session_overhead [--iterations 10000] [--rows 200000]``
+"""
+
+import argparse
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.account import AccountType
+from app.account.services import AccountService
+from app.account.transaction.services import TransactionService
+from app.database import Database
+from app.parser import TransactionParser
+from app.utils.uow import UoW
+
+from .common import synthetic_rows, temporary_csv, temporary_database, timer
+
+
+def untune(db: Database) -> None:
+    """Restore the previous behaviour: default engine, new session factory for every session."""
+    db.engine.dispose()
+    db.engine = create_engine(db.db_url)
+    db.create_session = lambda: sessionmaker(bind=db.engine)()  # type: ignore[method-assign]
+
+
+def run(iterations: int, rows_count: int) -> None:
+    print(f"{'variant':<7} | {'UoW overhead (us)':>17} | {'get_balance (us)':>16} | {'import rows/sec':>14}")
+    with temporary_csv(synthetic_rows(rows_count)) as file_path:
+        for variant in ("before", "after"):
+            with temporary_database() as db:
+                if variant == "before":
+                    untune(db)
+                uow = UoW(db)
+                account_id = AccountService.create_one(uow, AccountType.DEBIT)
+
+                with timer() as empty_uow:
+                    for _ in range(iterations):
+                        with uow:
+                            pass
+                with timer() as balance:
+                    for _ in range(iterations):
+                        AccountService.get_balance(uow, account_id)
+                with timer() as import_data:
+                    TransactionService.create_from_chunks(
+                        uow, account_id, TransactionParser.parse_chunks(file_path, account_id, vectorized=True)
+                    )
+                db.engine.dispose()
+            print(
+                f"{variant:<7} | {empty_uow['seconds'] / iterations * 1e6:>17.1f} | "
+                f"{balance['seconds'] / iterations * 1e6:>16.1f} | {rows_count / import_data['seconds']:>14,.0f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=10_000)
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+    run(args.iterations, args.rows)
@@ -0,0 +1,71 @@
+"""Compare parallel imports into many accounts on a single database and on several shards.
+
+Every account gets ``--imports`` statements of ``--rows`` rows, imported by a pool of ``--workers`` threads, each
+statement in its own transaction. With one SQLite file the imports wait for its single writer lock, with shards
+only imports into accounts of the same shard do.
+
+Usage: ``python -m benchmarks.sharding [--shards 1 4] [--accounts 8] [--imports 20] [--rows 500] [--workers 8]``
+"""
+
+import argparse
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from itertools import product
+
+from app.account import AccountType
+from app.account.services import AccountService
+from app.account.transaction.schemas import STransactionAdd
+from app.account.transaction.services import TransactionService
+from app.database import Base, ShardedDatabase
+from app.utils.uow import ShardedUoW
+
+from .common import timer
+from .generator import generate_rows
+
+
+def run(shards_counts: list[int], accounts: int, imports: int, rows: int, workers: int) -> None:
+    print(f"{'shards':>6} | {'rows':>10} | {'seconds':>8} | {'rows/sec':>10}")
+    for shards_count in shards_counts:
+        paths = [tempfile.mkstemp(suffix=".database") for _ in range(shards_count)]
+        for fd, _ in paths:
+            os.close(fd)
+        db = ShardedDatabase([f"sqlite:///{path}" for _, path in paths])
+        try:
+            account_ids = [AccountService.create_one(ShardedUoW(db), AccountType.DEBIT) for _ in range(accounts)]
+            statements = {
+                (account_id, index): [STransactionAdd(**row) for row in generate_rows(rows, account_id, seed=index)]
+                for account_id, index in product(account_ids, range(imports))
+            }
+            with timer() as result, ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(import_statement, db, account_id, statements[account_id, index])
+                    for index, account_id in product(range(imports), account_ids)
+                ]
+                total_rows = sum(future.result() for future in futures)
+            print(
+                f"{shards_count:>6} | {total_rows:>10} | {result['seconds']:>8.3f} | "
+                f"{total_rows / result['seconds']:>10,.0f}"
+            )
+        finally:
+            for shard, (_, path) in zip(db.shards, paths):
+                Base.metadata.drop_all(shard.engine)
+                shard.engine.dispose()
+                for file_path in (path, f"{path}-wal", f"{path}-shm"):
+                    if os.path.exists(file_path):
+                        os.remove(file_path)
+
+
+def import_statement(db: ShardedDatabase, account_id: int, transactions: list[STransactionAdd]) -> int:
+    return len(TransactionService.create(ShardedUoW(db, account_id), account_id, transactions))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--accounts", type=int, default=8)
+    parser.add_argument("--imports", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+    run(args.shards, args.accounts, args.imports, args.rows, args.workers)
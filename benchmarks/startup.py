@@ -0,0 +1,72 @@
+"""Measure the startup of a scripted invocation: wall clock, ``-X importtime`` and the schema check.
+
+The measured command is ``python3 bank_app import --account debit EMPTY_DIR`` against a throwaway SQLite file,
+it starts the app, checks the schema and exits without importing anything.
+
+Usage: ``python -m benchmarks.startup [--runs 10] [--top 10]``
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+import app.account  # noqa: F401  register models
+from app.database import Database
+from app.utils.instrumentation import instrumentation
+
+from .common import temporary_database, timer
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_app(db_url: str, directory: str, *python_options: str) -> subprocess.CompletedProcess:
+    command = [sys.executable, *python_options, REPO_DIR, "import", "--account", "debit", directory]
+    return subprocess.run(command, env={**os.environ, "DB_URL": db_url}, capture_output=True, text=True, check=False)
+
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    """Return the import time in microseconds of each top-level package, summed over its modules."""
+    packages: dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_time, _, name = line.removeprefix("import time:").split("|")
+        package = name.strip().split(".")[0]
+        packages[package] = packages.get(package, 0) + int(self_time)
+    return packages
+
+
+def run(runs: int, top: int) -> None:
+    with temporary_database() as db, tempfile.TemporaryDirectory() as directory:
+        run_app(db.db_url, directory)  # warm up the OS caches, the database is already stamped
+        wall_clock = []
+        for _ in range(runs):
+            with timer() as result:
+                run_app(db.db_url, directory)
+            wall_clock.append(result["seconds"] * 1_000)
+        print(
+            f"wall clock over {runs} runs: min {min(wall_clock):.1f} ms, median {statistics.median(wall_clock):.1f} ms"
+        )
+
+        packages = parse_importtime(run_app(db.db_url, directory, "-X", "importtime").stderr)
+        print(f"imports: {sum(packages.values()) / 1_000:.1f} ms, slowest packages:")
+        for name, microseconds in sorted(packages.items(), key=lambda package: package[1], reverse=True)[:top]:
+            print(f"  {name:<20} {microseconds / 1_000:>8.1f} ms")
+
+        print(f"{'schema check':<12} | {'ms':>6} | {'queries':>7}")
+        for variant, check in (("stamped", lambda: Database(db.db_url)), ("create_all", db._create_tables)):
+            instrumentation.reset()
+            with timer() as result:
+                check()
+            print(f"{variant:<12} | {result['seconds'] * 1_000:>6.1f} | {instrumentation.counters['queries']:>7.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=10, help="number of slowest imports to show")
+    args = parser.parse_args()
+    run(args.runs, args.top)
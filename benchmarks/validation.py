@@ -0,0 +1,26 @@
+"""Compare per-row pydantic validation of CSV rows with column-wise batch validation.
+
+Usage: ``python -m benchmarks.validation [--sizes 100000 1000000]``
+"""
+
+import argparse
+
+from app.parser import TransactionParser
+
+from .common import synthetic_rows, temporary_csv, timer
+
+
+def run(sizes: list[int]) -> None:
+    print(f"{'rows':>10} | {'validation':<10} | {'seconds':>8} | {'rows/sec':>10}")
+    for size in sizes:
+        with temporary_csv(synthetic_rows(size)) as file_path:
+            for mode, vectorized in (("per row", False), ("columns", True)):
+                with timer() as result:
+                    TransactionParser.parse_data(file_path, account_id=1, vectorized=vectorized)
+                print(f"{size:>10} | {mode:<10} | {result['seconds']:>8.3f} | {size / result['seconds']:>10,.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", nargs="+", type=int, default=[100_000, 1_000_000])
+    run(parser.parse_args().sizes)